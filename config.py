@@ -52,27 +52,74 @@ class Config:
         # -------------------------
         # 网络请求设置
         # -------------------------
-        # 请求间隔设置 - 防止请求过于频繁导致IP被限制
-        self.page_interval = (0.5, 1.2)  # 分页请求间隔时间范围(秒)
-        self.request_interval = (0.5, 1.0)  # 普通请求间隔时间范围(秒)
-        self.request_limit_count = 20  # 每X次请求后强制等待一次
+        # 按主机限速设置 (令牌桶) - 防止请求过于频繁导致IP被限制
+        # rate为每秒请求数，burst为允许的突发请求数；rate为0表示不限速
+        # 检查站点的预算在check_sites的rate_limit字段中单独设置
+        self.host_rate_limits = {
+            "fc2ppvdb.com": {"rate": 3.0, "burst": 6},  # 视频列表、作者信息和缩略图
+            "sukebei.nyaa.si": {"rate": 0.2, "burst": 1},  # 磁链搜索，每5秒1次
+        }
+        self.default_rate_limit = {"rate": 2.0, "burst": 4}  # 未配置主机的默认预算
+        self.request_interval = (0.5, 1.0)  # 请求失败后重试的等待时间范围(秒)
         # 并发与超时设置
         self.max_workers = 30  # 最大并发线程数 (增加可提升速度，但可能增加被限制风险)
         self.timeout = 15  # 请求超时时间(秒)，网络不稳定时可适当增加
+        # 流水线阶段设置 - 检查线程数即max_workers，各阶段的请求频率仍受对应主机的限速预算约束
+        self.magnet_workers = 2  # 磁链阶段线程数，请求节奏由sukebei.nyaa.si的限速预算决定
+        self.image_workers = 8  # 图片下载阶段线程数
+        self.stage_queue_size = 200  # 每个阶段的队列长度上限，下游阻塞时上游等待
+        self.author_prefetch_depth = 2  # 批量模式下提前获取视频列表的作者数量
+        # 视频列表分页设置
+        self.video_page_size = 100  # 视频列表每页数量
+        self.parallel_pagination = True  # 第一页返回总页数时并发获取其余页面
+        self.page_workers = 4  # 并发获取列表页的线程数，请求速率仍受fc2ppvdb.com的限速预算约束
         # 重试策略设置
         self.max_retries = 4  # 最大重试次数，遇到网络问题时会自动重试
         self.retry_base = 2.0  # 重试间隔基数，决定每次重试等待的时间
+        self.max_retry_after = 60  # 重试时服务器返回的Retry-After等待时间上限(秒)
+        # 连接池设置 - 所有请求共享同一个会话，复用TCP/TLS连接
+        self.pool_connections = 10  # 连接池缓存的主机数量
+        self.pool_maxsize = 30  # 每个主机的最大连接数 (建议不小于max_workers)
+        self.pool_block = True  # 达到单主机连接上限时等待空闲连接，而不是创建临时连接
+        # 异步模式设置 (--async) - 所有请求以协程方式运行在一个事件循环中
+        self.async_concurrency = 200  # 同时进行流出检查的视频数
+        self.async_max_connections = 300  # 异步会话的连接总数上限
+        self.async_connections_per_host = 50  # 每个主机同时在途的请求数
+        self.async_keepalive_timeout = 30  # 异步会话空闲连接的保持时间(秒)
+        self.jellyfin_connections_per_host = 8  # 生成Jellyfin元数据时每个主机的连接数，不小于jellyfin_max_concurrency
+        # Jellyfin元数据补充的自适应并发 (AIMD) - 响应正常时逐步增加在途请求数，遇到429/5xx时减半
+        self.jellyfin_initial_concurrency = 2  # 初始同时在途的页面请求数
+        self.jellyfin_min_concurrency = 1  # 在途请求数下限
+        self.jellyfin_max_concurrency = 8  # 在途请求数上限
+        self.jellyfin_throttle_pause = 1.0  # 受到限流但服务器未返回Retry-After时暂停发送的秒数
+        self.jellyfin_max_retry_after = 120  # Retry-After等待时间上限(秒)
+        self.jellyfin_incremental = True  # 增量生成Jellyfin元数据：输入未变化的视频不重新生成NFO和封面
+        self.jellyfin_prune_stale = True  # 增量生成时删除作者/女优目录中最近一次检查确认未流出的视频的元数据 (检查出错或状态未知的视频保留)
+        self.jellyfin_poster_strategy = "copy"  # 封面放置方式: copy(复制)、hardlink(硬链接，与图片目录共用同一文件)、reflink(写时复制)或symlink(符号链接)；不可用时自动改用复制
         
         # -------------------------
         # 缓存设置
         # -------------------------
         self.cache_ttl = 172800  # 缓存有效期(秒)，默认48小时
+        self.incremental_refresh = True  # 视频列表缓存过期时只获取新上传的视频并合并
+        self.leak_status_cache = True  # 缓存每个视频的流出检查结果，已流出的结果永久有效
+        self.leak_status_negative_ttl = 86400  # 未流出结果的缓存有效期(秒)，默认24小时
+        self.leak_status_error_ttl = 3600  # 检查出错结果的缓存有效期(秒)，默认1小时
+        self.magnet_cache = True  # 缓存磁链搜索结果，命中时不再请求磁链站点
+        self.magnet_not_found_ttl = 259200  # 未找到磁链结果的缓存有效期(秒)，默认72小时，过期后重新搜索
+        self.cache_write_batch = 500  # 缓存数据库写缓冲达到该条数时立即批量提交
+        self.cache_flush_interval = 2.0  # 缓存数据库后台批量提交的间隔(秒)
+        self.http_conditional_cache = True  # 保存列表页和视频页面的ETag/Last-Modified，重新获取时发送条件请求，未变化(304)时使用缓存内容
+        self.article_cache = True  # 压缩保存fc2ppvdb视频页面，Jellyfin元数据补充和作者查询共用
+        self.article_cache_ttl = 604800  # 视频页面缓存有效期(秒)，默认7天；过期后发送条件请求重新验证
+        self.checkpoint_interval = 100  # 每完成多少个视频保存一次检查点，中断后可用--resume继续；0表示不保存
         
         # -------------------------
         # 数据存储目录设置
         # -------------------------
         # 基础缓存和数据目录
         self.cache_dir = os.path.join(BASE_CACHE_DIR, "id_cache")  # 作者和女优ID缓存目录
+        self.cache_db = os.path.join(self.cache_dir, "cache.db")  # 统一缓存数据库(SQLite)，保存视频列表、检查结果和磁链
         self.image_dir = os.path.join(BASE_CACHE_DIR, "img")  # 视频缩略图存储目录
         self.result_dir = os.path.join(BASE_CACHE_DIR, "results")  # 分析结果存储目录
         self.magnet_dir = os.path.join(BASE_CACHE_DIR, "magnets")  # 磁链信息存储目录
@@ -91,6 +138,7 @@ class Config:
         self.summary_report = os.path.join(
             BASE_CACHE_DIR, "fc2_multi_author_summary.txt"
         )  # 多作者汇总报告路径
+        self.stream_results = True  # 分析时逐条写入JSON Lines结果文件(results目录下的*_results.jsonl)，报告从该文件流式生成
         
         # -------------------------
         # 视频检查站点设置
@@ -101,9 +149,14 @@ class Config:
                 "url": "https://24av.net/en/dm1/v/fc2-ppv-{vid}",
                 "priority": 2,
                 "status_codes": [200],
+                "rate_limit": {"rate": 20.0, "burst": 30},  # 检查站点可全速运行
+                "method": "GET",  # 请求方式: GET、HEAD(只取响应头，站点不接受时自动改用GET)或STREAM(收到响应头即关闭)
             },
         ]
         
+        self.leak_check_hedged = True  # 配置多个检查站点时同时检查，任一站点确认流出即返回，其余请求取消
+        self.leak_check_hedge_delay = 0.0  # 同时检查时按优先级依次错开的启动间隔(秒)，0表示同时发送
+        
         # -------------------------
         # API设置
         # -------------------------
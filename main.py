@@ -6,7 +6,6 @@ FC2 流出检测器 - 主程序
 获取视频流出状态、磁力链接和缩略图等信息。
 """
 import argparse
-import json
 import os
 import re
 import ssl
@@ -23,8 +22,10 @@ from requests.exceptions import ConnectionError, RequestException, Timeout
 
 from src.checkers.fc2analyzer import FC2Analyzer
 from config import config
+from src.utils.cache_manager import CacheManager
 from src.utils.fc2_video_parser import find_writer_by_video
 from src.utils.logger import get_logger
+from src.utils.report_builder import VideoListOutput, is_confirmed_unleaked, is_leaked
 from src.utils.report_generator import ReportGenerator
 from src.utils.ui_manager import RichUIManager
 from src.writers.writer_extractor import WriterExtractor
@@ -61,6 +62,8 @@ def print_usage():
   --jellyfin                {_('usage_jellyfin', '生成Jellyfin兼容的元数据；可单独使用，会查找48小时内的分析结果')}
   --no-magnet               {_('usage_no_magnet', '不获取磁力链接')}
   --no-image                {_('usage_no_image', '不下载视频缩略图')}
+  --async                   {_('usage_async', '使用异步模式分析视频，单线程事件循环处理所有请求')}
+  --resume                  {_('usage_resume', '从上次中断的检查点继续分析，跳过已完成的视频')}
   -l LANG, --lang LANG      {_('usage_lang', '设置界面语言 (支持: zh, en, ja)')}
   -c, --config              {_('usage_config', '显示配置信息')}
   -s, --sites               {_('usage_sites', '显示检查站点列表')}
@@ -78,6 +81,8 @@ def print_usage():
   python run.py --jellyfin            # {_('example_jellyfin', '使用最近的分析结果生成Jellyfin元数据')}
   python run.py -a 5711 --no-magnet   # {_('example_no_magnet', '分析女优视频但不获取磁力链接')}
   python run.py -w 5656 --no-image    # {_('example_no_image', '分析作者视频但不下载缩略图')}
+  python run.py -w 5656 --async       # {_('example_async', '使用异步模式分析作者视频')}
+  python run.py -w 5656 --resume      # {_('example_resume', '继续上次中断的作者分析')}
   python run.py -l {target_lang}               # {_('example_lang', '使用英文界面')}
   python run.py -c                    # {_('example_config', '显示配置信息')}
   python run.py -e                    # {_('example_extract', '提取热门作者列表')}
@@ -143,40 +148,46 @@ def extract_writer_info():
         return False
 
 
-def is_leaked(result):
+def run_analysis(analyzer, videos, use_async=False):
+    """按选择的模式分析视频
+
+    参数:
+        analyzer: FC2Analyzer实例
+        videos: 视频列表
+        use_async: 是否使用异步模式，所有请求在一个事件循环中以协程方式运行
+
+    返回:
+        tuple: (结果摘要, 统计信息)，结果通过analyzer.iter_results()读取
     """
-    判断视频是否已泄露
-    
+    if use_async:
+        import asyncio
+        return asyncio.run(analyzer.analyze_videos_async(videos))
+    return analyzer.analyze_videos(videos)
+
+
+def split_leaked_results(analyzer):
+    """遍历分析结果，分出生成Jellyfin元数据需要的两部分
+
     参数:
-        result: 视频结果对象
-        
+        analyzer: 已完成分析的FC2Analyzer实例
+
     返回:
-        bool: 是否已泄露
+        tuple: (已流出视频的结果列表, 流出检查确认未流出的视频ID列表)；
+               检查出错的视频两边都不包含，其已生成的元数据保留
     """
-    # 如果leaked字段存在并且为True，直接返回True
-    if result.get("leaked") is True:
-        return True
-    
-    status = result.get("status")
-    
-    # 如果status是available，则视为已泄露
-    if status == "available":
-        return True
-        
-    # 如果status是布尔类型
-    if isinstance(status, bool):
-        return status
-        
-    # 如果status是字符串且为leaked、yes或true
-    if isinstance(status, str) and status.lower() in ["leaked", "yes", "true"]:
-        return True
-        
-    # 默认为未泄露
-    return False
+    leaked_videos = []
+    unleaked_ids = []
+    for result in analyzer.iter_results():
+        if is_leaked(result):
+            leaked_videos.append(result)
+        elif is_confirmed_unleaked(result):
+            unleaked_ids.append(result.get("video_id"))
+    return leaked_videos, unleaked_ids
 
 
 def check_videos(
-    target_id, is_actress=False, threads=None, with_magnet=True, download_images=True, generate_jellyfin=False
+    target_id, is_actress=False, threads=None, with_magnet=True, download_images=True, generate_jellyfin=False,
+    use_async=False, resume=False
 ):
     """通用视频分析函数
 
@@ -189,6 +200,8 @@ def check_videos(
         with_magnet: 是否获取磁力链接
         download_images: 是否下载缩略图
         generate_jellyfin: 是否生成Jellyfin元数据
+        use_async: 是否使用异步分析模式
+        resume: 是否从上次中断的检查点继续
 
     返回:
         bool: 操作是否成功
@@ -204,6 +217,7 @@ def check_videos(
             with_magnet=with_magnet,
             download_images=download_images,
             quiet_mode=False,
+            resume=resume,
         )
 
         # 设置并行线程数，优先使用传入参数，其次使用配置，最后是默认值
@@ -264,19 +278,12 @@ def check_videos(
         try:
             # 注意：analyze_videos方法不接受max_workers参数
             # 线程数由FC2Analyzer构造函数或内部配置控制
-            results, stats = analyzer.analyze_videos(videos)
+            summary, stats = run_analysis(analyzer, videos, use_async)
         except Exception as e:
             logger.error(f"分析视频时出错: {type(e).__name__}: {e}")
             print(f"❌ {_('check_videos.analyze_error', '分析视频时出错: {error}').format(error=e)}")
             return False
 
-        # 保存分析结果
-        try:
-            analyzer.save_results()
-        except Exception as e:
-            logger.error(f"保存分析结果时出错: {type(e).__name__}: {e}")
-            print(f"❌ 保存分析结果时出错: {e}")
-
         try:
             # 确保目录存在
             try:
@@ -316,63 +323,29 @@ def check_videos(
                     f"{target_id}_{cleaned_name}_{timestamp}.txt",
                 )
 
-            # 打印基本的统计信息
-            total = len(results)
-            leaked = sum(1 for r in results if is_leaked(r))
-            leak_ratio = (leaked / total) * 100 if total > 0 else 0
-
-            # 写入结果摘要
-            try:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    f.write(
-                        f"{entity_type}: {target_id} [{author_name or 'Unknown'}]\n"
-                    )
-                    f.write(f"总视频数: {total}\n")
-                    f.write(f"已流出数: {leaked}\n")
-                    f.write(f"流出比例: {leak_ratio:.2f}%\n\n")
-
-                    # 写入基本的视频信息
-                    f.write("视频列表:\n")
-                    for r in results:
-                        video_id = r.get("video_id", r.get("id", "unknown"))
-                        status = "已流出" if is_leaked(r) else "未流出"
-                        title = r.get("title", f"FC2-PPV-{video_id}")
-
-                        # 添加磁力链接信息（如果有）
-                        magnet_info = ""
-                        if with_magnet and r.get("has_magnet", False):
-                            magnet_info = f" [有磁链]"
-
-                        # 添加图片信息（如果有）
-                        image_info = ""
-                        if download_images and r.get("image_downloaded", False):
-                            image_info = f" [有图片]"
-
-                        f.write(
-                            f"{video_id} - {status}{magnet_info}{image_info} - {title}\n"
-                        )
-
+            # 保存分析结果：磁链文件、分类报告和结果摘要在同一次遍历中生成
+            video_list = VideoListOutput(
+                save_path,
+                f"{entity_type}: {target_id} [{author_name or 'Unknown'}]",
+                show_magnet=with_magnet,
+                show_image=download_images,
+            )
+            reports = analyzer.save_results(extra_outputs=[video_list])
+            if reports.pop("video_list", None):
                 print(f"✅ {_('check_videos.result_saved', '结果已保存到: {path}').format(path=save_path)}")
-            except PermissionError as e:
-                logger.error(f"写入结果文件时权限不足: {e}")
-                print(f"❌ {_('check_videos.write_error_permission', '写入结果文件时权限不足: {error}').format(error=e)}")
-            except IOError as e:
-                logger.error(f"写入结果文件时I/O错误: {e}")
-                print(f"❌ {_('check_videos.write_error_io', '写入结果文件时I/O错误: {error}').format(error=e)}")
+
+            # 打印基本的统计信息
+            total = summary.total
+            leaked = summary.leaked
+            leak_ratio = summary.leak_ratio
 
             # 显示详细统计信息
-            analyzer.display_results(results, stats)
+            analyzer.display_results(summary, stats)
 
-            # 调用generate_reports方法生成分类报告
-            try:
-                reports = analyzer.generate_reports(target_id, results, author_name)
-                if reports:
-                    print(f"✅ {_('check_videos.report_success', '成功为{entity_type} {id} 生成 {count} 个分类报告').format(entity_type=entity_type, id=target_id, count=len(reports))}")
-                    for report_type, report_path in reports.items():
-                        print(f"  - {report_type}: {report_path}")
-            except Exception as e:
-                logger.error(f"生成分类报告时出错: {type(e).__name__}: {e}")
-                print(f"⚠️ {_('check_videos.report_error', '生成分类报告时出错: {error}').format(error=e)}")
+            if reports:
+                print(f"✅ {_('check_videos.report_success', '成功为{entity_type} {id} 生成 {count} 个分类报告').format(entity_type=entity_type, id=target_id, count=len(reports))}")
+                for report_type, report_path in reports.items():
+                    print(f"  - {report_type}: {report_path}")
 
         except Exception as e:
             logger.error(f"保存结果时出错: {type(e).__name__}: {e}\n{traceback.format_exc()}")
@@ -384,17 +357,13 @@ def check_videos(
         print(_("check_videos.leaked_ratio", "流出比例: {ratio}%").format(ratio=f"{leak_ratio:.2f}"))
 
         # 在函数结尾部分添加Jellyfin元数据生成代码
-        if generate_jellyfin and results:
+        if generate_jellyfin and summary.total:
             try:
                 print("\n=== Jellyfin元数据 ===")
                 jellyfin_generator = JellyfinMetadataGenerator()
                 
-                # 从视频结果中提取已流出的视频
-                leaked_videos = [v for v in results if v.get("status") in ["leaked", "available", "已流出"]]
-                
-                if not leaked_videos:
-                    print("❌ 没有已流出的视频，跳过生成Jellyfin元数据")
-                    return results
+                # 从视频结果中提取已流出的视频，确认未流出的视频用于删除过期的元数据
+                leaked_videos, unleaked_ids = split_leaked_results(analyzer)
                 
                 # 创建作者信息字典
                 author_info = {
@@ -402,13 +371,19 @@ def check_videos(
                     "name": author_name
                 }
                 
+                if not leaked_videos:
+                    print("❌ 没有已流出的视频，跳过生成Jellyfin元数据")
+                    jellyfin_generator.remove_unleaked_metadata(unleaked_ids, author_info=author_info)
+                    return True
+                
                 # 异步调用批量生成元数据
                 import asyncio
                 # 使用asyncio.run运行异步函数
                 metadata_results = asyncio.run(jellyfin_generator.batch_generate_metadata(
                     leaked_videos,
                     author_info=author_info,
-                    enrich_from_web=True  # 始终从网络获取额外信息，包括标签
+                    enrich_from_web=True,  # 始终从网络获取额外信息，包括标签
+                    unleaked_ids=unleaked_ids,
                 ))
                 
                 if metadata_results:
@@ -436,12 +411,59 @@ def check_videos(
         return False
 
 
+def load_batch_cache(item_id, is_actress=False):
+    """读取批量处理使用的作者/女优分析摘要缓存
+
+    参数:
+        item_id: 作者ID或女优ID
+        is_actress: 是否为女优ID
+
+    返回:
+        dict: 未过期的分析摘要，缓存不存在、过期或损坏时返回None
+    """
+    return CacheManager.load_summary(item_id, is_actress)
+
+
+def prefetch_author(
+    item_id, is_actress=False, with_magnet=True, download_images=True, resume=False
+):
+    """获取作者/女优名称和视频列表，供批量处理提前调度
+
+    参数:
+        item_id: 作者ID或女优ID
+        is_actress: 是否为女优ID
+        with_magnet: 是否获取磁力链接
+        download_images: 是否下载缩略图
+        resume: 是否从上次中断的检查点继续
+
+    返回:
+        dict: 包含analyzer、author_name和videos
+    """
+    # 创建分析器
+    analyzer = FC2Analyzer(
+        item_id,
+        is_actress=is_actress,
+        with_magnet=with_magnet,
+        download_images=download_images,
+        resume=resume,
+    )
+
+    # 获取名称
+    author_name = analyzer.fetch_author_name()
+
+    # 获取视频列表
+    videos = analyzer.fetch_video_ids()
+
+    return {"analyzer": analyzer, "author_name": author_name, "videos": videos}
+
+
 def process_multiple_ids(
-    ids, is_actress=False, threads=None, with_magnet=True, download_images=True, generate_jellyfin=False
+    ids, is_actress=False, threads=None, with_magnet=True, download_images=True, generate_jellyfin=False,
+    use_async=False, resume=False
 ):
     """批量处理多个作者或女优
 
-    依次分析多个ID的视频，并生成汇总报告
+    依次分析多个ID的视频，分析当前ID时在后台预取后续ID的视频列表，最后生成汇总报告
 
     参数:
         ids: ID列表或逗号分隔的字符串
@@ -450,6 +472,8 @@ def process_multiple_ids(
         with_magnet: 是否获取磁力链接
         download_images: 是否下载缩略图
         generate_jellyfin: 是否生成Jellyfin元数据
+        use_async: 是否使用异步分析模式
+        resume: 是否从上次中断的检查点继续
 
     返回:
         bool: 操作是否成功
@@ -487,70 +511,70 @@ def process_multiple_ids(
 
     processed_items = []
 
+    # 提前读取缓存，只为需要重新分析的ID安排预取
+    cached_items = {
+        item_id: load_batch_cache(item_id, is_actress) for item_id in id_list
+    }
+    prefetch_ids = [item_id for item_id in id_list if cached_items[item_id] is None]
+
+    # 作者级调度：当前作者的视频在分析时，后台线程提前获取后续作者的名称和视频列表，
+    # 所有请求仍经过同一个全局限速器，分析阶段共用同一份线程预算
+    prefetch_depth = max(1, config.author_prefetch_depth)
+    prefetch_executor = ThreadPoolExecutor(
+        max_workers=prefetch_depth, thread_name_prefix="author-prefetch"
+    )
+    prefetch_futures = {}
+
+    def schedule_prefetch(item_id):
+        """为当前ID及其后续若干个ID提交预取任务"""
+        position = prefetch_ids.index(item_id)
+        for next_id in prefetch_ids[position : position + prefetch_depth + 1]:
+            if next_id not in prefetch_futures:
+                prefetch_futures[next_id] = prefetch_executor.submit(
+                    prefetch_author, next_id, is_actress, with_magnet, download_images, resume
+                )
+
     # 处理每个ID
-    for idx, item_id in enumerate(id_list, 1):
-        try:
-            # 检查缓存是否存在且有效
-            cache_file = os.path.join(
-                config.cache_dir, f"{'actress' if is_actress else 'author'}_{item_id}.json"
-            )
-            cache_valid = False
+    try:
+        for idx, item_id in enumerate(id_list, 1):
+            try:
+                # 检查缓存是否存在且有效
+                cache_data = cached_items[item_id]
 
-            # 如果之前有缓存，检查是否过期
-            if os.path.exists(cache_file):
-                try:
-                    with open(cache_file, "rb") as f:
-                        cache_data = json.load(f)
-                    
-                    # 计算缓存年龄
-                    cache_time = datetime.strptime(cache_data["timestamp"], "%Y-%m-%d %H:%M:%S")
-                    cache_age = (datetime.now() - cache_time).total_seconds()
-                    
-                    # 如果缓存年龄小于配置的缓存有效期，使用缓存
-                    if cache_age < config.cache_ttl:
-                        ui_manager.add_log(
-                            f"使用缓存数据: {entity_type} {item_id}", False
-                        )
-
-                        # 使用缓存的结果
-                        total_videos = cache_data.get("total_videos", 0)
-                        leaked_count = cache_data.get("leaked_videos", 0)
-                        author_name = cache_data.get(
-                            name_field, f"{entity_type}_{item_id}"
-                        )
-
-                        ui_manager.update_author_progress(idx, item_id, author_name)
-                        ui_manager.mark_author_completed(
-                            item_id, total_videos, leaked_count, author_name
-                        )
-
-                        processed_items.append(cache_data)
-                        cache_valid = True
-                        continue
-                except Exception as e:
-                    ui_manager.add_log(f"读取缓存出错: {e}", True)
-                    # 继续正常处理，忽略缓存错误
+                # 如果缓存年龄小于配置的缓存有效期，使用缓存
+                if cache_data is not None:
+                    ui_manager.add_log(
+                        f"使用缓存数据: {entity_type} {item_id}", False
+                    )
+
+                    # 使用缓存的结果
+                    total_videos = cache_data.get("total_videos", 0)
+                    leaked_count = cache_data.get("leaked_videos", 0)
+                    author_name = cache_data.get(
+                        name_field, f"{entity_type}_{item_id}"
+                    )
+
+                    ui_manager.update_author_progress(idx, item_id, author_name)
+                    ui_manager.mark_author_completed(
+                        item_id, total_videos, leaked_count, author_name
+                    )
 
-            # 如果没有有效缓存，正常处理
-            if not cache_valid:
+                    processed_items.append(cache_data)
+                    continue
+
+                # 如果没有有效缓存，正常处理
                 # 更新进度
                 ui_manager.update_author_progress(idx, item_id)
 
-                # 创建分析器
-                analyzer = FC2Analyzer(
-                    item_id,
-                    is_actress=is_actress,
-                    with_magnet=with_magnet,
-                    download_images=download_images,
-                )
-
-                # 获取名称
-                author_name = analyzer.fetch_author_name()
+                # 获取名称和视频列表 (通常已在分析上一个作者时预取完成)
+                schedule_prefetch(item_id)
+                prefetched = prefetch_futures.pop(item_id).result()
+                analyzer = prefetched["analyzer"]
+                author_name = prefetched["author_name"]
+                videos = prefetched["videos"]
                 if author_name:
                     ui_manager.update_author_progress(idx, item_id, author_name)
 
-                # 获取视频列表
-                videos = analyzer.fetch_video_ids()
                 if not videos:
                     ui_manager.add_log(f"未找到{entity_type} {item_id} 的视频", True)
                     ui_manager.mark_author_completed(item_id, 0, 0, author_name)
@@ -567,17 +591,16 @@ def process_multiple_ids(
                 ui_manager.update_multi_author_total_videos(total_videos)
 
                 # 分析视频，明确指定线程数
-                results, stats = analyzer.analyze_videos(videos)
+                summary, stats = run_analysis(analyzer, videos, use_async)
 
-                # 保存结果
+                # 保存结果，磁链文件和分类报告在同一次遍历中生成
                 try:
-                    analyzer.save_results()
+                    reports = analyzer.save_results()
                 except Exception as e:
+                    reports = {}
                     ui_manager.add_log(f"保存分析结果时出错: {e}", True)
                     logger.error(f"保存分析结果时出错: {type(e).__name__}: {e}")
 
-                # 生成分类报告
-                reports = analyzer.generate_reports(item_id, results, author_name)
                 if reports:
                     print(f"✅ 成功为{entity_type} {item_id} 生成 {len(reports)} 个分类报告")
                     for report_type, report_path in reports.items():
@@ -585,41 +608,19 @@ def process_multiple_ids(
 
                 # 记录处理结果
                 videos = analyzer.all_videos if hasattr(analyzer, "all_videos") else []
-                results = analyzer.results if hasattr(analyzer, "results") else []
 
-                leaked_count = sum(1 for r in results if is_leaked(r))
+                leaked_count = summary.leaked
+                with_magnet_count = summary.with_magnet
+                image_downloaded_count = summary.image_downloaded
 
                 # 添加更详细的统计信息到UI管理器
-                if hasattr(ui_manager, "total_with_magnet"):
-                    with_magnet_count = sum(
-                        1
-                        for r in results
-                        if is_leaked(r) and r.get("has_magnet", False)
-                    )
-                    ui_manager.total_with_magnet = (
-                        getattr(ui_manager, "total_with_magnet", 0) + with_magnet_count
-                    )
-                else:
-                    with_magnet_count = sum(
-                        1
-                        for r in results
-                        if is_leaked(r) and r.get("has_magnet", False)
-                    )
-                    ui_manager.total_with_magnet = with_magnet_count
-
-                if hasattr(ui_manager, "total_image_downloaded"):
-                    image_downloaded_count = sum(
-                        1 for r in results if r.get("image_downloaded", False)
-                    )
-                    ui_manager.total_image_downloaded = (
-                        getattr(ui_manager, "total_image_downloaded", 0)
-                        + image_downloaded_count
-                    )
-                else:
-                    image_downloaded_count = sum(
-                        1 for r in results if r.get("image_downloaded", False)
-                    )
-                    ui_manager.total_image_downloaded = image_downloaded_count
+                ui_manager.total_with_magnet = (
+                    getattr(ui_manager, "total_with_magnet", 0) + with_magnet_count
+                )
+                ui_manager.total_image_downloaded = (
+                    getattr(ui_manager, "total_image_downloaded", 0)
+                    + image_downloaded_count
+                )
 
                 # 添加重试统计
                 if (
@@ -638,33 +639,44 @@ def process_multiple_ids(
                     item_id, total_videos, leaked_count, author_name
                 )
 
+                leaked_results, unleaked_ids = split_leaked_results(analyzer)
                 item_result = {
                     id_field: item_id,
                     name_field: author_name or f"{entity_type}_{item_id}",
                     "total_videos": len(videos),
-                    "processed_videos": len(results),
+                    "processed_videos": summary.total,
                     "leaked_videos": leaked_count,
                     "with_magnet": with_magnet_count,
                     "image_downloaded": image_downloaded_count,
-                    "leaked_ratio": leaked_count / max(len(results), 1) * 100,
-                    "results": results,
+                    "leaked_ratio": leaked_count / max(summary.total, 1) * 100,
+                    # 只保留已流出视频的结果和确认未流出的视频ID，用于生成Jellyfin元数据
+                    "results": leaked_results,
+                    "unleaked_ids": unleaked_ids,
                     "status": "success",
                 }
 
                 processed_items.append(item_result)
+                CacheManager.save_summary(
+                    item_id, item_result, is_actress, name=author_name
+                )
 
-        except Exception as e:
-            ui_manager.add_log(f"处理{entity_type} {item_id} 时出错: {e}", True)
-            ui_manager.mark_author_completed(item_id, 0, 0, None)
-
-            item_result = {
-                id_field: item_id,
-                name_field: None,
-                "results": [],
-                "status": "error",
-                "error": str(e),
-            }
-            processed_items.append(item_result)
+            except Exception as e:
+                ui_manager.add_log(f"处理{entity_type} {item_id} 时出错: {e}", True)
+                ui_manager.mark_author_completed(item_id, 0, 0, None)
+
+                item_result = {
+                    id_field: item_id,
+                    name_field: None,
+                    "results": [],
+                    "status": "error",
+                    "error": str(e),
+                }
+                processed_items.append(item_result)
+    finally:
+        # 取消尚未开始的预取任务 (shutdown的cancel_futures参数需要Python 3.9)
+        for future in prefetch_futures.values():
+            future.cancel()
+        prefetch_executor.shutdown(wait=True)
 
     # 完成所有处理
     ui_manager.finish()
@@ -691,13 +703,20 @@ def process_multiple_ids(
                 videos_info = item.get("results", [])
                 entity_name = item.get(name_field)
                 
-                if videos_info:
-                    entity_info = {"id": entity_id, "name": entity_name} if entity_name else {"id": entity_id}
+                entity_info = {"id": entity_id, "name": entity_name} if entity_name else {"id": entity_id}
+                if not videos_info:
+                    jellyfin_generator.remove_unleaked_metadata(
+                        item.get("unleaked_ids"),
+                        author_info=entity_info if not is_actress else None,
+                        actress_info=entity_info if is_actress else None,
+                    )
+                else:
                     import asyncio
                     metadata_files = asyncio.run(jellyfin_generator.batch_generate_metadata(
                         videos_info,
                         author_info=entity_info if not is_actress else None,
-                        actress_info=entity_info if is_actress else None
+                        actress_info=entity_info if is_actress else None,
+                        unleaked_ids=item.get("unleaked_ids"),
                     ))
                     total_metadata_count += len(metadata_files)
             
@@ -758,7 +777,8 @@ def generate_multi_actress_report(processed_actresses):
 
 
 def find_writer_by_video_id(
-    video_id, threads=None, with_magnet=True, download_images=True, generate_jellyfin=False
+    video_id, threads=None, with_magnet=True, download_images=True, generate_jellyfin=False,
+    use_async=False, resume=False
 ):
     """通过视频ID查找并分析作者
 
@@ -770,6 +790,8 @@ def find_writer_by_video_id(
         with_magnet: 是否获取磁力链接
         download_images: 是否下载缩略图
         generate_jellyfin: 是否生成Jellyfin元数据
+        use_async: 是否使用异步分析模式
+        resume: 是否从上次中断的检查点继续
 
     Returns:
         bool: 操作是否成功
@@ -800,7 +822,9 @@ def find_writer_by_video_id(
             threads=threads,
             with_magnet=with_magnet,
             download_images=download_images,
-            generate_jellyfin=generate_jellyfin
+            generate_jellyfin=generate_jellyfin,
+            use_async=use_async,
+            resume=resume
         )
     except ConnectionError as e:
         logger.error(f"查找作者时连接错误: {e}")
@@ -948,21 +972,18 @@ def generate_jellyfin_only():
             }
             
             # 尝试读取缓存数据
-            cache_file = os.path.join(
-                config.cache_dir, f"{'actress' if is_actress else 'author'}_{entity_id}.json"
-            )
-            
             videos_info = []
             used_cache = False
             
-            # 如果缓存文件存在
-            if os.path.exists(cache_file):
+            # 如果缓存数据库中有该作者/女优的分析摘要
+            cached_summary = CacheManager.get_store().get_summary(
+                "actress" if is_actress else "author", entity_id
+            )
+            if cached_summary is not None:
                 try:
-                    with open(cache_file, "r", encoding="utf-8") as f:
-                        cache_data = json.load(f)
+                    cache_data, cache_time = cached_summary
                     
                     # 检查缓存有效期
-                    cache_time = datetime.strptime(cache_data["timestamp"], "%Y-%m-%d %H:%M:%S")
                     cache_age = (datetime.now() - cache_time).total_seconds()
                     
                     if cache_age < config.cache_ttl:
@@ -1123,6 +1144,8 @@ def main():
     parser.add_argument("--jellyfin", action="store_true", help=_("usage_jellyfin", "生成Jellyfin兼容的元数据；可单独使用，会查找48小时内的分析结果"))
     parser.add_argument("--no-magnet", action="store_true", help=_("usage_no_magnet", "不获取磁力链接"))
     parser.add_argument("--no-image", action="store_true", help=_("usage_no_image", "不下载视频缩略图"))
+    parser.add_argument("--async", dest="use_async", action="store_true", help=_("usage_async", "使用异步模式分析视频，单线程事件循环处理所有请求"))
+    parser.add_argument("--resume", action="store_true", help=_("usage_resume", "从上次中断的检查点继续分析，跳过已完成的视频"))
     parser.add_argument("-l", "--lang", type=str, help=_("usage_lang", "设置界面语言 (支持: zh, en, ja)"))
     parser.add_argument("-c", "--config", action="store_true", help=_("usage_config", "显示配置信息"))
     parser.add_argument("-s", "--sites", action="store_true", help=_("usage_sites", "显示检查站点列表"))
@@ -1173,11 +1196,14 @@ def main():
         with_magnet = not args.no_magnet
         download_images = not args.no_image
         generate_jellyfin = args.jellyfin
+        use_async = args.use_async
+        resume = args.resume
 
         # 通过视频ID查找并分析作者
         if args.video:
             success = find_writer_by_video_id(
-                args.video, threads, with_magnet, download_images, generate_jellyfin
+                args.video, threads, with_magnet, download_images, generate_jellyfin, use_async,
+                resume
             )
             return 0 if success else 1
 
@@ -1189,7 +1215,9 @@ def main():
                 threads=threads,
                 with_magnet=with_magnet,
                 download_images=download_images,
-                generate_jellyfin=generate_jellyfin
+                generate_jellyfin=generate_jellyfin,
+                use_async=use_async,
+                resume=resume
             )
         elif args.actress:
             check_videos(
@@ -1198,7 +1226,9 @@ def main():
                 threads=threads,
                 with_magnet=with_magnet,
                 download_images=download_images,
-                generate_jellyfin=generate_jellyfin
+                generate_jellyfin=generate_jellyfin,
+                use_async=use_async,
+                resume=resume
             )
         elif args.batch:
             process_multiple_ids(
@@ -1207,7 +1237,9 @@ def main():
                 threads=threads,
                 with_magnet=with_magnet,
                 download_images=download_images,
-                generate_jellyfin=generate_jellyfin
+                generate_jellyfin=generate_jellyfin,
+                use_async=use_async,
+                resume=resume
             )
         elif args.batch_actress:
             process_multiple_ids(
@@ -1216,7 +1248,9 @@ def main():
                 threads=threads,
                 with_magnet=with_magnet,
                 download_images=download_images,
-                generate_jellyfin=generate_jellyfin
+                generate_jellyfin=generate_jellyfin,
+                use_async=use_async,
+                resume=resume
             )
         # 添加只有--jellyfin参数的情况
         elif generate_jellyfin:
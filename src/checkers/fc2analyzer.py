@@ -4,6 +4,7 @@ FC2流出检测器 - 视频状态检查与数据处理的核心模块
 提供全面的FC2视频分析功能，支持视频状态检查、磁力链接获取和缩略图下载，
 可处理单个视频或批量视频，支持多线程并行处理以提高效率
 """
+import asyncio
 import json
 import os
 import random
@@ -11,7 +12,7 @@ import re
 import threading
 import time
 import warnings
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from threading import Lock
@@ -36,8 +37,29 @@ from rich.table import Table, box
 
 from config import config
 from src.utils import get_logger
+from src.utils.async_http import AsyncHTTPClient
 from src.utils.cache_manager import CacheManager
+from src.utils.pipeline import Stage, StagedPipeline
+from src.utils.rate_limiter import rate_limiter
 from src.utils.request_handler import RequestHandler
+from src.utils.report_builder import (
+    LEAK_CHECK_ERROR,
+    LEAK_CHECK_LEAKED,
+    LEAK_CHECK_NOT_FOUND,
+    LEAKED_WITH_MAGNET,
+    LEAKED_WITHOUT_MAGNET,
+    UNLEAKED,
+    CategoryReportOutput,
+    LeakedListOutput,
+    MagnetListOutput,
+    MagnetOnlyOutput,
+    ReportBuilder,
+    ReportHeader,
+    ReportSummary,
+    SummaryReportOutput,
+    classify,
+)
+from src.utils.result_sink import ResultSink, iter_results
 from src.utils.i18n import get_text as _  # 添加i18n翻译函数
 
 # 创建console实例
@@ -62,6 +84,7 @@ class FC2Analyzer:
         download_images=True,
         quiet_mode=False,
         is_actress=False,
+        resume=False,
     ):
         """
         初始化FC2分析器
@@ -75,6 +98,7 @@ class FC2Analyzer:
             download_images: 是否下载图片
             quiet_mode: 是否安静模式
             is_actress: 是否为女优ID
+            resume: 是否从上次中断的检查点继续，跳过已完成的视频
         """
         self.write_id = write_id
         self.name = name
@@ -93,6 +117,21 @@ class FC2Analyzer:
         # 创建线程锁，用于多线程安全
         self.lock = threading.Lock()
 
+        # 逐条写入的结果文件 (JSON Lines)，分析开始时创建；启用后结果不在内存中保留
+        self.results_path = None
+        # 未启用流式输出时的结果列表，按视频ID排序
+        self.results = []
+        # 本次分析的结果摘要 (ReportSummary)，每完成一个视频计入一次
+        self.report_summary = None
+        # 已完成的视频ID，按完成顺序记录，用于保存检查点
+        self._processed_ids = []
+
+        # 检查点设置
+        self.resume = resume
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_due = 0  # 已安排保存的结果数
+        self._checkpoint_written = 0  # 已写入检查点的结果数
+
         # 初始化统计信息
         self.stats = {
             "total": 0,  # 总视频数
@@ -125,12 +164,13 @@ class FC2Analyzer:
         # 数据存储
         self.all_videos = []  # 所有视频信息
 
-        # 请求控制参数
-        self.request_interval = config.request_interval
-        self.page_interval = config.page_interval
+        # 请求控制参数 (请求频率由全局按主机限速器控制)
         self.max_retries = config.max_retries
         self.retry_base = config.retry_base
 
+        # 共享的流出状态和磁链缓存
+        self.cache = CacheManager.shared()
+
         # 基础设置
         self.magnet_base_url = config.magnet_search_base
         self.magnet_search_path = config.magnet_search_path
@@ -268,31 +308,291 @@ class FC2Analyzer:
         print(_("analyzer.name_not_found", "无法获取{entity_desc}名称，使用ID: {name}").format(entity_desc=entity_desc, name=self.name))
         return self.name
 
-    def fetch_video_ids(self):
-        """获取作者/女优的所有视频ID
-
-        首先尝试从缓存加载视频列表，如果缓存不存在或已过期，
-        则从FC2PPVDB API获取所有视频信息。
+    def _video_list_endpoint(self):
+        """
+        获取视频列表API的地址和参数名
 
-        Returns:
-            list: 包含视频信息的列表
+        返回:
+            tuple: (API地址, ID参数名, 实体类型显示名称)
         """
         # 根据类型设置不同的API路径和参数
         if self.is_actress:
             # 女优使用特定的API路径
-            entity_type = "actresses"
             entity_id_param = "actressid"
             entity_desc = _("analyzer.entity_type_actress", "女优")
             api_path = "/actresses/actress-articles"
             print(_("analyzer.using_actress_path", "使用女优API路径: {path}").format(path=api_path))
         else:
             # 作者使用常规API路径
-            entity_type = "writers"
             entity_id_param = "writerid"
             entity_desc = _("analyzer.entity_type_writer", "作者")
             api_path = "/writers/writer-articles"
             print(_("analyzer.using_author_path", "使用作者API路径: {path}").format(path=api_path))
 
+        # 确保API基础URL配置正确
+        api_url = f"{config.fc2ppvdb_api_base}/{api_path.lstrip('/')}"
+        return api_url, entity_id_param, entity_desc
+
+    def _fetch_video_page(self, api_url, entity_id_param, page):
+        """
+        获取视频列表的一页
+
+        参数:
+            api_url: 视频列表API地址
+            entity_id_param: ID参数名
+            page: 页码
+
+        返回:
+            dict: API返回的数据，请求失败返回None
+        """
+        print(_("analyzer.request_url", "请求URL: {url}").format(url=f"{api_url}?{entity_id_param}={self.write_id}&page={page}"))
+        # 请求频率由fc2ppvdb.com的限速预算控制；页面未变化时服务器返回304，使用缓存内容
+        response = RequestHandler.conditional_get(
+            api_url,
+            params={
+                entity_id_param: self.write_id,
+                "page": page,
+                "per_page": config.video_page_size,
+            },
+            headers=config.api_headers,
+        )
+
+        if response.status_code != 200:
+            print(_("analyzer.api_request_failed", "API请求失败: {status_code}").format(status_code=response.status_code))
+            return None
+
+        return response.json()
+
+    @staticmethod
+    def _page_count(data):
+        """
+        根据第一页的分页信息计算总页数
+
+        参数:
+            data: 第一页数据
+
+        返回:
+            int: 总页数，分页信息不完整时返回None
+        """
+        last_page = data.get("last_page")
+        if isinstance(last_page, int) and last_page > 0:
+            return last_page
+
+        total = data.get("total")
+        per_page = data.get("per_page")
+        try:
+            total = int(total)
+            per_page = int(per_page)
+        except (TypeError, ValueError):
+            return None
+        if per_page <= 0:
+            return None
+        return max(1, -(-total // per_page))
+
+    def _parse_video_page(self, data, entity_desc):
+        """
+        解析一页视频数据
+
+        参数:
+            data: API返回的数据
+            entity_desc: 实体类型显示名称
+
+        返回:
+            list: 视频信息列表
+        """
+        api_base = config.fc2ppvdb_api_base
+        videos = []
+
+        # 处理视频数据
+        for video in data["data"]:
+            try:
+                # 根据不同实体类型处理视频数据
+                if self.is_actress:
+                    # 女优API的特殊处理 - 使用专门的字段
+                    if "video_id" not in video:
+                        print(_("analyzer.actress_no_video_id", "女优视频数据中找不到video_id字段，跳过"))
+                        continue
+
+                    video_id = str(video["video_id"])
+                    title = video.get("title", f"FC2-PPV-{video_id}")
+
+                    # 直接使用API返回的image_url，仅添加基础URL
+                    image_url = video.get("image_url", "")
+                    if image_url and not image_url.startswith(
+                        ("http://", "https://")
+                    ):
+                        image_url = f"{api_base}/storage/{image_url}"
+
+                    # 删除调试信息输出
+
+                    video_info = {
+                        "video_id": video_id,
+                        "title": title,
+                        "image_url": image_url,
+                        "author_name": self.name
+                        or f"{entity_desc}_{self.write_id}",
+                    }
+                else:
+                    # 作者数据处理 - 尝试查找video_id字段
+                    video_id = None
+                    for id_field in [
+                        "video_id",
+                        "id",
+                        "articleid",
+                        "article_id",
+                        "videoid",
+                    ]:
+                        if id_field in video:
+                            video_id = str(video[id_field])
+                            # 删除调试信息输出
+                            break
+
+                    # 如果没有找到，尝试第一个数字类型的字段
+                    if video_id is None:
+                        for key, value in video.items():
+                            if (
+                                isinstance(value, (int, str))
+                                and str(value).isdigit()
+                            ):
+                                video_id = str(value)
+                                # 删除调试信息输出
+                                break
+
+                    # 如果还是没找到ID，则跳过此视频
+                    if video_id is None:
+                        print(_("analyzer.author_no_video_id", "无法确定作者视频ID，跳过此视频数据"))
+                        continue
+
+                    # 处理图片URL - 使用算法构建
+                    first_digit = video_id[0]
+                    first_part = f"00{first_digit}"
+                    second_part = video_id[1:3]
+                    image_url = f"{api_base}/storage/thumbs/article/{first_part}/{second_part}/fc2ppv-{video_id}.jpg"
+
+                    video_info = {
+                        "video_id": video_id,
+                        "title": video.get("title", f"FC2-PPV-{video_id}"),
+                        "image_url": image_url,
+                        "author_name": self.name
+                        or f"{entity_desc}_{self.write_id}",
+                    }
+
+                videos.append(video_info)
+
+            except Exception as e:
+                print(_("analyzer.process_video_error", "处理单个视频数据时出错: {error}").format(error=str(e)))
+                continue
+
+        return videos
+
+    def _fetch_remaining_pages(self, api_url, entity_id_param, entity_desc, last_page):
+        """
+        并发获取第2页到最后一页，按页码顺序合并
+
+        参数:
+            api_url: 视频列表API地址
+            entity_id_param: ID参数名
+            entity_desc: 实体类型显示名称
+            last_page: 总页数
+
+        返回:
+            tuple: (第2页起的视频信息列表, 获取失败的页码列表)
+        """
+        print(_("analyzer.parallel_pages", "共 {pages} 页，并发获取剩余页面...").format(pages=last_page))
+
+        def fetch(page):
+            try:
+                data = self._fetch_video_page(api_url, entity_id_param, page)
+            except Exception as e:
+                print(_("analyzer.fetch_page_error", "获取视频列表页面 {page} 时出错: {error}").format(page=page, error=str(e)))
+                return None
+            if data is None:
+                return None
+            if not data.get("data"):
+                return []
+            return self._parse_video_page(data, entity_desc)
+
+        videos = []
+        missing_pages = []
+        pages = range(2, last_page + 1)
+        # 并发数只决定同时在途的请求，实际请求速率仍受fc2ppvdb.com的限速预算约束
+        with ThreadPoolExecutor(max_workers=max(1, config.page_workers)) as executor:
+            for page, page_videos in zip(pages, executor.map(fetch, pages)):
+                if page_videos is None:
+                    missing_pages.append(page)
+                    continue
+                videos.extend(page_videos)
+        return videos, missing_pages
+
+    def _refresh_video_list(self, api_url, entity_id_param, entity_desc, cached_videos):
+        """
+        增量刷新过期的视频列表
+
+        视频列表按上传时间从新到旧排列，从第一页开始获取，
+        直到某一页出现已知视频为止，再把新视频合并到缓存列表前面
+
+        参数:
+            api_url: 视频列表API地址
+            entity_id_param: ID参数名
+            entity_desc: 实体类型显示名称
+            cached_videos: 过期缓存中的视频列表
+
+        返回:
+            list: 合并后的视频列表，请求失败时返回None以便回退到完整获取
+        """
+        known_ids = {str(video["video_id"]) for video in cached_videos}
+        new_videos = []
+        page = 1
+
+        while True:
+            try:
+                data = self._fetch_video_page(api_url, entity_id_param, page)
+            except Exception as e:
+                print(_("analyzer.fetch_page_error", "获取视频列表页面 {page} 时出错: {error}").format(page=page, error=str(e)))
+                return None
+            if data is None:
+                return None
+            if not data.get("data"):
+                break
+
+            page_videos = self._parse_video_page(data, entity_desc)
+            page_new = [
+                video for video in page_videos if video["video_id"] not in known_ids
+            ]
+            new_videos.extend(page_new)
+            known_ids.update(video["video_id"] for video in page_new)
+
+            # 本页已出现已知视频(之后的页面都是旧视频)，或已到最后一页
+            if len(page_new) < len(page_videos) or data.get("next_page_url") is None:
+                break
+            page += 1
+
+        all_videos = new_videos + cached_videos
+        print(
+            _("analyzer.incremental_refresh", "增量刷新完成: 获取 {pages} 页，新增 {new} 个视频，共 {count} 个").format(
+                pages=page, new=len(new_videos), count=len(all_videos)
+            )
+        )
+        self.all_videos = all_videos
+        self.stats["total"] = len(all_videos)
+
+        # 保存合并后的列表，同时刷新缓存时间
+        CacheManager.save(self.write_id, all_videos, self.is_actress)
+        return all_videos
+
+    def fetch_video_ids(self):
+        """获取作者/女优的所有视频ID
+
+        首先尝试从缓存加载视频列表，如果缓存不存在或已过期，
+        则从FC2PPVDB API获取所有视频信息。
+        第一页带有总页数时，其余页面并发获取；否则按next_page_url逐页获取。
+        缓存过期时优先增量刷新，只获取新上传的视频。
+
+        Returns:
+            list: 包含视频信息的列表
+        """
+        api_url, entity_id_param, entity_desc = self._video_list_endpoint()
+
         # 首先尝试从缓存中加载
         cached_videos = CacheManager.load(self.write_id, self.is_actress)
         if cached_videos:
@@ -300,141 +600,75 @@ class FC2Analyzer:
             print(_("analyzer.loaded_from_cache", "从缓存中读取到 {count} 个视频").format(count=self.stats["total"]))
             return cached_videos
 
+        # 缓存过期时只获取新上传的视频，合并到原有列表
+        if config.incremental_refresh:
+            stale_videos = CacheManager.load_expired(self.write_id, self.is_actress)
+            if stale_videos:
+                refreshed = self._refresh_video_list(
+                    api_url, entity_id_param, entity_desc, stale_videos
+                )
+                if refreshed is not None:
+                    return refreshed
+
         print(_("analyzer.start_fetching", "开始获取{entity_desc} {id} 的视频列表...").format(entity_desc=entity_desc, id=self.write_id))
         all_videos = []
+        # 获取失败的页码，列表不完整时不写入缓存
+        missing_pages = []
         page = 1
 
-        # 确保API基础URL配置正确
-        api_base = config.fc2ppvdb_api_base
-
         while True:
             try:
                 # 从API获取视频列表
-                api_url = f"{api_base}/{api_path.lstrip('/')}"
-                print(_("analyzer.request_url", "请求URL: {url}").format(url=f"{api_url}?{entity_id_param}={self.write_id}&page={page}"))
-                response = requests.get(
-                    api_url,
-                    params={
-                        entity_id_param: self.write_id,
-                        "page": page,
-                        "per_page": 100,
-                    },
-                    headers=config.api_headers,
-                )
-
-                if response.status_code != 200:
-                    print(_("analyzer.api_request_failed", "API请求失败: {status_code}").format(status_code=response.status_code))
+                data = self._fetch_video_page(api_url, entity_id_param, page)
+                if data is None:
+                    if page > 1:
+                        missing_pages.append(page)
                     break
 
-                data = response.json()
                 if not data.get("data"):
                     print(_("analyzer.api_empty_data", "API返回数据为空，可能该{entity_desc}没有视频").format(entity_desc=entity_desc))
                     break
 
-                # 记录API返回的第一个视频数据结构（用于调试）
-                if page == 1 and len(data.get("data", [])) > 0:
-                    sample_video = data["data"][0]
-                    # 删除调试信息输出
-                    pass
-
                 # 处理视频数据
-                for video in data["data"]:
-                    try:
-                        # 根据不同实体类型处理视频数据
-                        if self.is_actress:
-                            # 女优API的特殊处理 - 使用专门的字段
-                            if "video_id" not in video:
-                                print(_("analyzer.actress_no_video_id", "女优视频数据中找不到video_id字段，跳过"))
-                                continue
-
-                            video_id = str(video["video_id"])
-                            title = video.get("title", f"FC2-PPV-{video_id}")
-
-                            # 直接使用API返回的image_url，仅添加基础URL
-                            image_url = video.get("image_url", "")
-                            if image_url and not image_url.startswith(
-                                ("http://", "https://")
-                            ):
-                                image_url = f"{api_base}/storage/{image_url}"
-
-                            # 删除调试信息输出
-
-                            video_info = {
-                                "video_id": video_id,
-                                "title": title,
-                                "image_url": image_url,
-                                "author_name": self.name
-                                or f"{entity_desc}_{self.write_id}",
-                            }
-                        else:
-                            # 作者数据处理 - 尝试查找video_id字段
-                            video_id = None
-                            for id_field in [
-                                "video_id",
-                                "id",
-                                "articleid",
-                                "article_id",
-                                "videoid",
-                            ]:
-                                if id_field in video:
-                                    video_id = str(video[id_field])
-                                    # 删除调试信息输出
-                                    break
-
-                            # 如果没有找到，尝试第一个数字类型的字段
-                            if video_id is None:
-                                for key, value in video.items():
-                                    if (
-                                        isinstance(value, (int, str))
-                                        and str(value).isdigit()
-                                    ):
-                                        video_id = str(value)
-                                        # 删除调试信息输出
-                                        break
-
-                            # 如果还是没找到ID，则跳过此视频
-                            if video_id is None:
-                                print(_("analyzer.author_no_video_id", "无法确定作者视频ID，跳过此视频数据"))
-                                continue
-
-                            # 处理图片URL - 使用算法构建
-                            first_digit = video_id[0]
-                            first_part = f"00{first_digit}"
-                            second_part = video_id[1:3]
-                            image_url = f"{api_base}/storage/thumbs/article/{first_part}/{second_part}/fc2ppv-{video_id}.jpg"
-
-                            video_info = {
-                                "video_id": video_id,
-                                "title": video.get("title", f"FC2-PPV-{video_id}"),
-                                "image_url": image_url,
-                                "author_name": self.name
-                                or f"{entity_desc}_{self.write_id}",
-                            }
-
-                        all_videos.append(video_info)
-
-                    except Exception as e:
-                        print(_("analyzer.process_video_error", "处理单个视频数据时出错: {error}").format(error=str(e)))
-                        continue
+                all_videos.extend(self._parse_video_page(data, entity_desc))
 
                 # 检查是否还有更多页
                 if data.get("next_page_url") is None:
                     break
 
+                # 第一页已给出总页数时，其余页面并发获取
+                last_page = self._page_count(data) if page == 1 else None
+                if config.parallel_pagination and last_page and last_page > 1:
+                    remaining, failed_pages = self._fetch_remaining_pages(
+                        api_url, entity_id_param, entity_desc, last_page
+                    )
+                    all_videos.extend(remaining)
+                    missing_pages.extend(failed_pages)
+                    break
+
+                # 翻页频率由fc2ppvdb.com的限速预算控制
                 page += 1
-                time.sleep(random.uniform(1, 3))  # 随机延迟
             except Exception as e:
                 print(_("analyzer.fetch_page_error", "获取视频列表页面 {page} 时出错: {error}").format(page=page, error=str(e)))
+                if page > 1:
+                    missing_pages.append(page)
                 break
 
         # 完成获取所有视频
         total_videos = len(all_videos)
         if total_videos > 0:
-            print(_("analyzer.fetch_complete", "已获取 {count} 个视频，开始保存缓存...").format(count=total_videos))
             self.all_videos = all_videos
             self.stats["total"] = total_videos
 
+            # 有页面获取失败时返回已获取的部分，但不写入缓存，下次运行重新获取完整列表
+            if missing_pages:
+                pages = ", ".join(str(page) for page in missing_pages)
+                logger.warning(f"{entity_desc} {self.write_id} 的视频列表不完整，缺少第 {pages} 页，本次不写入缓存")
+                print(_("analyzer.incomplete_video_list", "已获取 {count} 个视频，但视频列表不完整 (缺少第 {pages} 页)，本次不写入缓存").format(count=total_videos, pages=pages))
+                return all_videos
+
             # 保存到缓存
+            print(_("analyzer.fetch_complete", "已获取 {count} 个视频，开始保存缓存...").format(count=total_videos))
             CacheManager.save(self.write_id, all_videos, self.is_actress)
             return all_videos
         else:
@@ -445,38 +679,229 @@ class FC2Analyzer:
         """
         检查视频状态，判断是否可用
 
+        优先使用流出状态缓存，未命中时才请求检查站点
+
+        参数:
+            video_id: 视频ID
+
+        返回:
+            str: 视频状态 ('available', 'unavailable')
+        """
+        return self._map_leak_status(video_id, self._leak_check(video_id))
+
+    def _leak_check(self, video_id):
+        """
+        检查视频是否流出，优先使用流出状态缓存
+
         参数:
             video_id: 视频ID
 
         返回:
-            str: 视频状态 ('available', 'unavailable', 'error')
+            dict: 站点检查结果，status为leaked、not_found或error
         """
+        cached = self._cached_leak_check(video_id)
+        if cached is not None:
+            return cached
+
         try:
             # 使用RequestHandler统一的视频检查方法
-            from src.utils.request_handler import RequestHandler
+            check = RequestHandler.check_video_leak_result(video_id)
+        except Exception as e:
+            # 记录错误
+            self.logger.error(_("logger.video_check_error", "检查视频 {video_id} 状态出错: {error}").format(video_id=video_id, error=str(e)))
+            check = {"status": "error", "site": None, "status_code": None}
 
-            is_leaked, site_name, status_code = RequestHandler.check_video_leak_status(
-                video_id
-            )
+        self._store_leak_check(video_id, check)
+        return check
 
-            # 映射结果到现有的返回格式
-            if is_leaked:
-                self.logger.info(
-                    _("logger.video_check_response", "视频 {video_id} 在站点 {site_name} 的响应码为 {status_code}，视频已流出").format(
-                        video_id=video_id, site_name=site_name, status_code=status_code
-                    )
-                )
-                return "available"
-            else:
-                # 如果未找到视频，视为未流出
-                self.logger.info(_("logger.video_not_leaked", "视频 {video_id} 未在任何站点找到，视频未流出").format(video_id=video_id))
-                return "unavailable"
+    async def check_video_status_async(self, client, video_id):
+        """
+        check_video_status的异步版本
+
+        参数:
+            client: AsyncHTTPClient实例
+            video_id: 视频ID
 
+        返回:
+            str: 视频状态 ('available', 'unavailable')
+        """
+        return self._map_leak_status(
+            video_id, await self._leak_check_async(client, video_id)
+        )
+
+    async def _leak_check_async(self, client, video_id):
+        """_leak_check的异步版本"""
+        cached = self._cached_leak_check(video_id)
+        if cached is not None:
+            return cached
+
+        try:
+            check = await RequestHandler.check_video_leak_result_async(client, video_id)
         except Exception as e:
-            # 记录错误
             self.logger.error(_("logger.video_check_error", "检查视频 {video_id} 状态出错: {error}").format(video_id=video_id, error=str(e)))
-            # 连接错误、超时等异常情况也应该保守处理为未流出
-            return "unavailable"
+            check = {"status": "error", "site": None, "status_code": None}
+
+        self._store_leak_check(video_id, check)
+        return check
+
+    def _cached_leak_check(self, video_id):
+        """读取流出状态缓存，未启用或未命中时返回None"""
+        if not config.leak_status_cache:
+            return None
+        cached = self.cache.get_video_status(video_id)
+        if cached is not None:
+            self.logger.info(
+                _("logger.video_status_cache_hit", "视频 {video_id} 使用缓存的检查结果: {status}").format(
+                    video_id=video_id, status=cached["status"]
+                )
+            )
+        return cached
+
+    def _store_leak_check(self, video_id, check):
+        """记录流出检查结果"""
+        if config.leak_status_cache:
+            self.cache.set_video_status(
+                video_id, check["status"], check.get("site"), check.get("status_code")
+            )
+
+    def _map_leak_status(self, video_id, check):
+        """将站点检查结果映射为视频状态"""
+        if check["status"] == "leaked":
+            self.logger.info(
+                _("logger.video_check_response", "视频 {video_id} 在站点 {site_name} 的响应码为 {status_code}，视频已流出").format(
+                    video_id=video_id, site_name=check.get("site"), status_code=check.get("status_code")
+                )
+            )
+            return "available"
+
+        # 如果未找到视频，视为未流出；连接错误、超时等异常情况也保守处理为未流出
+        self.logger.info(_("logger.video_not_leaked", "视频 {video_id} 未在任何站点找到，视频未流出").format(video_id=video_id))
+        return "unavailable"
+
+    def _retry_backoff(self):
+        """三级重试策略的等待时间(秒)"""
+        return [
+            random.uniform(1.5, 3.0),  # 第1次重试（1.5-3秒）
+            random.uniform(3.0, 6.0),  # 第2次重试（3-6秒）
+            random.uniform(6.0, 12.0),  # 第3次重试（6-12秒）
+        ]
+
+    def _parse_magnet_entries(self, html):
+        """
+        解析磁链搜索结果页面
+
+        参数:
+            html: 搜索结果页面HTML
+
+        返回:
+            list: 按文件大小降序排列的条目，页面中没有种子列表时返回None
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        # 获取种子列表表格
+        torrent_table = soup.select_one("table.torrent-list")
+
+        if not torrent_table:
+            return None
+
+        # 收集有效的条目
+        valid_entries = []
+
+        # 遍历表格行
+        for row in torrent_table.select("tbody tr"):
+            try:
+                # 获取磁力链接
+                magnet_link = row.select_one('a[href^="magnet:"]')
+                # 获取文件大小单元格
+                size_cell = row.select_one(
+                    "td.text-center:nth-of-type(4)"
+                )
+                # 获取标题链接
+                title_link = row.select_one(
+                    'td[colspan="2"] a'
+                ) or row.select_one('a[href^="/view"]')
+
+                if not all([magnet_link, size_cell, title_link]):
+                    continue
+
+                # 解析文件大小
+                raw_size = size_cell.text.strip()
+                if not raw_size:
+                    continue
+
+                # 内联原先的_parse_size方法的功能
+                # 解析大小为字节数
+                parsed_size = 0
+                size_str = raw_size.lower().strip()
+                if size_str:
+                    multipliers = {
+                        "b": 1,
+                        "kb": 1024,
+                        "k": 1024,
+                        "mb": 1024**2,
+                        "m": 1024**2,
+                        "gb": 1024**3,
+                        "g": 1024**3,
+                        "tb": 1024**4,
+                        "t": 1024**4,
+                    }
+                    
+                    # 匹配数字和单位
+                    match = re.match(r"([0-9.]+)\s*([a-z]+)", size_str)
+                    if match:
+                        size, unit = match.groups()
+                        # 确保单位在我们的映射中
+                        if unit in multipliers:
+                            try:
+                                parsed_size = float(size) * multipliers[unit]
+                            except (ValueError, TypeError):
+                                parsed_size = 0
+
+                # 添加到有效条目
+                valid_entries.append(
+                    {
+                        "size": parsed_size,
+                        "magnet": magnet_link["href"],
+                        "title": title_link.text.strip(),
+                        "raw_size": raw_size,
+                    }
+                )
+            except Exception as e:
+                continue
+
+        # 按文件大小降序排序（优先大文件）
+        valid_entries.sort(key=lambda x: x["size"], reverse=True)
+        return valid_entries
+
+    def _select_magnets(self, valid_entries, attempt):
+        """
+        从解析结果中选出磁链并更新统计
+
+        参数:
+            valid_entries: _parse_magnet_entries返回的条目
+            attempt: 当前尝试序号，大于0表示重试后成功
+
+        返回:
+            list: 磁链列表
+        """
+        # 提取前1个磁链（体积最大的）
+        selected_entries = valid_entries[:1]
+
+        # 如果是重试后成功，更新重试成功统计
+        if attempt > 0:
+            with self.lock:
+                self.stats["magnet_retry_success"] += 1
+
+        # 在非安静模式下输出
+        if not hasattr(self, "quiet_mode") or not self.quiet_mode:
+            console.print(
+                f"[green]{_('analyzer.found_magnets', '找到 {len} 个磁力链接，选择体积最大的').format(len=len(selected_entries))}[/green]"
+            )
+
+        with self.lock:
+            self.stats["magnet_success"] += 1
+
+        # 返回磁链列表
+        return [entry["magnet"] for entry in selected_entries]
 
     def fetch_magnet_link(self, video_id):
         """获取视频的磁力链接，按文件大小排序且使用三级重试策略"""
@@ -485,6 +910,10 @@ class FC2Analyzer:
 
         self.logger.info(_("logger.prepare_magnet", "准备获取视频 {video_id} 的磁力链接").format(video_id=video_id))
 
+        cached = self._cached_magnets(video_id)
+        if cached is not None:
+            return cached
+
         try:
             # 构建搜索URL
             search_url = urljoin(
@@ -492,13 +921,11 @@ class FC2Analyzer:
             )
 
             # 三级重试策略
-            backoff_strategy = [
-                random.uniform(1.5, 3.0),  # 第1次重试（1.5-3秒）
-                random.uniform(3.0, 6.0),  # 第2次重试（3-6秒）
-                random.uniform(6.0, 12.0),  # 第3次重试（6-12秒）
-            ]
+            backoff_strategy = self._retry_backoff()
 
             max_retries = min(len(backoff_strategy), config.max_retries)
+            # 是否拿到过有效的搜索结果页面，只有确认没有磁链时才缓存"未找到"
+            searched = False
 
             for attempt in range(max_retries + 1):  # +1是初始尝试
                 try:
@@ -516,18 +943,9 @@ class FC2Analyzer:
                         with self.lock:
                             self.stats["magnet_retries"] += 1
 
-                    # 确保请求间隔≥5秒
-                    current_time = time.time()
-                    # 初始化last_request_time属性（如果不存在）
-                    if not hasattr(self, "last_request_time"):
-                        self.last_request_time = 0
-                        
-                    elapsed = current_time - self.last_request_time
-                    if elapsed < 5.0:
-                        time.sleep(5.0 - elapsed)
-                    self.last_request_time = current_time
-
-                    response = requests.get(
+                    # 请求间隔由sukebei.nyaa.si的限速预算控制，所有线程共享
+                    response = RequestHandler.request(
+                        "GET",
                         search_url,
                         headers=config.api_headers,
                         timeout=config.timeout,
@@ -545,103 +963,17 @@ class FC2Analyzer:
                         continue
 
                     if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, "html.parser")
-                        # 获取种子列表表格
-                        torrent_table = soup.select_one("table.torrent-list")
-
-                        if not torrent_table:
+                        searched = True
+                        valid_entries = self._parse_magnet_entries(response.text)
+                        if valid_entries is None:
                             self.logger.warning(_("logger.no_torrent_table", "未找到种子列表表格"))
                             continue
 
-                        # 收集有效的条目
-                        valid_entries = []
-
-                        # 遍历表格行
-                        for row in torrent_table.select("tbody tr"):
-                            try:
-                                # 获取磁力链接
-                                magnet_link = row.select_one('a[href^="magnet:"]')
-                                # 获取文件大小单元格
-                                size_cell = row.select_one(
-                                    "td.text-center:nth-of-type(4)"
-                                )
-                                # 获取标题链接
-                                title_link = row.select_one(
-                                    'td[colspan="2"] a'
-                                ) or row.select_one('a[href^="/view"]')
-
-                                if not all([magnet_link, size_cell, title_link]):
-                                    continue
-
-                                # 解析文件大小
-                                raw_size = size_cell.text.strip()
-                                if not raw_size:
-                                    continue
-
-                                # 内联原先的_parse_size方法的功能
-                                # 解析大小为字节数
-                                parsed_size = 0
-                                size_str = raw_size.lower().strip()
-                                if size_str:
-                                    multipliers = {
-                                        "b": 1,
-                                        "kb": 1024,
-                                        "k": 1024,
-                                        "mb": 1024**2,
-                                        "m": 1024**2,
-                                        "gb": 1024**3,
-                                        "g": 1024**3,
-                                        "tb": 1024**4,
-                                        "t": 1024**4,
-                                    }
-                                    
-                                    # 匹配数字和单位
-                                    match = re.match(r"([0-9.]+)\s*([a-z]+)", size_str)
-                                    if match:
-                                        size, unit = match.groups()
-                                        # 确保单位在我们的映射中
-                                        if unit in multipliers:
-                                            try:
-                                                parsed_size = float(size) * multipliers[unit]
-                                            except (ValueError, TypeError):
-                                                parsed_size = 0
-
-                                # 添加到有效条目
-                                valid_entries.append(
-                                    {
-                                        "size": parsed_size,
-                                        "magnet": magnet_link["href"],
-                                        "title": title_link.text.strip(),
-                                        "raw_size": raw_size,
-                                    }
-                                )
-                            except Exception as e:
-                                continue
-
-                        # 如果有有效条目，按大小排序并返回
+                        # 如果有有效条目，返回体积最大的磁链
                         if valid_entries:
-                            # 按文件大小降序排序（优先大文件）
-                            valid_entries.sort(key=lambda x: x["size"], reverse=True)
-
-                            # 提取前1个磁链（体积最大的）
-                            selected_entries = valid_entries[:1]
-
-                            # 如果是重试后成功，更新重试成功统计
-                            if attempt > 0:
-                                with self.lock:
-                                    self.stats["magnet_retry_success"] += 1
-
-                            # 在非安静模式下输出
-                            if not hasattr(self, "quiet_mode") or not self.quiet_mode:
-                                console.print(
-                                    f"[green]{_('analyzer.found_magnets', '找到 {len} 个磁力链接，选择体积最大的').format(len=len(selected_entries))}[/green]"
-                                )
-
-                            with self.lock:
-                                self.stats["magnet_success"] += 1
-
-                            # 返回磁链列表
-                            return [entry["magnet"] for entry in selected_entries]
+                            magnets = self._select_magnets(valid_entries, attempt)
+                            self._store_magnets(video_id, magnets)
+                            return magnets
                         else:
                             self.logger.warning(_("logger.no_magnet_found", "未找到视频 {video_id} 的磁力链接").format(video_id=video_id))
                     else:
@@ -667,6 +999,8 @@ class FC2Analyzer:
             with self.lock:
                 self.stats["magnet_fail"] += 1
                 self.stats["magnet_not_found"] += 1
+            if searched:
+                self._store_magnets(video_id, [])
             return []
 
         except Exception as e:
@@ -675,6 +1009,95 @@ class FC2Analyzer:
                 self.stats["magnet_fail"] += 1
             return []
 
+    async def fetch_magnet_link_async(self, client, video_id):
+        """fetch_magnet_link的异步版本，解析和重试策略与同步版本一致"""
+        if not self.with_magnet:
+            return []
+
+        self.logger.info(_("logger.prepare_magnet", "准备获取视频 {video_id} 的磁力链接").format(video_id=video_id))
+
+        cached = self._cached_magnets(video_id)
+        if cached is not None:
+            return cached
+
+        search_url = urljoin(
+            self.magnet_base_url, self.magnet_search_path.format(vid=video_id)
+        )
+        backoff_strategy = self._retry_backoff()
+        max_retries = min(len(backoff_strategy), config.max_retries)
+        searched = False
+
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                self.logger.info(
+                    _("logger.magnet_retry", "正在重试获取磁力链接({attempt}/{max_retries}): {video_id}").format(
+                        attempt=attempt, max_retries=max_retries, video_id=video_id
+                    )
+                )
+                delay = backoff_strategy[attempt - 1]
+                self.logger.info(_("logger.wait_retry", "等待 {wait_time:.2f} 秒后重试...").format(wait_time=delay))
+                await asyncio.sleep(delay)
+                with self.lock:
+                    self.stats["magnet_retries"] += 1
+
+            try:
+                response = await client.request(
+                    "GET", search_url, headers=config.api_headers, timeout=config.timeout
+                )
+            except Exception as e:
+                self.logger.warning(_("logger.network_error", "网络错误: {error}").format(error=str(e)))
+                continue
+
+            if response.status_code in [429, 403]:
+                wait_time = (2**attempt) + random.uniform(1.0, 3.0)
+                self.logger.warning(
+                    _("logger.rate_limit", "受到限流或访问拒绝 (状态码: {status_code})，等待 {wait_time:.2f} 秒后重试").format(
+                        status_code=response.status_code, wait_time=wait_time
+                    )
+                )
+                await asyncio.sleep(wait_time)
+                continue
+
+            if response.status_code == 200:
+                searched = True
+                valid_entries = self._parse_magnet_entries(response.text)
+                if valid_entries is None:
+                    self.logger.warning(_("logger.no_torrent_table", "未找到种子列表表格"))
+                    continue
+                if valid_entries:
+                    magnets = self._select_magnets(valid_entries, attempt)
+                    self._store_magnets(video_id, magnets)
+                    return magnets
+                self.logger.warning(_("logger.no_magnet_found", "未找到视频 {video_id} 的磁力链接").format(video_id=video_id))
+            else:
+                self.logger.warning(_("logger.magnet_response_failed", "获取磁力链接响应失败，状态码: {status_code}").format(status_code=response.status_code))
+
+        # 如果所有重试都失败
+        with self.lock:
+            self.stats["magnet_fail"] += 1
+            self.stats["magnet_not_found"] += 1
+        if searched:
+            self._store_magnets(video_id, [])
+        return []
+
+    def _cached_magnets(self, video_id):
+        """读取磁链缓存，未启用或未命中时返回None"""
+        if not config.magnet_cache:
+            return None
+        cached = self.cache.get_magnets(video_id)
+        if cached is not None:
+            self.logger.info(
+                _("logger.magnet_cache_hit", "视频 {video_id} 使用缓存的磁链结果: {count} 个").format(
+                    video_id=video_id, count=len(cached)
+                )
+            )
+        return cached
+
+    def _store_magnets(self, video_id, magnets):
+        """记录磁链获取结果，空列表表示未找到"""
+        if config.magnet_cache:
+            self.cache.set_magnets(video_id, magnets)
+
     def _save_error_log(self, video_id, url, response=None, error_msg=None):
         """保存详细的错误日志"""
         try:
@@ -701,6 +1124,71 @@ class FC2Analyzer:
         except Exception as e:
             self.logger.error(_("logger.error_log_failed", "保存错误日志失败: {error}").format(error=str(e)))
 
+    def _image_target(self, video_id, video_status, image_url=None):
+        """
+        计算缩略图的保存路径和下载地址
+
+        参数:
+            video_id: 视频ID
+            video_status: 视频状态，决定保存到leaked或unleaked目录
+            image_url: 视频数据中的图片地址，为空时根据ID构建
+
+        返回:
+            tuple: (保存路径, 图片URL)
+        """
+        # 创建基于作者/女优的目录结构
+        entity_type = "actress" if self.is_actress else "author"
+        entity_name = self.name or ("未知女优" if self.is_actress else "未知作者")
+        entity_name = self.clean_filename(entity_name)
+
+        # 构建唯一目录名
+        entity_dir = os.path.join(
+            self.download_path, f"{entity_type}_{self.write_id}_{entity_name}"
+        )
+
+        # 正确分类流出状态 - "available" 对应已流出，应该放在leaked目录
+        # 增加更严格的判断逻辑，确保正确识别视频状态
+        is_leaked = False
+        if video_status == "available":
+            is_leaked = True
+        elif isinstance(video_status, bool):
+            is_leaked = video_status
+        elif isinstance(video_status, str) and video_status.lower() in [
+            "true",
+            "leaked",
+            "yes",
+        ]:
+            is_leaked = True
+
+        # 注意：在日志中正确记录流出状态
+        status_desc = "已流出" if is_leaked else "未流出"
+
+        status_dir = os.path.join(entity_dir, "leaked" if is_leaked else "unleaked")
+        os.makedirs(status_dir, exist_ok=True)
+
+        # 构造图片文件名 [视频ID].jpg
+        file_ext = ".jpg"  # 默认扩展名
+        if image_url:
+            url_path = urlparse(image_url).path
+            if "." in url_path:
+                ext = os.path.splitext(url_path)[1].lower()
+                if ext:
+                    file_ext = ext
+
+        save_path = os.path.join(status_dir, f"{video_id}{file_ext}")
+        self.logger.info(_("logger.image_save_path", "图片保存路径: {save_path}, 流出状态: {status_desc}").format(save_path=save_path, status_desc=status_desc))
+
+        # 如果没有图片URL，则需要构建
+        if not image_url:
+            # 第二种方法：根据ID构建直接URL（更可靠但可能不是最新的）
+            video_id_str = str(video_id)
+            first_part = video_id_str[:-3]  # 除了最后3位
+            second_part = video_id_str[-3:]  # 最后3位
+            
+            image_url = f"{config.fc2ppvdb_api_base}/storage/thumbs/article/{first_part}/{second_part}/fc2ppv-{video_id}.jpg"
+
+        return save_path, image_url
+
     def download_image(self, video_id):
         """下载视频缩略图，正确区分流出和未流出状态"""
         try:
@@ -731,47 +1219,7 @@ class FC2Analyzer:
                 self.logger.error(_("logger.invalid_video_id", "无效的视频ID: {video_id}").format(video_id=video_id))
                 return None
 
-            # 创建基于作者/女优的目录结构
-            entity_type = "actress" if self.is_actress else "author"
-            entity_name = self.name or ("未知女优" if self.is_actress else "未知作者")
-            entity_name = self.clean_filename(entity_name)
-
-            # 构建唯一目录名
-            entity_dir = os.path.join(
-                self.download_path, f"{entity_type}_{self.write_id}_{entity_name}"
-            )
-
-            # 正确分类流出状态 - "available" 对应已流出，应该放在leaked目录
-            # 增加更严格的判断逻辑，确保正确识别视频状态
-            is_leaked = False
-            if video_status == "available":
-                is_leaked = True
-            elif isinstance(video_status, bool):
-                is_leaked = video_status
-            elif isinstance(video_status, str) and video_status.lower() in [
-                "true",
-                "leaked",
-                "yes",
-            ]:
-                is_leaked = True
-
-            # 注意：在日志中正确记录流出状态
-            status_desc = "已流出" if is_leaked else "未流出"
-
-            status_dir = os.path.join(entity_dir, "leaked" if is_leaked else "unleaked")
-            os.makedirs(status_dir, exist_ok=True)
-
-            # 构造图片文件名 [视频ID].jpg
-            file_ext = ".jpg"  # 默认扩展名
-            if image_url:
-                url_path = urlparse(image_url).path
-                if "." in url_path:
-                    ext = os.path.splitext(url_path)[1].lower()
-                    if ext:
-                        file_ext = ext
-
-            save_path = os.path.join(status_dir, f"{video_id}{file_ext}")
-            self.logger.info(_("logger.image_save_path", "图片保存路径: {save_path}, 流出状态: {status_desc}").format(save_path=save_path, status_desc=status_desc))
+            save_path, image_url = self._image_target(video_id, video_status, image_url)
 
             # 检查是否已存在(重复下载保护)
             if os.path.exists(save_path):
@@ -781,21 +1229,8 @@ class FC2Analyzer:
                     self.stats["image_success"] += 1
                 return save_path
 
-            # 如果没有图片URL，则需要构建
-            if not image_url:
-                # 第二种方法：根据ID构建直接URL（更可靠但可能不是最新的）
-                video_id_str = str(video_id)
-                first_part = video_id_str[:-3]  # 除了最后3位
-                second_part = video_id_str[-3:]  # 最后3位
-                
-                image_url = f"{config.fc2ppvdb_api_base}/storage/thumbs/article/{first_part}/{second_part}/fc2ppv-{video_id}.jpg"
-
             # 三级重试策略
-            backoff_strategy = [
-                random.uniform(1.5, 3.0),
-                random.uniform(3.0, 6.0),
-                random.uniform(6.0, 12.0),
-            ]
+            backoff_strategy = self._retry_backoff()
 
             max_retries = min(len(backoff_strategy), config.max_retries)
 
@@ -814,7 +1249,8 @@ class FC2Analyzer:
                         with self.lock:
                             self.stats["image_retries"] += 1
 
-                    response = requests.get(
+                    response = RequestHandler.request(
+                        "GET",
                         image_url,
                         headers=config.api_headers,
                         timeout=config.timeout,
@@ -850,6 +1286,85 @@ class FC2Analyzer:
                 self.stats["image_fail"] += 1
             return None
 
+    async def download_image_async(self, client, video_obj):
+        """
+        download_image的异步版本
+
+        参数:
+            client: AsyncHTTPClient实例
+            video_obj: 视频对象，需包含video_id和status
+
+        返回:
+            str: 图片保存路径，失败返回None
+        """
+        if not self.download_images:
+            return None
+
+        video_id = str(video_obj.get("video_id", ""))
+        try:
+            # 检查video_id有效性
+            if not video_id or not video_id.isdigit():
+                self.logger.error(_("logger.invalid_video_id", "无效的视频ID: {video_id}").format(video_id=video_id))
+                return None
+
+            save_path, image_url = self._image_target(
+                video_id, video_obj.get("status"), video_obj.get("image_url")
+            )
+
+            # 检查是否已存在(重复下载保护)
+            if os.path.exists(save_path):
+                self.logger.info(_("logger.image_exists", "缩略图已存在，跳过下载: {save_path}").format(save_path=save_path))
+                with self.lock:
+                    self.stats["image_success"] += 1
+                return save_path
+
+            backoff_strategy = self._retry_backoff()
+            max_retries = min(len(backoff_strategy), config.max_retries)
+
+            for attempt in range(max_retries + 1):
+                if attempt > 0:
+                    self.logger.info(
+                        _("logger.image_retry", "正在重试下载图片({attempt}/{max_retries}): {video_id}").format(
+                            attempt=attempt, max_retries=max_retries, video_id=video_id
+                        )
+                    )
+                    delay = backoff_strategy[attempt - 1]
+                    self.logger.info(_("logger.wait_retry", "等待 {wait_time:.2f} 秒后重试...").format(wait_time=delay))
+                    await asyncio.sleep(delay)
+                    with self.lock:
+                        self.stats["image_retries"] += 1
+
+                try:
+                    response = await client.request(
+                        "GET", image_url, headers=config.api_headers, timeout=config.timeout
+                    )
+                except Exception as e:
+                    self.logger.error(_("logger.image_download_error", "下载图片异常: {error}").format(error=str(e)))
+                    continue
+
+                if response.status_code == 200:
+                    with open(save_path, "wb") as f:
+                        f.write(response.content)
+
+                    with self.lock:
+                        if attempt > 0:
+                            self.stats["image_retry_success"] += 1
+                        self.stats["image_success"] += 1
+                    return save_path
+
+                self.logger.warning(_("logger.image_download_failed", "下载图片失败，状态码: {status_code}").format(status_code=response.status_code))
+
+            # 如果所有重试都失败
+            with self.lock:
+                self.stats["image_fail"] += 1
+            return None
+
+        except Exception as e:
+            self.logger.error(_("logger.image_error", "下载视频 {video_id} 图片出错: {error}").format(video_id=video_id, error=str(e)))
+            with self.lock:
+                self.stats["image_fail"] += 1
+            return None
+
     def clean_filename(self, name):
         """清理文件名中的非法字符"""
         if not name:
@@ -860,466 +1375,730 @@ class FC2Analyzer:
         for char in ["\\", "/", "*", "?", ":", '"', "<", ">", "|"]:
             cleaned = cleaned.replace(char, "_")
 
-        # 再用正则表达式进行一次替换以确保安全
-        cleaned = re.sub(r'[\\/*?:"<>|]', "_", cleaned).strip(". ")
+        # 再用正则表达式进行一次替换以确保安全
+        cleaned = re.sub(r'[\\/*?:"<>|]', "_", cleaned).strip(". ")
+
+        # 限制长度
+        if len(cleaned) > 50:
+            cleaned = cleaned[:50] + "..."
+
+        return cleaned
+
+    def _result_source(self, results=None):
+        """
+        返回按视频ID排序的结果迭代器工厂
+
+        本次分析写入了结果文件时从文件流式读取，否则遍历传入的结果列表
+
+        参数:
+            results: 结果列表
+
+        返回:
+            callable: 每次调用返回一个新的结果迭代器，没有结果时返回None
+        """
+        if self.results_path and os.path.exists(self.results_path):
+            path = self.results_path
+            return lambda: iter_results(path, sort_by_id=True)
+        if results:
+            return lambda: iter(results)
+        return None
+
+    def iter_results(self):
+        """
+        按视频ID顺序逐条返回本次分析的结果
+
+        启用流式输出时从结果文件读取，结果列表不在内存中保存
+
+        返回:
+            iterator: 单个视频的处理结果
+        """
+        source = self._result_source(self.results)
+        return source() if source else iter(())
+
+    def _report_outputs(self, writer_id, writer_name=None):
+        """
+        创建标准报告 (总报告、分类报告、已流出视频总表和磁链文件) 的输出列表
+
+        参数:
+            writer_id: 作者或女优ID
+            writer_name: 作者或女优名称
+
+        返回:
+            list: ReportOutput列表
+        """
+        # 清理和准备实体名称（作者或女优）
+        entity_name = (
+            writer_name or self.name or ("未知女优" if self.is_actress else "未知作者")
+        )
+
+        # 调试输出 - 不再输出重复日志
+        self.logger.info(_("logger.generate_report", "=== 生成报告 ==="))
+        self.logger.info(_("logger.original_writer_name", "原始writer_name: '{writer_name}'").format(writer_name=writer_name))
+
+        # 创建唯一前缀，区分作者和女优，但保持文件名结构一致
+        # 修改：无论是作者还是女优，统一使用"author"为前缀格式，保持一致性
+        entity_type = "author"
+
+        # 检查是否包含特殊字符，如果包含则只使用ID
+        has_special_chars = any(
+            c in entity_name for c in ["\\", "/", "*", "?", ":", '"', "<", ">", "|"]
+        )
+        self.logger.info(_("logger.has_special_chars", "是否包含特殊字符: {has_special_chars}").format(has_special_chars=has_special_chars))
+
+        if has_special_chars:
+            self.logger.info(_("logger.name_special_chars", "名称包含特殊字符，只使用ID"))
+            clean_name = ""
+            file_prefix = f"{entity_type}_{writer_id}"
+        else:
+            # 清理名称并使用
+            clean_name = self.clean_filename(entity_name)
+            file_prefix = f"{entity_type}_{writer_id}_{clean_name}"
+
+        self.logger.info(_("logger.file_prefix", "生成的文件前缀: '{file_prefix}'").format(file_prefix=file_prefix))
+
+        # 确保目录存在
+        result_dir = config.result_dir
+        os.makedirs(result_dir, exist_ok=True)
+
+        entity_desc = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
+        header = ReportHeader(
+            entity_desc,
+            writer_id,
+            entity_name,
+            clean_name,
+            has_special_chars,
+            datetime.now().strftime("%Y%m%d_%H%M%S"),
+        )
+
+        def report_path(label):
+            return os.path.join(result_dir, f"{writer_id}_{clean_name}_{label}.txt")
+
+        return [
+            # 1. 总报告
+            SummaryReportOutput(report_path(_("reports.file_summary", "总报告")), header),
+            # 2-4. 已流出_有磁链、已流出_无磁链、未流出
+            CategoryReportOutput(
+                LEAKED_WITH_MAGNET,
+                report_path(_("reports.file_leaked_with_magnet", "已流出_有磁链")),
+                header,
+            ),
+            CategoryReportOutput(
+                LEAKED_WITHOUT_MAGNET,
+                report_path(_("reports.file_leaked_without_magnet", "已流出_无磁链")),
+                header,
+            ),
+            CategoryReportOutput(
+                UNLEAKED, report_path(_("reports.file_unleaked", "未流出")), header
+            ),
+            # 5. 已流出视频总表(简洁版-只有ID和标题)
+            LeakedListOutput(report_path(_("reports.file_leaked_summary", "已流出视频总表"))),
+            # 6. 已流出的磁链专用文件
+            MagnetListOutput(
+                os.path.join(result_dir, f"{file_prefix}_{_('reports.file_magnets', '磁链')}.txt")
+            ),
+        ]
+
+    def _new_task(self, video_id):
+        """
+        为单个视频创建流水线任务
+
+        参数:
+            video_id: 视频ID或视频对象
+
+        返回:
+            dict: 包含视频对象(video)和处理结果(result)的任务
+        """
+        # 判断输入是字符串还是视频对象
+        if isinstance(video_id, dict):
+            # 如果传入的是视频对象，提取必要信息
+            # 保存视频对象以供后续使用（特别是获取image_url）
+            video_obj = video_id
+            video_id_str = str(video_obj.get("video_id", ""))
+        else:
+            # 如果只是字符串ID，转换为字符串并创建基本对象
+            video_id_str = str(video_id)
+            video_obj = {"video_id": video_id_str}
+
+        # 初始化结果字典
+        result = {
+            "id": video_id_str,
+            "video_id": video_id_str,  # 添加video_id字段确保兼容性
+            "status": None,
+            "leak_check": None,  # 流出检查的原始结果: leaked、not_found或error
+            "exists": False,
+            "has_magnet": False,
+            "magnets": [],
+            "error": None,
+            "image_downloaded": False,
+            "image_path": None,
+        }
+
+        # 如果有视频对象，复制更多相关信息
+        if isinstance(video_id, dict):
+            result["title"] = video_obj.get("title", "")
+            result["image_url"] = video_obj.get("image_url", "")
+
+        return {"video": video_obj, "result": result}
+
+    def _stage_handlers(self):
+        """返回各处理阶段的名称与处理函数"""
+        return {
+            "check": self._stage_check,
+            "magnet": self._stage_magnet,
+            "image": self._stage_image,
+        }
+
+    def _stage_check(self, task):
+        """
+        检查阶段：检查视频流出状态
+
+        参数:
+            task: 流水线任务
+
+        返回:
+            str: 下一个阶段名称，None表示处理完成
+        """
+        video_id_str = task["result"]["id"]
+
+        # 在控制台显示处理状态
+        if not self.quiet_mode:
+            console.print(_("process_video.processing", "🔍 处理视频 {id}").format(id=video_id_str))
+
+        # 检查视频状态
+        check = self._leak_check(video_id_str)
+        return self._record_status(
+            task, self._map_leak_status(video_id_str, check), check["status"]
+        )
+
+    def _record_status(self, task, status, leak_check=None):
+        """
+        记录检查结果并决定下一个阶段
+
+        参数:
+            task: 流水线任务
+            status: 视频状态
+            leak_check: 流出检查的原始结果 (leaked、not_found或error)；
+                检查出错时status同样为unavailable，只有not_found表示确认未流出
+
+        返回:
+            str: 下一个阶段名称，None表示处理完成
+        """
+        result = task["result"]
+        video_id_str = result["id"]
+        result["status"] = status
+        result["leak_check"] = leak_check
+
+        # 显示视频类型
+        entity_type = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
+
+        # 判断视频是否流出
+        if status == "available":
+            result["exists"] = True
+            result["leaked"] = True  # 添加leaked字段，与exists保持一致
+
+            # 在控制台显示视频可用状态
+            if not self.quiet_mode:
+                console.print(
+                    _("process_video.leaked", "✅ 视频 {id} 已流出 ({entity_type}: {writer_id})").format(
+                        id=video_id_str, entity_type=entity_type, writer_id=self.write_id
+                    )
+                )
+        else:
+            # 视频不可用，在控制台显示状态
+            result["exists"] = False  # 确保一致性
+            result["leaked"] = False  # 确保一致性
+
+            status_display = _("check_videos.status_unavailable", "未流出") if status == "unavailable" else _("check_videos.status_error", "错误({status})").format(status=status)
+
+            if not self.quiet_mode:
+                console.print(
+                    _("process_video.unleaked", "⚠️ 视频 {id} {status_display} ({entity_type}: {writer_id})").format(
+                        id=video_id_str, status_display=status_display, entity_type=entity_type, writer_id=self.write_id
+                    )
+                )
+
+        # 更新统计信息 (磁力链接统计在磁链阶段更新)
+        self._update_stats(result)
+
+        # 获取磁力链接 - 无论是女优还是作者，都使用相同的方式获取磁链
+        if result["exists"] and self.with_magnet:
+            return "magnet"
+        # 即使视频未流出，也尝试下载图片
+        return "image" if self.download_images else None
+
+    def _stage_magnet(self, task):
+        """
+        磁链阶段：获取已流出视频的磁力链接
+
+        参数:
+            task: 流水线任务
+
+        返回:
+            str: 下一个阶段名称，None表示处理完成
+        """
+        result = task["result"]
+        self._attach_magnets(result)
+        self._update_magnet_stats(result)
+        return "image" if self.download_images else None
+
+    def _stage_image(self, task):
+        """
+        图片阶段：下载视频缩略图
+
+        参数:
+            task: 流水线任务
+
+        返回:
+            None: 图片阶段是最后一个阶段
+        """
+        result = task["result"]
+        video_obj = task["video"]
+        try:
+            # 修复：将状态信息添加到视频对象中
+            video_obj["status"] = result["status"]  # 确保状态正确传递
+
+            # 传递完整视频对象以便使用image_url和status
+            self._apply_image(result, self.download_image(video_obj))
+        except Exception as e:
+            self._log_image_error(e)
+        return None
+
+    def _apply_image(self, result, image_path):
+        """将图片下载结果写入处理结果"""
+        video_id_str = result["id"]
+        if image_path:
+            result["image_downloaded"] = True
+            result["image_path"] = image_path
+            # 记录图片路径，生成Jellyfin元数据时直接查询，无需扫描图片目录
+            self.cache.record_thumbnail(video_id_str, image_path)
+            # 在控制台显示图片下载状态
+            if not self.quiet_mode:
+                console.print(_("process_video.image_downloaded", "🖼️ 视频 {id} 图片已下载").format(id=video_id_str))
+        else:
+            # 在控制台显示图片下载失败状态
+            if not self.quiet_mode:
+                console.print(_("process_video.image_failed", "⚠️ 视频 {id} 图片下载失败").format(id=video_id_str))
+
+    def _log_image_error(self, error):
+        self.logger.error(_("process_video.image_error", "下载图片失败: {error}").format(error=str(error)))
+        if not self.quiet_mode:
+            console.print(_("process_video.image_error", "❌ 下载图片失败: {error}").format(error=str(error)))
+
+    def _handle_stage_error(self, stage_name, task, error):
+        """
+        处理阶段异常，检查阶段出错时将结果标记为错误
+
+        参数:
+            stage_name: 出错的阶段名称
+            task: 流水线任务
+            error: 异常对象
+        """
+        result = task["result"]
+        video_id_str = result["id"]
+        self.logger.error(
+            _("logger.process_video_error", "处理视频 {video} 时出错: {error}").format(
+                video=video_id_str, error=str(error)
+            )
+        )
+        if not self.quiet_mode:
+            console.print(_("process_video.processing_error", "❌ 处理视频 {id} 时出错: {error}").format(id=video_id_str, error=str(error)))
+
+        result["error"] = str(error)
+        if stage_name == "check":
+            result.update(
+                {
+                    "status": "error",
+                    "leak_check": LEAK_CHECK_ERROR,
+                    "exists": False,
+                    "has_magnet": False,
+                    "magnets": [],
+                    "image_downloaded": False,
+                    "image_path": None,
+                }
+            )
+            # 更新统计信息
+            self._update_stats(result)
+
+    def process_video(self, video_id):
+        """
+        处理单个视频，包括检查视频状态、获取磁力链接和下载图片
+
+        与analyze_videos使用相同的阶段处理函数，只是在当前线程中依次执行
+
+        参数:
+            video_id: 视频ID或视频对象
+
+        返回:
+            dict: 处理结果
+        """
+        task = self._new_task(video_id)
+        handlers = self._stage_handlers()
+        stage_name = "check"
+        try:
+            while stage_name:
+                stage_name = handlers[stage_name](task)
+        except Exception as e:
+            self._handle_stage_error(stage_name, task, e)
+        return task["result"]
+
+    def _attach_magnets(self, result):
+        """
+        获取已流出视频的磁力链接并写入处理结果
+
+        参数:
+            result: process_video返回的结果字典
+        """
+        try:
+            self._apply_magnets(result, self.fetch_magnet_link(result["id"]))
+        except Exception as e:
+            self._log_magnet_error(e)
+
+    def _apply_magnets(self, result, magnets):
+        """将磁链获取结果写入处理结果"""
+        video_id_str = result["id"]
+        if magnets:
+            result["has_magnet"] = True
+            result["magnets"] = magnets
+            # 在控制台显示磁力链接状态
+            if not self.quiet_mode:
+                console.print(_("process_video.found_magnet", "🧲 视频 {id} 找到磁力链接").format(id=video_id_str))
+        else:
+            # 在控制台显示未找到磁力链接状态
+            if not self.quiet_mode:
+                console.print(_("process_video.no_magnet", "⚠️ 视频 {id} 未找到磁力链接").format(id=video_id_str))
+
+    def _log_magnet_error(self, error):
+        self.logger.error(_("process_video.magnet_error", "获取磁力链接失败: {error}").format(error=str(error)))
+        if not self.quiet_mode:
+            console.print(_("process_video.magnet_error", "❌ 获取磁力链接失败: {error}").format(error=str(error)))
+
+    def _log_magnet_rate(self):
+        """记录磁链站点实际达到的请求速率"""
+        magnet_stats = rate_limiter.stats(self.magnet_base_url)
+        if not magnet_stats["requests"]:
+            return
+        message = _(
+            "logger.magnet_rate",
+            "磁链请求 {requests} 次，实际速率 {achieved:.2f}/s (预算 {configured:.2f}/s)，平均等待 {wait:.1f}s",
+        ).format(
+            requests=magnet_stats["requests"],
+            achieved=magnet_stats["achieved_rate"],
+            configured=magnet_stats["configured_rate"],
+            wait=magnet_stats["avg_wait"],
+        )
+        self.logger.info(message)
+        if not self.quiet_mode:
+            console.print(f"[dim]{message}[/dim]")
 
-        # 限制长度
-        if len(cleaned) > 50:
-            cleaned = cleaned[:50] + "..."
+    def _start_analysis(self, videos):
+        """
+        显示分析开始信息
 
-        return cleaned
+        参数:
+            videos: 视频列表
 
-    def generate_reports(self, writer_id, results, writer_name=None):
-        """生成多种格式的标准化报告，区分作者和女优"""
-        try:
-            if not results:
-                self.logger.warning(_("logger.no_report_data", "没有结果可供生成报告"))
-                return {}
+        返回:
+            str: 实体类型显示名称
+        """
+        # 更新总视频数
+        self.stats["total"] = len(videos)
 
-            # 清理和准备实体名称（作者或女优）
-            entity_name = (
-                writer_name or self.name or ("未知女优" if self.is_actress else "未知作者")
-            )
+        # 重置本次分析的结果摘要
+        self.report_summary = ReportSummary()
+        self._processed_ids = []
+        self.results = []
 
-            # 调试输出 - 不再输出重复日志
-            self.logger.info(_("logger.generate_report", "=== 生成报告 ==="))
-            self.logger.info(_("logger.original_writer_name", "原始writer_name: '{writer_name}'").format(writer_name=writer_name))
+        # 显示分析开始信息
+        entity_type = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
+        entity_id = self.write_id
+        entity_name = self.name or entity_id
 
-            # 创建唯一前缀，区分作者和女优，但保持文件名结构一致
-            # 修改：无论是作者还是女优，统一使用"author"为前缀格式，保持一致性
-            entity_type = "author"
+        # 清理实体名称防止有非法字符
+        clean_entity_name = self.clean_filename(entity_name)
 
-            # 检查是否包含特殊字符，如果包含则只使用ID
-            has_special_chars = any(
-                c in entity_name for c in ["\\", "/", "*", "?", ":", '"', "<", ">", "|"]
+        # 显示开始分析消息
+        if not self.quiet_mode:
+            console.print(
+                _("analyzer.start_analysis").format(
+                    entity_type=entity_type, id=entity_id, name=clean_entity_name, count=len(videos)
+                )
             )
-            self.logger.info(_("logger.has_special_chars", "是否包含特殊字符: {has_special_chars}").format(has_special_chars=has_special_chars))
+            if self.with_magnet:
+                console.print(_("check_videos.get_magnet_links", "[dim]将获取已流出视频的磁力链接[/dim]"))
+            if self.download_images:
+                console.print(_("check_videos.download_thumbnails", "[dim]将下载视频缩略图[/dim]"))
 
-            if has_special_chars:
-                self.logger.info(_("logger.name_special_chars", "名称包含特殊字符，只使用ID"))
-                clean_name = ""
-                file_prefix = f"{entity_type}_{writer_id}"
-            else:
-                # 清理名称并使用
-                clean_name = self.clean_filename(entity_name)
-                file_prefix = f"{entity_type}_{writer_id}_{clean_name}"
-
-            self.logger.info(_("logger.file_prefix", "生成的文件前缀: '{file_prefix}'").format(file_prefix=file_prefix))
-
-            # 确保目录存在
-            result_dir = config.result_dir
-            os.makedirs(result_dir, exist_ok=True)
-
-            # 生成文件名
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-            # 分类结果
-            leaked_with_magnet = []
-            leaked_without_magnet = []
-            unleaked = []
-            all_leaked = []
-
-            for result in results:
-                status = result.get("status", "")
-                # "available" 对应已流出
-                is_leaked = (status == "available") or result.get("leaked", False)
-
-                if is_leaked:
-                    has_magnet = bool(result.get("magnets") or result.get("magnet"))
-                    if has_magnet:
-                        leaked_with_magnet.append(result)
-                    else:
-                        leaked_without_magnet.append(result)
-                    all_leaked.append(result)
-                else:
-                    unleaked.append(result)
-
-            # 生成报告文件路径
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            reports = {}
-
-            # 1. 总报告 - 使用固定格式
-            summary_path = os.path.join(result_dir, f"{writer_id}_{clean_name}_{_('reports.file_summary', '总报告')}.txt")
-            reports["summary"] = summary_path
-
-            # 统计信息
-            total = len(results)
-            leaked_count = len(all_leaked)
-            unleaked_count = len(unleaked)
-            with_magnet_count = len(leaked_with_magnet)
-            without_magnet_count = len(leaked_without_magnet)
-            leak_ratio = (leaked_count / total) * 100 if total > 0 else 0
-
-            # 生成总报告
-            with open(summary_path, "w", encoding="utf-8") as f:
-                entity_desc = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
-                f.write(f"{entity_desc}ID: {writer_id}\n")
-
-                # 根据是否有特殊字符，决定使用原名还是清理后的名称
-                if has_special_chars:
-                    f.write(_("reports.entity_name_special", "{entity_desc}名称: {entity_name} (含特殊字符)\n").format(entity_desc=entity_desc, entity_name=entity_name))
-                else:
-                    f.write(_("reports.entity_name", "{entity_desc}名称: {name}\n").format(entity_desc=entity_desc, name=clean_name))
-
-                f.write(_("reports.analysis_time", "分析时间: {timestamp}\n").format(timestamp=timestamp))
-                f.write(_("reports.summary_header", "\n=== 总体统计 ===\n"))
-                f.write(_("reports.total_videos", "总视频数: {count}\n").format(count=total))
-                f.write(_("reports.leaked_videos", "已流出视频数: {count}\n").format(count=leaked_count))
-                f.write(_("reports.unleaked_videos", "未流出视频数: {count}\n").format(count=unleaked_count))
-                f.write(_("reports.leak_ratio", "流出比例: {ratio:.2f}%\n").format(ratio=leak_ratio))
-                f.write(_("reports.with_magnet", "有磁链数量: {count}\n").format(count=with_magnet_count))
-                f.write(_("reports.without_magnet", "无磁链数量: {count}\n").format(count=without_magnet_count))
-
-                f.write(_("reports.leaked_list_header", "\n=== 已流出视频列表 ===\n"))
-                for idx, video in enumerate(all_leaked, 1):
-                    vid = video.get("video_id")
-                    title = video.get("title", f"FC2-PPV-{vid}")
-                    has_magnet = bool(video.get("magnets") or video.get("magnet"))
-                    magnet_status = _("reports.has_magnet", "[有磁链]") if has_magnet else _("reports.no_magnet", "[无磁链]")
-                    f.write(f"{idx}. [{vid}] {magnet_status} {title}\n")
-
-                f.write(_("reports.unleaked_list_header", "\n=== 未流出视频列表 ===\n"))
-                for idx, video in enumerate(unleaked, 1):
-                    vid = video.get("video_id")
-                    title = video.get("title", f"FC2-PPV-{vid}")
-                    f.write(f"{idx}. [{vid}] {title}\n")
-
-            # 2. 已流出_有磁链 - 使用固定格式
-            if leaked_with_magnet:
-                with_magnet_path = os.path.join(
-                    result_dir, f"{writer_id}_{clean_name}_{_('reports.file_leaked_with_magnet', '已流出_有磁链')}.txt"
-                )
-                reports["leaked_with_magnet"] = with_magnet_path
+        return entity_type
 
-                with open(with_magnet_path, "w", encoding="utf-8") as f:
-                    entity_desc = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
-                    f.write(f"{entity_desc}ID: {writer_id}\n")
+    def _analysis_progress(self):
+        """创建分析进度条"""
+        return Progress(
+            "[progress.description]{task.description}",
+            BarColumn(),
+            "[progress.percentage]{task.percentage:>3.0f}%",
+            TimeElapsedColumn(),
+            "{task.completed}/{task.total}",
+            console=console,
+        )
 
-                    # 根据是否有特殊字符，决定使用原名还是清理后的名称
-                    if has_special_chars:
-                        f.write(_("reports.entity_name_special", "{entity_desc}名称: {entity_name} (含特殊字符)\n").format(entity_desc=entity_desc, entity_name=entity_name))
-                    else:
-                        f.write(_("reports.entity_name", "{entity_desc}名称: {name}\n").format(entity_desc=entity_desc, name=clean_name))
-
-                    f.write(_("reports.analysis_time", "分析时间: {timestamp}\n").format(timestamp=timestamp))
-                    f.write(_("reports.with_magnet_count", "有磁链视频数量: {count}\n\n").format(count=with_magnet_count))
-
-                    for idx, video in enumerate(leaked_with_magnet, 1):
-                        vid = video.get("video_id")
-                        title = video.get("title", f"FC2-PPV-{vid}")
-                        f.write(_("reports.video_entry", "=== {idx}. FC2-PPV-{vid} ===\n").format(idx=idx, vid=vid))
-                        f.write(_("reports.video_title", "标题: {title}\n").format(title=title))
-
-                        # 磁力链接
-                        magnets = (
-                            video.get("magnets") or [video.get("magnet")]
-                            if video.get("magnet")
-                            else []
-                        )
-                        for i, magnet in enumerate(magnets, 1):
-                            if magnet:
-                                f.write(_("reports.magnet_link", "磁链{num}: {link}\n").format(num=i, link=magnet))
-                        f.write("\n")
-
-            # 3. 已流出_无磁链 - 使用固定格式
-            if leaked_without_magnet:
-                without_magnet_path = os.path.join(
-                    result_dir, f"{writer_id}_{clean_name}_{_('reports.file_leaked_without_magnet', '已流出_无磁链')}.txt"
-                )
-                reports["leaked_without_magnet"] = without_magnet_path
+    def _checkpoint_key(self):
+        """检查点文件使用的键，没有作者/女优ID时不保存检查点"""
+        if not self.write_id:
+            return None
+        prefix = "actress" if self.is_actress else "author"
+        return f"{prefix}_{self.write_id}"
 
-                with open(without_magnet_path, "w", encoding="utf-8") as f:
-                    entity_desc = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
-                    f.write(f"{entity_desc}ID: {writer_id}\n")
+    def _resume_from_checkpoint(self, videos):
+        """
+        读取检查点并跳过已完成的视频
 
-                    # 根据是否有特殊字符，决定使用原名还是清理后的名称
-                    if has_special_chars:
-                        f.write(_("reports.entity_name_special", "{entity_desc}名称: {entity_name} (含特殊字符)\n").format(entity_desc=entity_desc, entity_name=entity_name))
-                    else:
-                        f.write(_("reports.entity_name", "{entity_desc}名称: {name}\n").format(entity_desc=entity_desc, name=clean_name))
+        检查点只记录已完成的视频ID以及结果文件路径和已写入的字节数，
+        已完成的结果从结果文件中读取；检查出错的视频不视为已完成，恢复时重新检查
 
-                    f.write(_("reports.analysis_time", "分析时间: {timestamp}\n").format(timestamp=timestamp))
-                    f.write(_("reports.without_magnet_count", "无磁链视频数量: {count}\n\n").format(count=without_magnet_count))
+        参数:
+            videos: 视频列表
 
-                    for idx, video in enumerate(leaked_without_magnet, 1):
-                        vid = video.get("video_id")
-                        title = video.get("title", f"FC2-PPV-{vid}")
-                        f.write(f"{idx}. [{vid}] {title}\n")
+        返回:
+            tuple: (待处理的视频列表, 检查点中已完成的结果)；已完成的结果为
+                   (结果文件路径, 字节数, 视频ID集合)，没有可恢复的结果时为None
+        """
+        key = self._checkpoint_key()
+        if not self.resume or key is None:
+            return list(videos), None
+
+        status = CacheManager.load_process_status(key)
+        path = status.get("results_path")
+        if not path or not os.path.exists(path):
+            return list(videos), None
+
+        processed = {str(video_id) for video_id in status.get("processed") or []}
+        offset = status.get("sink_offset")
+        completed = {
+            str(r.get("video_id"))
+            for r in self._checkpoint_results(path, offset, processed)
+        }
 
-            # 4. 未流出视频 - 使用固定格式
-            if unleaked:
-                unleaked_path = os.path.join(
-                    result_dir, f"{writer_id}_{clean_name}_{_('reports.file_unleaked', '未流出')}.txt"
-                )
-                reports["unleaked"] = unleaked_path
+        pending = []
+        restored_ids = set()
+        for video in videos:
+            video_id = str(video.get("video_id", "")) if isinstance(video, dict) else str(video)
+            if video_id in completed:
+                restored_ids.add(video_id)
+            else:
+                pending.append(video)
 
-                with open(unleaked_path, "w", encoding="utf-8") as f:
-                    entity_desc = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
-                    f.write(f"{entity_desc}ID: {writer_id}\n")
+        if not restored_ids:
+            return pending, None
 
-                    # 根据是否有特殊字符，决定使用原名还是清理后的名称
-                    if has_special_chars:
-                        f.write(_("reports.entity_name_special", "{entity_desc}名称: {entity_name} (含特殊字符)\n").format(entity_desc=entity_desc, entity_name=entity_name))
-                    else:
-                        f.write(_("reports.entity_name", "{entity_desc}名称: {name}\n").format(entity_desc=entity_desc, name=clean_name))
+        # 本次分析会重新创建同名的结果文件，先把上次的结果文件移到一边
+        resume_path = path + ".resume"
+        os.replace(path, resume_path)
+
+        message = _(
+            "analyzer.resume_checkpoint",
+            "从检查点恢复: 跳过 {done} 个已完成的视频，剩余 {remaining} 个",
+        ).format(done=len(restored_ids), remaining=len(pending))
+        self.logger.info(message)
+        if not self.quiet_mode:
+            console.print(message)
+        return pending, (resume_path, offset, restored_ids)
 
-                    f.write(_("reports.analysis_time", "分析时间: {timestamp}\n").format(timestamp=timestamp))
-                    f.write(_("reports.unleaked_count", "未流出视频数量: {count}\n\n").format(count=unleaked_count))
+    @staticmethod
+    def _checkpoint_results(path, offset, video_ids):
+        """
+        读取结果文件中检查点之前写入的、可以恢复的结果
 
-                    for idx, video in enumerate(unleaked, 1):
-                        vid = video.get("video_id")
-                        title = video.get("title", f"FC2-PPV-{vid}")
-                        f.write(f"{idx}. [{vid}] {title}\n")
+        只恢复流出检查有明确结果(leaked或not_found)的视频，检查出错的视频恢复时重新检查
 
-            # 5. 已流出视频总表(简洁版-只有ID和标题) - 使用固定格式
-            if all_leaked:
-                leaked_summary_path = os.path.join(
-                    result_dir, f"{writer_id}_{clean_name}_{_('reports.file_leaked_summary', '已流出视频总表')}.txt"
-                )
-                reports["leaked_summary"] = leaked_summary_path
+        参数:
+            path: 结果文件路径
+            offset: 检查点保存时结果文件已写入的字节数，之后写入的结果忽略
+            video_ids: 检查点记录的已完成视频ID集合
+
+        返回:
+            iterator: 检查状态有效的结果
+        """
+        return (
+            r for r in iter_results(path, end=offset)
+            if str(r.get("video_id")) in video_ids
+            and r.get("leak_check") in (LEAK_CHECK_LEAKED, LEAK_CHECK_NOT_FOUND)
+        )
 
-                with open(leaked_summary_path, "w", encoding="utf-8") as f:
-                    for video in all_leaked:
-                        vid = video.get("video_id")
-                        title = video.get("title", f"FC2-PPV-{vid}")
-                        f.write(f"FC2-PPV-{vid} | {title}\n")
+    def _open_result_sink(self):
+        """
+        创建本次分析的JSON Lines结果文件
 
-            # 6. 已流出的磁链专用文件(只有磁链)
-            if leaked_with_magnet:
-                magnet_only_path = os.path.join(result_dir, f"{file_prefix}_{_('reports.file_magnets', '磁链')}.txt")
-                reports["magnet_only"] = magnet_only_path
+        启用流式输出时结果文件保存在results目录，报告从该文件生成；
+        未启用时只为保存检查点在缓存目录中创建结果文件，结果仍保存在内存中
 
-                try:
-                    with open(magnet_only_path, "w", encoding="utf-8") as f:
-                        for video in leaked_with_magnet:
-                            vid = video.get("video_id")
-                            title = video.get("title", f"FC2-PPV-{vid}")
-                            
-                            # 获取磁链 - 兼容两种格式
-                            magnets = []
-                            
-                            # 尝试获取magnets列表
-                            if video.get("magnets"):
-                                magnets = video.get("magnets")
-                            # 如果没有magnets列表但有单个magnet
-                            elif video.get("magnet"):
-                                magnets = [video.get("magnet")]
-                            
-                            # 写入视频信息作为注释
-                            f.write(f"# {vid} | {title}\n")
-                            
-                            # 写入磁链
-                            if magnets:
-                                for magnet in magnets:
-                                    if magnet and isinstance(magnet, str):
-                                        f.write(f"{magnet}\n")
-                            else:
-                                # 没有磁链时添加提示
-                                f.write(_("reports.no_magnet_found", "# [未获取到磁力链接]\n"))
-                            
-                            # 添加空行分隔
-                            f.write("\n")
-                            
-                    self.logger.info(_("logger.magnet_file_generated", "已生成磁链专用文件: {path}").format(path=magnet_only_path))
-                except Exception as e:
-                    self.logger.error(_("logger.magnet_file_failed", "生成磁链专用文件失败: {error}").format(error=str(e)))
+        返回:
+            ResultSink: 结果写入器，既不流式输出也不保存检查点时返回None
+        """
+        self.results_path = None
+        key = self._checkpoint_key()
+        if config.stream_results:
+            prefix = "actress" if self.is_actress else "author"
+            path = os.path.join(
+                config.result_dir, f"{prefix}_{self.write_id or 'videos'}_results.jsonl"
+            )
+        elif key is not None and config.checkpoint_interval:
+            path = CacheManager.process_results_path(key)
+        else:
+            return None
 
-            self.logger.info(_("logger.reports_generated", "已生成{count}个报告文件").format(count=len(reports)))
-            return reports
+        try:
+            sink = ResultSink(path).open()
+        except OSError as e:
+            self.logger.error(f"无法创建结果文件 {path}: {str(e)}")
+            return None
 
-        except Exception as e:
-            self.logger.error(_("logger.report_failed", "生成报告失败: {error}").format(error=str(e)))
-            return {}
+        if config.stream_results:
+            self.results_path = path
+        return sink
 
-    def process_video(self, video_id):
+    def _start_collecting(self, restored):
         """
-        处理单个视频，包括检查视频状态、下载图片和获取磁力链接
+        创建结果文件或结果列表，并先收集检查点中已完成的结果
 
         参数:
-            video_id: 视频ID或视频对象
+            restored: _resume_from_checkpoint返回的已完成结果，没有时为None
 
         返回:
-            dict: 处理结果
+            tuple: (结果列表, 结果写入器)；启用流式输出时结果列表为None，
+                   既不流式输出也不保存检查点时结果写入器为None
         """
-        try:
-            # 获取日志记录器
-            logger = self.logger
+        sink = self._open_result_sink()
+        results = None if self.results_path else []
+        if restored is not None:
+            resume_path, offset, video_ids = restored
+            for result in self._checkpoint_results(resume_path, offset, video_ids):
+                self._collect_result(result, results, sink)
+                self._restore_stats(result)
+            try:
+                os.remove(resume_path)
+            except OSError as e:
+                self.logger.warning(f"删除上次的结果文件失败: {resume_path} - {str(e)}")
+        self._checkpoint_written = len(self._processed_ids)
+        self._checkpoint_due = len(self._processed_ids)
+        return results, sink
+
+    def _collect_result(self, result, results, sink):
+        """
+        收集一个视频的处理结果并计入结果摘要
 
-            # 判断输入是字符串还是视频对象
-            if isinstance(video_id, dict):
-                # 如果传入的是视频对象，提取必要信息
-                video_obj = video_id
-                video_id_str = str(video_obj.get("video_id", ""))
-                # 保存视频对象以供后续使用（特别是获取image_url）
-            else:
-                # 如果只是字符串ID，转换为字符串并创建基本对象
-                video_id_str = str(video_id)
-                video_obj = {"video_id": video_id_str}
-
-            # 初始化结果字典
-            result = {
-                "id": video_id_str,
-                "video_id": video_id_str,  # 添加video_id字段确保兼容性
-                "status": None,
-                "exists": False,
-                "has_magnet": False,
-                "magnets": [],
-                "error": None,
-                "image_downloaded": False,
-                "image_path": None,
-            }
-
-            # 如果有视频对象，复制更多相关信息
-            if isinstance(video_id, dict):
-                result["title"] = video_obj.get("title", "")
-                result["image_url"] = video_obj.get("image_url", "")
+        参数:
+            result: 单个视频的处理结果
+            results: 结果列表，启用流式输出时为None
+            sink: 结果写入器，启用流式输出时结果只写入结果文件
+        """
+        with self.lock:
+            if sink is not None:
+                sink.write(result)
+            if results is not None:
+                results.append(result)
+            self._processed_ids.append(str(result.get("video_id")))
+            self.report_summary.add(result, classify(result))
+
+    def _restore_stats(self, result):
+        """把检查点中已完成视频的结果计入统计信息"""
+        self._update_stats(result)
+        if result.get("exists"):
+            self._update_magnet_stats(result)
+        if result.get("image_downloaded"):
+            with self.lock:
+                self.stats["image_success"] += 1
 
-            # 在控制台显示处理状态
-            if not self.quiet_mode:
-                console.print(_("process_video.processing", "🔍 处理视频 {id}").format(id=video_id_str))
+    def _checkpoint_snapshot(self, sink, force=False):
+        """
+        到达保存间隔时返回需要写入的检查点
 
-            # 检查视频状态
-            status = self.check_video_status(video_id_str)
-            result["status"] = status
+        参数:
+            sink: 结果写入器
+            force: 是否忽略保存间隔立即保存 (分析中断时使用)
 
-            # 判断视频是否流出
-            if status == "available":
-                result["exists"] = True
-                result["leaked"] = True  # 添加leaked字段，与exists保持一致
+        返回:
+            tuple: (已完成的视频ID列表, 结果文件路径, 结果文件已写入的字节数)，不需要保存时返回None
+        """
+        if sink is None or self._checkpoint_key() is None or not config.checkpoint_interval:
+            return None
 
-                # 显示视频类型
-                entity_type = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
+        with self.lock:
+            # 视频ID和结果在同一个锁内写入，字节数与视频ID列表一致
+            done = len(self._processed_ids)
+            if done == 0 or done == self._checkpoint_due:
+                return None
+            if not force and done - self._checkpoint_due < config.checkpoint_interval:
+                return None
+            self._checkpoint_due = done
+            return list(self._processed_ids), sink.path, sink.offset
 
-                # 在控制台显示视频可用状态
-                if not self.quiet_mode:
-                    console.print(
-                        _("process_video.leaked", "✅ 视频 {id} 已流出 ({entity_type}: {writer_id})").format(
-                            id=video_id_str, entity_type=entity_type, writer_id=self.write_id
-                        )
-                    )
+    def _write_checkpoint(self, snapshot):
+        """
+        写入检查点，异步分析时在线程池中调用
 
-                # 获取磁力链接 - 无论是女优还是作者，都使用相同的方式获取磁链
-                if self.with_magnet:
-                    try:
-                        magnets = self.fetch_magnet_link(video_id_str)
-                        if magnets:
-                            result["has_magnet"] = True
-                            result["magnets"] = magnets
-                            # 在控制台显示磁力链接状态
-                            if not self.quiet_mode:
-                                console.print(_("process_video.found_magnet", "🧲 视频 {id} 找到磁力链接").format(id=video_id_str))
-                        else:
-                            # 在控制台显示未找到磁力链接状态
-                            if not self.quiet_mode:
-                                console.print(_("process_video.no_magnet", "⚠️ 视频 {id} 未找到磁力链接").format(id=video_id_str))
-                    except Exception as e:
-                        logger.error(_("process_video.magnet_error", "获取磁力链接失败: {error}").format(error=str(e)))
-                        if not self.quiet_mode:
-                            console.print(_("process_video.magnet_error", "❌ 获取磁力链接失败: {error}").format(error=str(e)))
+        参数:
+            snapshot: _checkpoint_snapshot返回的检查点
+        """
+        processed, path, offset = snapshot
+        with self._checkpoint_lock:
+            # 多个线程同时保存时，不用较旧的快照覆盖较新的检查点
+            if len(processed) <= self._checkpoint_written:
+                return
+            if CacheManager.save_process_status(
+                self._checkpoint_key(), processed, results_path=path, sink_offset=offset
+            ):
+                self._checkpoint_written = len(processed)
 
-                # 下载图片 - 传递完整视频对象而不仅仅是ID
-                if self.download_images:
-                    try:
-                        # 修复：将状态信息添加到视频对象中
-                        video_obj["status"] = status  # 确保状态正确传递
-
-                        # 传递完整视频对象以便使用image_url和status
-                        image_path = self.download_image(video_obj)
-                        if image_path:
-                            result["image_downloaded"] = True
-                            result["image_path"] = image_path
-                            # 在控制台显示图片下载状态
-                            if not self.quiet_mode:
-                                console.print(_("process_video.image_downloaded", "🖼️ 视频 {id} 图片已下载").format(id=video_id_str))
-                        else:
-                            # 在控制台显示图片下载失败状态
-                            if not self.quiet_mode:
-                                console.print(_("process_video.image_failed", "⚠️ 视频 {id} 图片下载失败").format(id=video_id_str))
-                    except Exception as e:
-                        logger.error(_("process_video.image_error", "下载图片失败: {error}").format(error=str(e)))
-                        if not self.quiet_mode:
-                            console.print(_("process_video.image_error", "❌ 下载图片失败: {error}").format(error=str(e)))
-            else:
-                # 视频不可用，在控制台显示状态
-                result["exists"] = False  # 确保一致性
-                result["leaked"] = False  # 确保一致性
+    def _checkpoint(self, sink, force=False):
+        """
+        每完成config.checkpoint_interval个视频保存一次检查点
 
-                # 显示视频类型和状态
-                entity_type = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
-                status_display = _("check_videos.status_unavailable", "未流出") if status == "unavailable" else _("check_videos.status_error", "错误({status})").format(status=status)
+        结果已逐条写入结果文件，检查点只记录已完成的视频ID和结果文件已写入的字节数
 
-                if not self.quiet_mode:
-                    console.print(
-                        _("process_video.unleaked", "⚠️ 视频 {id} {status_display} ({entity_type}: {writer_id})").format(
-                            id=video_id_str, status_display=status_display, entity_type=entity_type, writer_id=self.write_id
-                        )
-                    )
+        参数:
+            sink: 结果写入器
+            force: 是否忽略保存间隔立即保存 (分析中断时使用)
+        """
+        snapshot = self._checkpoint_snapshot(sink, force)
+        if snapshot is not None:
+            self._write_checkpoint(snapshot)
 
-                # 即使视频未流出，也尝试下载图片
-                if self.download_images:
-                    try:
-                        # 修复：将状态信息添加到视频对象中
-                        video_obj["status"] = status  # 确保状态正确传递
-
-                        # 传递完整视频对象以便使用image_url和status
-                        image_path = self.download_image(video_obj)
-                        if image_path:
-                            result["image_downloaded"] = True
-                            result["image_path"] = image_path
-                            # 在控制台显示图片下载状态
-                            if not self.quiet_mode:
-                                console.print(_("process_video.image_downloaded", "🖼️ 视频 {id} 图片已下载").format(id=video_id_str))
-                        else:
-                            # 在控制台显示图片下载失败状态
-                            if not self.quiet_mode:
-                                console.print(_("process_video.image_failed", "⚠️ 视频 {id} 图片下载失败").format(id=video_id_str))
-                    except Exception as e:
-                        logger.error(_("process_video.image_error", "下载图片失败: {error}").format(error=str(e)))
-                        if not self.quiet_mode:
-                            console.print(_("process_video.image_error", "❌ 下载图片失败: {error}").format(error=str(e)))
-            # 更新统计信息
-            self._update_stats(result)
+    def _finish_analysis(self, results):
+        """
+        整理分析结果并显示完成信息
 
-            return result
+        参数:
+            results: 处理结果列表，启用流式输出时为None
 
-        except Exception as e:
-            # 使用self.logger
-            self.logger.error(
-                _("logger.process_video_error", "处理视频 {video} 时出错: {error}").format(
-                    video=video_id if isinstance(video_id, str) else video_id.get('video_id', 'unknown'), 
-                    error=str(e)
+        返回:
+            ReportSummary: 本次分析的结果摘要
+        """
+        # 未启用流式输出时按视频ID排序保存结果，否则通过iter_results从结果文件读取
+        self.results = sorted(results, key=lambda x: x["id"]) if results is not None else []
+        summary = self.report_summary
+
+        # 如果在安静模式，显示简单的完成消息
+        if not self.quiet_mode:
+            console.print(
+                _("analyzer.analysis_complete").format(
+                    total=summary.total, leaked=summary.leaked, ratio=summary.leak_ratio
                 )
             )
-            if not self.quiet_mode:
-                video_id_str = (
-                    video_id
-                    if isinstance(video_id, str)
-                    else video_id.get("video_id", "unknown")
-                )
-                console.print(_("process_video.processing_error", "❌ 处理视频 {id} 时出错: {error}").format(id=video_id_str, error=str(e)))
 
-            # 设置错误信息
-            video_id_str = (
-                video_id
-                if isinstance(video_id, str)
-                else video_id.get("video_id", "unknown")
-            )
-            result = {
-                "id": video_id_str,
-                "video_id": video_id_str,
-                "status": "error",
-                "exists": False,
-                "has_magnet": False,
-                "magnets": [],
-                "error": str(e),
-                "image_downloaded": False,
-                "image_path": None,
-            }
+        # 写回本次分析更新的缓存
+        self.cache.flush()
 
-            # 更新统计信息
-            self._update_stats(result)
+        # 分析已全部完成，删除检查点
+        key = self._checkpoint_key()
+        if key is not None:
+            CacheManager.clear_process_status(key)
+
+        # 记录连接复用情况和磁链站点实际请求速率
+        RequestHandler.log_transport_stats()
+        if self.with_magnet:
+            self._log_magnet_rate()
 
-            return result
+        return summary
 
     def analyze_videos(self, videos):
         """
@@ -1329,105 +2108,187 @@ class FC2Analyzer:
             videos: 视频ID列表
 
         返回:
-            tuple: (结果列表, 统计信息)
+            tuple: (结果摘要ReportSummary, 统计信息)；结果通过iter_results读取
         """
         # 检查videos是否为有效列表
         if not videos:
             if not self.quiet_mode:
                 console.print(_("analyzer.no_videos", "⚠️ 未找到视频，无法进行分析"))
-            return [], self.stats
+            return ReportSummary(), self.stats
 
-        # 更新总视频数
-        self.stats["total"] = len(videos)
+        entity_type = self._start_analysis(videos)
 
-        # 创建结果列表
-        results = []
+        # 创建结果文件或结果列表，--resume时先放入检查点中已完成的结果
+        pending, restored = self._resume_from_checkpoint(videos)
+        results, sink = self._start_collecting(restored)
 
-        # 显示分析开始信息
-        entity_type = _("analyzer.entity_type_actress", "女优") if self.is_actress else _("analyzer.entity_type_writer", "作者")
-        entity_id = self.write_id
-        entity_name = self.name or entity_id
+        try:
+            self._run_pipeline(entity_type, videos, pending, results, sink)
+        except BaseException:
+            # 中断或出错时保存已完成的结果，下次使用--resume继续
+            self._checkpoint(sink, force=True)
+            raise
+        finally:
+            if sink is not None:
+                sink.close()
 
-        # 清理实体名称防止有非法字符
-        clean_entity_name = self.clean_filename(entity_name)
+        # 返回结果和统计信息
+        return self._finish_analysis(results), self.stats
 
-        # 显示开始分析消息
-        if not self.quiet_mode:
-            console.print(
-                _("analyzer.start_analysis").format(
-                    entity_type=entity_type, id=entity_id, name=clean_entity_name, count=len(videos)
-                )
-            )
-            if self.with_magnet:
-                console.print(_("check_videos.get_magnet_links", "[dim]将获取已流出视频的磁力链接[/dim]"))
-            if self.download_images:
-                console.print(_("check_videos.download_thumbnails", "[dim]将下载视频缩略图[/dim]"))
+    def _run_pipeline(self, entity_type, videos, pending, results, sink=None):
+        """
+        使用多阶段流水线处理待处理的视频
 
+        参数:
+            entity_type: 实体类型显示名称
+            videos: 全部视频列表 (用于进度条总数)
+            pending: 待处理的视频列表
+            results: 结果列表，处理完成的结果追加到其中；启用流式输出时为None
+            sink: 结果写入器，每个视频完成后立即写入结果文件
+        """
         # 使用进度条跟踪处理进度
-        with Progress(
-            "[progress.description]{task.description}",
-            BarColumn(),
-            "[progress.percentage]{task.percentage:>3.0f}%",
-            TimeElapsedColumn(),
-            "{task.completed}/{task.total}",
-            console=console,
-        ) as progress:
+        with self._analysis_progress() as progress:
             # 创建主任务
             task_desc = _("analyzer.progress_task").format(entity_type=entity_type)
-            task = progress.add_task(task_desc, total=len(videos))
-
-            # 使用线程池并发处理视频
-            # 从CONFIG获取max_workers配置
-            max_workers = config.max_workers
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # 提交所有视频处理任务
-                future_to_video = {
-                    executor.submit(self.process_video, video): video
-                    for video in videos
-                }
+            task_id = progress.add_task(
+                task_desc, total=len(videos), completed=len(videos) - len(pending)
+            )
 
-                # 收集结果
-                for future in as_completed(future_to_video):
-                    video = future_to_video[future]
-                    try:
-                        result = future.result()
-                        if result:
-                            results.append(result)
-                    except Exception as e:
-                        self.logger.error(_("logger.process_video_error", "处理视频 {video} 时出错: {error}").format(video=video, error=str(e)))
-                        if not self.quiet_mode:
-                            console.print(_("process_video.processing_error", "❌ 处理视频 {id} 时出错: {error}").format(id=video, error=str(e)))
+            def finish(task):
+                """视频全部阶段处理完成后收集结果并推进进度条"""
+                self._collect_result(task["result"], results, sink)
+                progress.update(task_id, advance=1)
+                self._checkpoint(sink)
 
-                    # 更新进度条
-                    progress.update(task, advance=1)
+            def fail(stage_name, task, error):
+                self._handle_stage_error(stage_name, task, error)
+                finish(task)
 
-        # 整理结果
-        sorted_results = sorted(results, key=lambda x: x["id"])
+            # 检查、磁链、图片三个阶段各自使用独立的线程和有界队列，
+            # 整体吞吐只受最慢主机的限速影响，而不是三段耗时之和
+            queue_size = config.stage_queue_size
+            stages = [Stage("check", self._stage_check, config.max_workers, queue_size)]
+            if self.with_magnet:
+                stages.append(
+                    Stage("magnet", self._stage_magnet, config.magnet_workers, queue_size)
+                )
+            if self.download_images:
+                stages.append(
+                    Stage("image", self._stage_image, config.image_workers, queue_size)
+                )
 
-        # 保存结果
-        self.results = sorted_results
+            pipeline = StagedPipeline(stages, on_complete=finish, on_error=fail)
+            pipeline.run(self._new_task(video) for video in pending)
 
-        # 如果在安静模式，显示简单的完成消息
-        if not self.quiet_mode:
-            # 计算统计信息
-            total = len(results)
-            leaked = sum(1 for r in results if r.get("exists", False))
-            leak_ratio = (leaked / total) * 100 if total > 0 else 0
-            console.print(
-                _("analyzer.analysis_complete").format(
-                    total=total, leaked=leaked, ratio=leak_ratio
-                )
+    async def _process_video_async(self, client, video, check_semaphore):
+        """
+        在事件循环中依次执行检查、磁链和图片阶段
+
+        参数:
+            client: AsyncHTTPClient实例
+            video: 视频ID或视频对象
+            check_semaphore: 限制同时进行检查的视频数
+
+        返回:
+            dict: 流水线任务
+        """
+        task = self._new_task(video)
+        result = task["result"]
+        stage_name = "check"
+        try:
+            if not self.quiet_mode:
+                console.print(_("process_video.processing", "🔍 处理视频 {id}").format(id=result["id"]))
+            async with check_semaphore:
+                check = await self._leak_check_async(client, result["id"])
+            stage_name = self._record_status(
+                task, self._map_leak_status(result["id"], check), check["status"]
             )
 
-        # 返回结果和统计信息
-        return sorted_results, self.stats
+            if stage_name == "magnet":
+                try:
+                    self._apply_magnets(
+                        result, await self.fetch_magnet_link_async(client, result["id"])
+                    )
+                except Exception as e:
+                    self._log_magnet_error(e)
+                self._update_magnet_stats(result)
+                stage_name = "image" if self.download_images else None
+
+            if stage_name == "image":
+                try:
+                    task["video"]["status"] = result["status"]
+                    self._apply_image(
+                        result, await self.download_image_async(client, task["video"])
+                    )
+                except Exception as e:
+                    self._log_image_error(e)
+        except Exception as e:
+            self._handle_stage_error(stage_name, task, e)
+        return task
+
+    async def analyze_videos_async(self, videos):
+        """
+        analyze_videos的异步版本，所有请求作为协程运行在同一个事件循环中
+
+        各主机的在途请求数由AsyncHTTPClient的主机信号量限制，
+        请求速率仍由全局按主机限速器控制
+
+        参数:
+            videos: 视频ID列表
+
+        返回:
+            tuple: (结果摘要ReportSummary, 统计信息)；结果通过iter_results读取
+        """
+        if not videos:
+            if not self.quiet_mode:
+                console.print(_("analyzer.no_videos", "⚠️ 未找到视频，无法进行分析"))
+            return ReportSummary(), self.stats
+
+        entity_type = self._start_analysis(videos)
+        pending, restored = self._resume_from_checkpoint(videos)
+        results, sink = self._start_collecting(restored)
+
+        try:
+            with self._analysis_progress() as progress:
+                task_desc = _("analyzer.progress_task").format(entity_type=entity_type)
+                task_id = progress.add_task(
+                    task_desc, total=len(videos), completed=len(videos) - len(pending)
+                )
+                check_semaphore = asyncio.Semaphore(config.async_concurrency)
+                loop = asyncio.get_running_loop()
+
+                async with AsyncHTTPClient() as client:
+
+                    async def run(video):
+                        task = await self._process_video_async(
+                            client, video, check_semaphore
+                        )
+                        self._collect_result(task["result"], results, sink)
+                        progress.update(task_id, advance=1)
+                        # 检查点在线程池中写入，不阻塞事件循环
+                        snapshot = self._checkpoint_snapshot(sink)
+                        if snapshot is not None:
+                            await loop.run_in_executor(
+                                None, self._write_checkpoint, snapshot
+                            )
 
-    def display_results(self, results, stats=None):
+                    await asyncio.gather(*(run(video) for video in pending))
+        except BaseException:
+            # 中断或出错时保存已完成的结果，下次使用--resume继续
+            self._checkpoint(sink, force=True)
+            raise
+        finally:
+            if sink is not None:
+                sink.close()
+
+        return self._finish_analysis(results), self.stats
+
+    def display_results(self, summary, stats=None):
         """
         显示分析结果
 
         参数:
-            results: 分析结果列表
+            summary: analyze_videos返回的结果摘要
             stats: 统计信息，如果为None则使用self.stats
         """
         if not stats:
@@ -1435,13 +2296,10 @@ class FC2Analyzer:
 
         try:
             # 如果结果为空，显示提示信息
-            if not results:
+            if not summary or not summary.total:
                 console.print(_("analyzer.no_results", "[bold yellow]⚠️ 没有分析结果可显示[/bold yellow]"))
                 return
 
-            # 根据ID排序结果
-            sorted_results = sorted(results, key=lambda x: x["id"])
-
             # 显示统计信息
             total = stats["total"]
             processed = stats["processed"]
@@ -1780,7 +2638,7 @@ class FC2Analyzer:
 
     def _update_stats(self, result):
         """
-        更新统计信息
+        更新统计信息 (磁力链接统计由磁链阶段通过_update_magnet_stats更新)
 
         参数:
             result: 视频处理结果
@@ -1794,17 +2652,6 @@ class FC2Analyzer:
                 self.stats["errors"] += 1
             elif result["status"] == "available":
                 self.stats["available"] += 1
-
-                # 更新磁力链接统计
-                if self.with_magnet:
-                    if result.get("has_magnet"):
-                        self.stats["with_magnet"] += 1
-                        self.stats["magnet_success"] = (
-                            self.stats.get("magnet_success", 0) + 1
-                        )
-                    else:
-                        self.stats["without_magnet"] += 1
-                        self.stats["magnet_fail"] = self.stats.get("magnet_fail", 0) + 1
             else:
                 self.stats["unavailable"] += 1
 
@@ -1820,21 +2667,43 @@ class FC2Analyzer:
             ]:
                 if key not in self.stats:
                     self.stats[key] = 0
+
+    def _update_magnet_stats(self, result):
+        """
+        更新已流出视频的磁力链接统计
+
+        参数:
+            result: 视频处理结果
+        """
+        if not self.with_magnet:
+            return
+        with self.lock:
+            if result.get("has_magnet"):
+                self.stats["with_magnet"] += 1
+                self.stats["magnet_success"] = self.stats.get("magnet_success", 0) + 1
+            else:
+                self.stats["without_magnet"] += 1
+                self.stats["magnet_fail"] = self.stats.get("magnet_fail", 0) + 1
     
-    def save_results(self):
+    def save_results(self, extra_outputs=None):
         """
-        保存分析结果到多个文件，包括磁链文件和日志文件
+        保存分析结果到多个文件，包括磁链文件、标准报告和日志文件
+
+        所有结果文件在同一次遍历中写入
         
         磁链文件格式：ID_作者名_日期时间_magnet.txt，内容只包含纯磁链
         日志文件格式：爬取类型_ID_日期时间.txt
+
+        参数:
+            extra_outputs: 需要同时生成的其他ReportOutput列表
         """
-        if not hasattr(self, "results") or not self.results:
+        source = self._result_source(self.results)
+        if source is None:
             self.logger.warning("没有分析结果可保存")
             if not self.quiet_mode:
                 console.print("[bold yellow]⚠️ 没有分析结果可保存[/bold yellow]")
             return {}
         
-        reports = {}
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # 获取ID和名称
@@ -1844,66 +2713,40 @@ class FC2Analyzer:
         clean_name = self.clean_filename(entity_name)
         
         try:
-            # 1. 保存磁链文件
-            # 查找有磁链的视频
-            leaked_with_magnet = []
-            for r in self.results:
-                # 检查是否有磁链 - 兼容多种格式
-                has_magnet = False
-                if r.get("has_magnet", False):
-                    has_magnet = True
-                elif r.get("magnets") and len(r.get("magnets")) > 0:
-                    has_magnet = True
-                elif r.get("magnet"):
-                    has_magnet = True
-                
-                # 检查是否已流出
-                is_leaked = r.get("exists", False) or r.get("leaked", False) or r.get("status") == "available"
-                
-                if has_magnet and is_leaked:
-                    leaked_with_magnet.append(r)
-            
-            # 如果有磁链，保存到磁链目录
-            if leaked_with_magnet and self.with_magnet:
-                # 确保磁链目录存在
-                os.makedirs(self.magnet_dir, exist_ok=True)
-                
-                # 按照指定格式构建文件名: ID_作者名_日期时间_magnet.txt
+            outputs = []
+            # 1. 磁链文件，按照指定格式构建文件名: ID_作者名_日期时间_magnet.txt
+            if self.with_magnet:
                 magnet_filename = f"{entity_id}_{clean_name}_{timestamp}_magnet.txt"
-                magnet_filepath = os.path.join(self.magnet_dir, magnet_filename)
-                
-                with open(magnet_filepath, "w", encoding="utf-8") as f:
-                    # 只写入纯磁链，不包含其他任何文字
-                    for video in leaked_with_magnet:
-                        # 获取磁链 - 兼容多种格式
-                        magnets = []
-                        if video.get("magnets"):
-                            magnets.extend(video.get("magnets"))
-                        if video.get("magnet") and video.get("magnet") not in magnets:
-                            magnets.append(video.get("magnet"))
-                        
-                        # 每个磁链占一行
-                        for magnet in magnets:
-                            if magnet and isinstance(magnet, str):
-                                f.write(f"{magnet}\n")
-                
-                reports["magnet_file"] = magnet_filepath
+                outputs.append(MagnetOnlyOutput(os.path.join(self.magnet_dir, magnet_filename)))
+            
+            # 2. 标准报告
+            outputs.extend(self._report_outputs(entity_id, entity_name))
+            outputs.extend(extra_outputs or [])
+            
+            builder = ReportBuilder(source)
+            reports = builder.build(outputs)
+            summary = self.report_summary = builder.summarize()
+            
+            if "magnet_file" in reports:
+                magnet_filepath = reports["magnet_file"]
                 self.logger.info(f"已将磁链保存到: {magnet_filepath}")
                 
                 if not self.quiet_mode:
                     console.print(f"[bold green]✅ 磁链已保存到: {magnet_filepath}[/bold green]")
+            if "magnet_only" in reports:
+                self.logger.info(_("logger.magnet_file_generated", "已生成磁链专用文件: {path}").format(path=reports["magnet_only"]))
             
-            # 2. 保存分析日志
+            # 3. 保存分析日志
             # 使用分析日志记录器
             from src.utils import get_analysis_logger
             analysis_logger = get_analysis_logger(entity_type, entity_id)
             
             # 获取统计信息
-            total = len(self.results)
-            leaked = sum(1 for r in self.results if r.get("exists", False) or r.get("leaked", False) or r.get("status") == "available")
-            unleaked = total - leaked
-            error_count = sum(1 for r in self.results if r.get("status") == "error")
-            leak_ratio = (leaked / total) * 100 if total > 0 else 0
+            total = summary.total
+            leaked = summary.leaked
+            unleaked = summary.unleaked
+            error_count = summary.errors
+            leak_ratio = summary.leak_ratio
             
             # 记录分析结果
             analysis_logger.info(f"=== FC2视频分析日志 ===")
@@ -1930,15 +2773,6 @@ class FC2Analyzer:
             if not self.quiet_mode:
                 console.print(f"[bold green]✅ 分析日志已保存[/bold green]")
             
-            # 3. 保存标准报告
-            try:
-                standard_reports = self.generate_reports(entity_id, self.results, entity_name)
-                reports.update(standard_reports)
-            except Exception as e:
-                self.logger.error(f"生成标准报告时出错: {str(e)}")
-                if not self.quiet_mode:
-                    console.print(f"[bold red]❌ 生成标准报告时出错: {str(e)}[/bold red]")
-            
             # 在控制台显示保存结果
             if not self.quiet_mode:
                 file_count = len(reports)
@@ -0,0 +1,86 @@
+"""
+视频页面缓存模块 - 按视频ID保存fc2ppvdb的/articles/<id>页面
+
+Jellyfin元数据补充(标签、马赛克、发布日期、时长)和按视频查询作者都需要同一个页面，
+页面以zlib压缩后保存在缓存数据库中，两处共用。有效期内直接使用缓存内容，不发送请求；
+过期后带上ETag/Last-Modified发送条件请求，服务器返回304时继续使用缓存内容
+"""
+import time
+import zlib
+
+from config import config
+from src.utils.cache_manager import CacheManager
+from src.utils.logger import get_logger
+
+logger = get_logger("article_cache")
+
+
+def article_url(video_id):
+    """返回视频页面的URL"""
+    return f"{config.fc2ppvdb_api_base}/articles/{video_id}"
+
+
+def lookup(video_id):
+    """读取缓存的视频页面，未启用页面缓存时返回None
+
+    Args:
+        video_id: 视频ID
+
+    Returns:
+        dict: 包含etag、last_modified、encoding、body(已解压)和fetched_at，不存在时返回None
+    """
+    if not config.article_cache or not video_id:
+        return None
+    try:
+        entry = CacheManager.get_store().get_article(video_id)
+        if entry is None:
+            return None
+        entry["body"] = zlib.decompress(entry["body"])
+        return entry
+    except Exception as e:
+        logger.error(f"读取视频页面缓存失败: {video_id} - {str(e)}")
+        return None
+
+
+def is_fresh(entry):
+    """缓存的页面是否仍在有效期内，有效期内可以不发送请求直接使用"""
+    if not entry:
+        return False
+    return time.time() - entry["fetched_at"] <= config.article_cache_ttl
+
+
+def text(entry):
+    """返回缓存页面的HTML文本"""
+    return entry["body"].decode(entry["encoding"] or "utf-8", errors="replace")
+
+
+def store(video_id, body, response_headers, encoding=None):
+    """压缩并保存状态码为200的视频页面
+
+    Args:
+        video_id: 视频ID
+        body: 响应内容 (bytes)
+        response_headers: 响应头，其中的ETag/Last-Modified用于过期后的条件请求
+        encoding: 响应内容的编码
+    """
+    if not config.article_cache or not video_id:
+        return
+    try:
+        CacheManager.get_store().set_article(
+            video_id,
+            zlib.compress(body),
+            etag=response_headers.get("ETag"),
+            last_modified=response_headers.get("Last-Modified"),
+            encoding=encoding,
+        )
+    except Exception as e:
+        logger.error(f"保存视频页面缓存失败: {video_id} - {str(e)}")
+
+
+def revalidated(video_id):
+    """服务器返回304时重新开始计算缓存页面的有效期"""
+    logger.debug(f"视频页面未变化，使用缓存内容: {video_id}")
+    try:
+        CacheManager.get_store().touch_article(video_id)
+    except Exception as e:
+        logger.error(f"更新视频页面缓存失败: {video_id} - {str(e)}")
@@ -0,0 +1,195 @@
+"""
+异步HTTP模块 - 基于aiohttp的共享会话客户端
+
+一个客户端对应一个事件循环内的共享连接池，每个主机使用独立的信号量限制在途请求数，
+请求节奏仍由全局按主机限速器控制；重试前按指数退避加随机抖动等待，
+服务器返回Retry-After时按其指定的时间等待
+"""
+import asyncio
+import random
+from urllib.parse import urlparse
+
+import aiohttp
+
+from config import config
+from src.utils.concurrency_limiter import parse_retry_after
+from src.utils.logger import get_logger
+from src.utils.rate_limiter import rate_limiter
+
+logger = get_logger("async_http")
+
+# 可以重试的响应状态码 (限流和服务器临时错误)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class AsyncResponse:
+    """已读取完毕的异步响应，字段命名与requests.Response保持一致"""
+
+    def __init__(self, status_code, url, headers, content, encoding=None):
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding or "utf-8"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+
+class AsyncHTTPClient:
+    """异步HTTP客户端，需要在async with中使用
+
+    示例:
+        async with AsyncHTTPClient() as client:
+            response = await client.request("GET", url)
+    """
+
+    def __init__(self, max_connections=None, per_host=None, timeout=None, headers=None):
+        """初始化客户端
+
+        Args:
+            max_connections: 连接总数上限，默认使用config.async_max_connections
+            per_host: 每个主机同时在途的请求数，默认使用config.async_connections_per_host
+            timeout: 默认超时时间(秒)
+            headers: 默认请求头
+        """
+        self.max_connections = max_connections or config.async_max_connections
+        self.per_host = per_host or config.async_connections_per_host
+        self.timeout = timeout or config.timeout
+        self.headers = headers or config.api_headers
+        self.session = None
+        self._semaphores = {}
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """创建共享会话"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=config.async_keepalive_timeout,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self.session
+
+    async def close(self):
+        """关闭会话并释放连接"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def _semaphore(self, host):
+        """获取主机对应的信号量"""
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _retry_delay(attempt, retry_after=None):
+        """第attempt+1次重试前等待的秒数
+
+        服务器返回Retry-After时按其等待 (不超过config.max_retry_after)，
+        否则按config.retry_base指数退避并加入随机抖动，避免同时失败的请求同时重试
+
+        Args:
+            attempt: 本次失败的尝试序号 (从0开始)
+            retry_after: Retry-After响应头的值
+
+        Returns:
+            float: 等待的秒数
+        """
+        wait = parse_retry_after(retry_after, config.max_retry_after)
+        if wait is None:
+            wait = config.retry_base ** (attempt + 1) + random.uniform(0, 1)
+        return wait
+
+    def _proxy_for(self, url):
+        """根据配置返回代理地址"""
+        if not config.enable_proxy:
+            return None
+        scheme = urlparse(url).scheme or "http"
+        return config.proxy.get(scheme) or None
+
+    async def request(
+        self,
+        method,
+        url,
+        headers=None,
+        timeout=None,
+        allow_redirects=True,
+        max_retries=0,
+        read_body=True,
+    ):
+        """发送请求并读取完整响应
+
+        先占用主机信号量再向限速器申请时间槽，保证同一主机的请求既不超过并发上限，
+        也不超过请求速率预算；网络异常或响应状态码在RETRY_STATUS中时，
+        释放信号量并等待_retry_delay后重试
+
+        Args:
+            method: 请求方法
+            url: 请求URL
+            headers: 请求头，默认使用客户端请求头
+            timeout: 超时时间(秒)
+            allow_redirects: 是否允许重定向
+            max_retries: 网络异常或限流、服务器临时错误时的重试次数
+            read_body: 是否读取响应内容，为False时收到响应头后即关闭响应
+
+        Returns:
+            AsyncResponse: 响应对象，重试次数用完时返回最后一次的响应
+
+        Raises:
+            aiohttp.ClientError, asyncio.TimeoutError: 重试后仍然失败
+        """
+        session = await self.open()
+        host = rate_limiter.host_of(url)
+        request_timeout = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        for attempt in range(max_retries + 1):
+            retry_after = None
+            try:
+                async with self._semaphore(host):
+                    await rate_limiter.acquire_async(url)
+                    async with session.request(
+                        method,
+                        url,
+                        headers=headers,
+                        timeout=request_timeout,
+                        allow_redirects=allow_redirects,
+                        proxy=self._proxy_for(url),
+                    ) as response:
+                        if response.status in RETRY_STATUS and attempt < max_retries:
+                            retry_after = response.headers.get("Retry-After")
+                            logger.warning(
+                                f"异步请求返回{response.status}，准备重试 ({attempt + 1}/{max_retries}): {url}"
+                            )
+                        else:
+                            content = await response.read() if read_body else b""
+                            return AsyncResponse(
+                                response.status,
+                                str(response.url),
+                                response.headers,
+                                content,
+                                response.charset,
+                            )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= max_retries:
+                    raise
+                logger.warning(f"异步请求失败，准备重试 ({attempt + 1}/{max_retries}): {url} - {e}")
+
+            # 等待期间不占用主机信号量
+            await asyncio.sleep(self._retry_delay(attempt, retry_after))
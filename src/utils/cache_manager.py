@@ -1,14 +1,19 @@
 """
 缓存管理模块 - 提供高效的数据缓存服务
 
-负责管理视频状态、磁力链接和缩略图的缓存，支持自动过期和多级存储
+负责管理视频状态、磁力链接和缩略图的缓存，支持自动过期和多级存储，
+数据统一保存在SQLite缓存数据库中 (参见cache_store模块)
 """
+import atexit
 import json
 import os
+import tempfile
+import threading
 import time
 from datetime import datetime, timedelta
 
 from config import config
+from src.utils.cache_store import CacheStore, entity_type_of
 
 
 class CacheManager:
@@ -16,6 +21,10 @@ class CacheManager:
 
     # 添加类变量用于单例模式
     cache_dir = config.cache_dir
+    _shared = None
+    _shared_lock = threading.Lock()
+    _store = None
+    _store_lock = threading.Lock()
 
     def __init__(self, cache_dir=None):
         """初始化缓存管理器 - 向后兼容的实例方法
@@ -24,8 +33,6 @@ class CacheManager:
             cache_dir: 缓存目录，默认为配置中的cache_dir
         """
         self.cache_dir = str(cache_dir) if cache_dir else config.cache_dir
-        self.video_status_cache = {}
-        self.magnet_cache = {}
         self.thumbnail_cache = set()
         self.cache_expiry = config.cache_ttl // 86400  # 缓存过期天数 (从秒转换为天)
 
@@ -33,13 +40,59 @@ class CacheManager:
         os.makedirs(self.cache_dir, exist_ok=True)
 
         # 创建子目录
-        self.video_status_cache_file = os.path.join(self.cache_dir, "video_status.json")
-        self.magnet_cache_file = os.path.join(self.cache_dir, "magnets.json")
         self.thumbnail_dir = os.path.join(self.cache_dir, "thumbnails")
         os.makedirs(self.thumbnail_dir, exist_ok=True)
 
-        # 加载缓存
-        self._load_caches()
+        # 视频状态和磁链保存在缓存数据库中
+        self.store = self.get_store()
+
+    @classmethod
+    def shared(cls):
+        """获取进程内共享的缓存管理器实例
+
+        多个分析器和线程共用同一份内存缓存，进程退出时自动写回未保存的修改
+
+        Returns:
+            CacheManager: 共享实例
+        """
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    instance = cls()
+                    atexit.register(instance.flush)
+                    cls._shared = instance
+        return cls._shared
+
+    @classmethod
+    def get_store(cls):
+        """获取进程内共享的缓存数据库，首次调用时打开数据库并导入旧版JSON缓存
+
+        Returns:
+            CacheStore: 缓存数据库实例
+        """
+        if cls._store is None:
+            with cls._store_lock:
+                if cls._store is None:
+                    cls._store = CacheStore()
+                    atexit.register(cls._store.close)
+        return cls._store
+
+    @classmethod
+    def _read_videos(cls, writerid, is_actress=False):
+        """从缓存数据库读取作者视频列表
+
+        Args:
+            writerid: 作者ID
+            is_actress: 是否为女优ID
+
+        Returns:
+            tuple: (视频列表, 缓存时间)，不存在或读取失败时返回None
+        """
+        try:
+            return cls.get_store().get_videos(entity_type_of(is_actress), writerid)
+        except Exception as e:
+            print(f"❌ 缓存加载失败: {str(e)}")
+            return None
 
     @classmethod
     def load(cls, writerid, is_actress=False):
@@ -52,57 +105,35 @@ class CacheManager:
         Returns:
             list: 作者视频列表，如果不存在则返回None
         """
-        cache_dir = config.cache_dir
-
-        # 使用正确的前缀
-        prefix = "actress" if is_actress else "author"
-        cache_file = os.path.join(cache_dir, f"{prefix}_{writerid}.json")
-
-        if not os.path.exists(cache_file):
+        cached = cls._read_videos(writerid, is_actress)
+        if cached is None:
+            return None
+        videos, cache_time = cached
+
+        # 检查缓存是否过期
+        cache_ttl = config.cache_ttl  # 默认48小时
+        if (datetime.now() - cache_time).total_seconds() > cache_ttl:
+            print(
+                f"⚠️ 缓存已过期（{(datetime.now() - cache_time).seconds // 3600:.0f}小时）"
+            )
             return None
 
-        try:
-            # 读取文件内容并处理可能的BOM标记
-            with open(cache_file, "rb") as f:
-                content = f.read()
-
-            # 检查并去除UTF-8 BOM标记 (EF BB BF)
-            if content.startswith(b"\xef\xbb\xbf"):
-                content = content[3:]
-                print("⚠️ 检测到UTF-8 BOM标记，已自动移除")
-
-            # 解析JSON
-            data = json.loads(content.decode("utf-8"))
-
-            # 检查缓存是否过期
-            cache_time = datetime.strptime(data["timestamp"], "%Y-%m-%d %H:%M:%S")
-            cache_ttl = config.cache_ttl  # 默认48小时
-            if (datetime.now() - cache_time).total_seconds() > cache_ttl:
-                print(
-                    f"⚠️ 缓存已过期（{(datetime.now() - cache_time).seconds // 3600:.0f}小时）"
-                )
-                return None
-
-            # 验证缓存数据格式
-            videos = data.get("videos", [])
-            if not isinstance(videos, list):
-                print("❌ 缓存数据格式错误：videos不是列表类型")
-                return None
+        print(f"✅ 从缓存读取视频数据：{len(videos)}个")
+        return videos
 
-            for idx, video in enumerate(videos):
-                if not isinstance(video, dict):
-                    print(f"❌ 缓存数据格式错误：第{idx+1}个视频不是字典类型")
-                    return None
-                if "video_id" not in video:
-                    print(f"❌ 缓存数据格式错误：第{idx+1}个视频缺少video_id字段")
-                    return None
+    @classmethod
+    def load_expired(cls, writerid, is_actress=False):
+        """加载作者视频缓存，忽略有效期，用于增量刷新
 
-            print(f"✅ 从缓存读取视频数据：{len(videos)}个")
-            return videos
+        Args:
+            writerid: 作者ID
+            is_actress: 是否为女优ID
 
-        except Exception as e:
-            print(f"❌ 缓存加载失败: {str(e)}")
-            return None
+        Returns:
+            list: 作者视频列表，如果不存在或格式错误则返回None
+        """
+        cached = cls._read_videos(writerid, is_actress)
+        return cached[0] if cached else None
 
     @classmethod
     def save(cls, writerid, videos, is_actress=False):
@@ -116,25 +147,15 @@ class CacheManager:
         Returns:
             bool: 是否成功保存
         """
-        cache_dir = config.cache_dir
-        os.makedirs(cache_dir, exist_ok=True)
-
         try:
             # 检查是否是视频状态数据
             if isinstance(videos, dict) and "status" in videos:
                 # 保存视频状态
-                cache_data = {
-                    "writerid": writerid,
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "status": videos["status"],
-                    "site": videos.get("site"),
-                    "status_code": videos.get("status_code"),
-                    "timestamp": time.time(),
-                }
-                # 使用正确的前缀
-                prefix = "actress" if is_actress else "author"
-                cache_file = os.path.join(
-                    cache_dir, f"{prefix}_video_status_{writerid}.json"
+                cls.get_store().set_leak_check(
+                    writerid,
+                    videos["status"],
+                    videos.get("site"),
+                    videos.get("status_code"),
                 )
             else:
                 # 保存视频列表
@@ -151,25 +172,89 @@ class CacheManager:
                         print(f"❌ 缓存数据格式错误：第{idx+1}个视频缺少video_id字段")
                         return False
 
-                cache_data = {
-                    "writerid": writerid,
-                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "videos": videos,
-                }
-                # 使用正确的前缀
-                prefix = "actress" if is_actress else "author"
-                cache_file = os.path.join(cache_dir, f"{prefix}_{writerid}.json")
-
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                cls.get_store().save_videos(
+                    entity_type_of(is_actress), writerid, videos
+                )
 
-            print(f"💾 已缓存数据到 {cache_file}")
+            print(f"💾 已缓存数据到 {config.cache_db}")
             return True
 
         except Exception as e:
             print(f"❌ 缓存保存失败: {str(e)}")
             return False
 
+    @classmethod
+    def load_summary(cls, writerid, is_actress=False):
+        """加载作者/女优最近一次的分析摘要
+
+        Args:
+            writerid: 作者ID
+            is_actress: 是否为女优ID
+
+        Returns:
+            dict: 未过期的摘要数据，不存在、过期或读取失败时返回None
+        """
+        try:
+            cached = cls.get_store().get_summary(entity_type_of(is_actress), writerid)
+        except Exception as e:
+            print(f"❌ 缓存加载失败: {str(e)}")
+            return None
+        if cached is None:
+            return None
+
+        summary, cache_time = cached
+        if (datetime.now() - cache_time).total_seconds() > config.cache_ttl:
+            return None
+        return summary
+
+    @classmethod
+    def save_summary(cls, writerid, summary, is_actress=False, name=None):
+        """保存作者/女优的分析摘要 (批量处理中单个作者的处理结果)
+
+        Args:
+            writerid: 作者ID
+            summary: 摘要字典
+            is_actress: 是否为女优ID
+            name: 作者/女优名称
+
+        Returns:
+            bool: 是否成功保存
+        """
+        try:
+            cls.get_store().save_summary(
+                entity_type_of(is_actress), writerid, summary, name=name
+            )
+            return True
+        except Exception as e:
+            print(f"❌ 缓存保存失败: {str(e)}")
+            return False
+
+    @staticmethod
+    def _write_json_atomic(path, data):
+        """原子写入JSON文件
+
+        先写入同目录下的临时文件并刷新到磁盘，再替换目标文件，
+        写入过程中断时原文件保持完整
+
+        Args:
+            path: 目标文件路径
+            data: 要写入的数据
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(
+            prefix=".tmp_", suffix=".json", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
     @classmethod
     def save_batch_results(cls, writerid, results, batch_num, author_name=None):
         """保存批次处理结果 - fc2_main.py功能
@@ -194,18 +279,15 @@ class CacheManager:
         filename = os.path.join(result_dir, f"{file_prefix}_批次{batch_num}_临时结果.json")
 
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "writerid": writerid,
-                        "batch": batch_num,
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        "results": results,
-                    },
-                    f,
-                    ensure_ascii=False,
-                    indent=2,
-                )
+            cls._write_json_atomic(
+                filename,
+                {
+                    "writerid": writerid,
+                    "batch": batch_num,
+                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "results": results,
+                },
+            )
             print(f"💾 已保存批次{batch_num}处理结果 ({len(results)}个视频)")
             return filename
         except Exception as e:
@@ -220,7 +302,7 @@ class CacheManager:
             writerid: 作者ID或视频ID
 
         Returns:
-            dict: 处理状态字典
+            dict: 处理状态字典，包含processed、latest_batch，保存过检查点时还包含results_path和sink_offset
         """
         cache_dir = config.cache_dir
         status_file = os.path.join(cache_dir, f"process_status_{writerid}.json")
@@ -236,13 +318,19 @@ class CacheManager:
             return {"processed": [], "latest_batch": None}
 
     @classmethod
-    def save_process_status(cls, writerid, processed_ids, batch_id=None):
+    def save_process_status(
+        cls, writerid, processed_ids, batch_id=None, results_path=None, sink_offset=None
+    ):
         """保存处理进度状态到本地缓存 - fc2_main.py功能
 
+        使用临时文件加重命名的方式写入，保存过程中断不会损坏已有的进度文件
+
         Args:
             writerid: 作者ID
             processed_ids: 已处理的视频ID列表
             batch_id: 批次ID
+            results_path: 已处理视频的结果文件路径 (JSON Lines)，用于中断后恢复
+            sink_offset: 保存时结果文件已写入的字节数，之后写入的内容恢复时忽略
 
         Returns:
             bool: 是否成功保存
@@ -257,9 +345,11 @@ class CacheManager:
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "latest_batch": batch_id,
             }
+            if results_path is not None:
+                status["results_path"] = results_path
+                status["sink_offset"] = sink_offset
 
-            with open(status_file, "w", encoding="utf-8") as f:
-                json.dump(status, f, ensure_ascii=False, indent=2)
+            cls._write_json_atomic(status_file, status)
 
             print(f"💾 已保存处理进度 ({len(processed_ids)}个视频)")
             return True
@@ -267,22 +357,153 @@ class CacheManager:
             print(f"❌ 进度状态保存失败: {str(e)}")
             return False
 
-    def set_magnet(self, video_id, magnet_link):
-        """设置视频的磁力链接 - 实例方法"""
-        if not video_id or not magnet_link:
+    @staticmethod
+    def process_results_path(writerid):
+        """未启用流式输出时，检查点使用的结果文件路径
+
+        Args:
+            writerid: 作者ID或视频ID
+
+        Returns:
+            str: 缓存目录中的JSON Lines结果文件路径
+        """
+        return os.path.join(config.cache_dir, f"process_results_{writerid}.jsonl")
+
+    @classmethod
+    def clear_process_status(cls, writerid):
+        """删除处理进度状态文件和检查点使用的结果文件，分析全部完成后调用
+
+        Args:
+            writerid: 作者ID或视频ID
+
+        Returns:
+            bool: 是否成功删除
+        """
+        status_file = os.path.join(config.cache_dir, f"process_status_{writerid}.json")
+        try:
+            for path in (status_file, cls.process_results_path(writerid)):
+                if os.path.exists(path):
+                    os.remove(path)
+            return True
+        except Exception as e:
+            print(f"❌ 进度状态删除失败: {str(e)}")
             return False
 
-        self.magnet_cache[video_id] = magnet_link
+    def get_video_status(self, video_id):
+        """获取视频的流出检查缓存 - 实例方法
+
+        已流出的结果永久有效；未找到和检查出错的结果分别按
+        config.leak_status_negative_ttl和config.leak_status_error_ttl过期
+
+        Args:
+            video_id: 视频ID
+
+        Returns:
+            dict: 包含status、site、status_code和timestamp，未命中或已过期返回None
+        """
+        if not video_id:
+            return None
+
+        entry = self.store.get_leak_check(video_id)
+        if entry is None:
+            return None
+
+        status = entry["status"]
+        if status == "leaked":
+            return entry
+
+        ttl = (
+            config.leak_status_negative_ttl
+            if status == "not_found"
+            else config.leak_status_error_ttl
+        )
+        if time.time() - entry.get("timestamp", 0) > ttl:
+            return None
+        return entry
+
+    def set_video_status(self, video_id, status, site=None, status_code=None):
+        """记录视频的流出检查结果 - 实例方法
+
+        Args:
+            video_id: 视频ID
+            status: leaked、not_found或error
+            site: 站点名称
+            status_code: 响应状态码
+
+        Returns:
+            bool: 是否成功记录
+        """
+        if not video_id or not status:
+            return False
 
-        # 保存到文件
         try:
-            with open(self.magnet_cache_file, "w", encoding="utf-8") as f:
-                json.dump(self.magnet_cache, f, ensure_ascii=False, indent=2)
+            self.store.set_leak_check(video_id, status, site, status_code)
+            return True
+        except Exception as e:
+            print(f"保存视频状态缓存失败: {str(e)}")
+            return False
+
+    def flush(self):
+        """立即提交缓存数据库的写缓冲 - 实例方法
+
+        视频状态和磁链记录由后台线程批量写入，分析结束时调用以确保全部落盘
+
+        Returns:
+            bool: 是否成功保存
+        """
+        return self.store.flush()
+
+    def get_magnets(self, video_id):
+        """查询视频的磁力链接缓存 - 实例方法
+
+        Args:
+            video_id: 视频ID
+
+        Returns:
+            list: 磁链列表；空列表表示近期已确认没有磁链(config.magnet_not_found_ttl内有效)；
+                  未命中或已过期返回None
+        """
+        if not video_id:
+            return None
+
+        entry = self.store.get_magnets(video_id)
+        if entry is None:
+            return None
+
+        magnets, timestamp = entry
+        if magnets:
+            return list(magnets)
+        if time.time() - timestamp > config.magnet_not_found_ttl:
+            return None
+        return []
+
+    def set_magnets(self, video_id, magnets):
+        """记录视频的磁力链接，空列表表示未找到 - 实例方法
+
+        Args:
+            video_id: 视频ID
+            magnets: 磁链列表
+
+        Returns:
+            bool: 是否成功记录
+        """
+        if not video_id:
+            return False
+
+        try:
+            self.store.set_magnets(video_id, magnets)
             return True
         except Exception as e:
             print(f"保存磁力链接缓存失败: {str(e)}")
             return False
 
+    def set_magnet(self, video_id, magnet_link):
+        """设置视频的磁力链接 - 实例方法"""
+        if not video_id or not magnet_link:
+            return False
+
+        return self.set_magnets(video_id, [magnet_link])
+
     def has_thumbnail(self, video_id):
         """检查是否已缓存缩略图 - 实例方法"""
         if not video_id:
@@ -292,15 +513,17 @@ class CacheManager:
         if video_id in self.thumbnail_cache:
             return True
 
-        # 检查文件系统
-        return os.path.exists(os.path.join(self.thumbnail_dir, f"{video_id}.jpg"))
+        # 检查数据库记录和文件系统
+        return self.get_thumbnail_path(video_id) is not None
 
     def get_thumbnail_path(self, video_id):
         """获取缩略图路径 - 实例方法"""
         if not video_id:
             return None
 
-        path = os.path.join(self.thumbnail_dir, f"{video_id}.jpg")
+        path = self.store.get_thumbnail(video_id) or os.path.join(
+            self.thumbnail_dir, f"{video_id}.jpg"
+        )
 
         if os.path.exists(path):
             self.thumbnail_cache.add(video_id)
@@ -308,6 +531,23 @@ class CacheManager:
 
         return None
 
+    def record_thumbnail(self, video_id, path):
+        """记录已保存到其他目录的缩略图路径 - 实例方法
+
+        Args:
+            video_id: 视频ID
+            path: 图片文件路径
+
+        Returns:
+            bool: 是否成功记录
+        """
+        if not video_id or not path:
+            return False
+
+        self.thumbnail_cache.add(video_id)
+        self.store.set_thumbnail(video_id, path)
+        return True
+
     def set_thumbnail(self, video_id, image_data):
         """保存缩略图 - 实例方法"""
         if not video_id or not image_data:
@@ -320,6 +560,7 @@ class CacheManager:
                 f.write(image_data)
 
             self.thumbnail_cache.add(video_id)
+            self.store.set_thumbnail(video_id, save_path)
             return save_path
 
         except Exception as e:
@@ -398,6 +639,19 @@ class CacheManager:
             if not os.path.exists(cache_dir):
                 return True
 
+            # 清除数据库中的对应数据
+            store = cls.get_store()
+            if cache_type == "video_status":
+                store.delete_video_caches("leak_checks")
+            elif cache_type == "magnet":
+                store.delete_video_caches("magnets")
+            elif cache_type in ("author", "actress"):
+                store.delete_entities(cache_type)
+            else:
+                store.delete_entities()
+                store.delete_http_responses()
+                store.delete_articles()
+
             # 根据类型清除不同的缓存
             if cache_type == "video_status":
                 pattern = "*_status_*.json"
@@ -449,6 +703,12 @@ class CacheManager:
             root_dir = Path(__file__).parent.parent.parent
             success = True
             
+            # 关闭缓存数据库连接
+            if cls._store is not None:
+                cls._store.close()
+                cls._store = None
+                cls._shared = None
+
             # 删除 data 目录
             data_dir = root_dir / 'data'
             if data_dir.exists():
@@ -483,21 +743,3 @@ class CacheManager:
         except Exception as e:
             print(f"❌ 清除缓存时出错: {e}")
             return False
-
-    def _load_caches(self):
-        """加载缓存文件到内存 - 私有方法"""
-        # 加载视频状态缓存
-        if os.path.exists(self.video_status_cache_file):
-            try:
-                with open(self.video_status_cache_file, "r", encoding="utf-8") as f:
-                    self.video_status_cache = json.load(f)
-            except:
-                self.video_status_cache = {}
-
-        # 加载磁力链接缓存
-        if os.path.exists(self.magnet_cache_file):
-            try:
-                with open(self.magnet_cache_file, "r", encoding="utf-8") as f:
-                    self.magnet_cache = json.load(f)
-            except:
-                self.magnet_cache = {}
@@ -0,0 +1,719 @@
+"""
+缓存存储模块 - 基于SQLite的统一缓存数据库
+
+作者/女优视频列表、分析摘要、流出检查结果、磁链、缩略图记录、HTTP响应缓存和视频页面缓存保存在同一个数据库中，
+代替原来分散在缓存目录下的大量JSON文件。数据库使用WAL日志模式，
+写入时不会阻塞其他进程的读取，按视频ID和作者ID查询都有索引
+
+单个视频的检查结果、磁链和缩略图记录先进入内存写缓冲，由后台写线程批量提交，
+每条记录只写入一次；关闭数据库时把WAL日志合并回主文件并截断
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config import config
+from src.utils.logger import get_logger
+
+logger = get_logger("cache_store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS entities (
+    entity_type TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    name TEXT,
+    videos_updated_at REAL,
+    summary TEXT,
+    summary_updated_at REAL,
+    PRIMARY KEY (entity_type, entity_id)
+);
+CREATE TABLE IF NOT EXISTS videos (
+    entity_type TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (entity_type, entity_id, video_id)
+);
+CREATE INDEX IF NOT EXISTS idx_videos_entity ON videos (entity_type, entity_id, position);
+CREATE INDEX IF NOT EXISTS idx_videos_video_id ON videos (video_id);
+CREATE TABLE IF NOT EXISTS leak_checks (
+    video_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    site TEXT,
+    status_code INTEGER,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS magnets (
+    video_id TEXT PRIMARY KEY,
+    magnets TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS thumbnails (
+    video_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    encoding TEXT,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    video_id TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    encoding TEXT,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# 旧版JSON缓存迁移完成的标记
+_LEGACY_MIGRATED = "legacy_json_migrated"
+
+# 写缓冲对应的表和插入语句
+_BUFFERED_WRITES = {
+    "leak_checks": "INSERT OR REPLACE INTO leak_checks "
+    "(video_id, status, site, status_code, checked_at) VALUES (?, ?, ?, ?, ?)",
+    "magnets": "INSERT OR REPLACE INTO magnets (video_id, magnets, updated_at) "
+    "VALUES (?, ?, ?)",
+    "thumbnails": "INSERT OR REPLACE INTO thumbnails (video_id, path, updated_at) "
+    "VALUES (?, ?, ?)",
+}
+
+
+def entity_type_of(is_actress):
+    """返回实体类型名称"""
+    return "actress" if is_actress else "author"
+
+
+class CacheStore:
+    """SQLite缓存数据库
+
+    进程内共用一个连接，所有操作在锁内执行；
+    打开数据库时会自动导入旧版JSON缓存文件(只执行一次)。
+    单个视频的记录写入写缓冲，读取时优先查询缓冲，因此写入后立即可读
+    """
+
+    def __init__(self, db_path=None, legacy_dir=None, batch_size=None, flush_interval=None):
+        """初始化缓存数据库
+
+        Args:
+            db_path: 数据库文件路径，默认使用config.cache_db
+            legacy_dir: 旧版JSON缓存所在目录，默认使用config.cache_dir
+            batch_size: 写缓冲达到该条数时立即提交，默认使用config.cache_write_batch
+            flush_interval: 后台写线程的提交间隔(秒)，默认使用config.cache_flush_interval
+        """
+        self.db_path = str(db_path or config.cache_db)
+        self.legacy_dir = str(legacy_dir or config.cache_dir)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.db_path, timeout=30, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._closed = False
+
+        # 写缓冲: {表名: {视频ID: 行数据}}，同一视频的多次写入只保留最后一次
+        self.batch_size = batch_size or config.cache_write_batch
+        self.flush_interval = flush_interval or config.cache_flush_interval
+        self._pending = {table: {} for table in _BUFFERED_WRITES}
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="cache-store-writer", daemon=True
+        )
+        self._writer.start()
+
+        self._migrate_legacy_json()
+
+    # ---------------------------------------------------------------
+    # 作者/女优视频列表和分析摘要
+    # ---------------------------------------------------------------
+
+    def get_videos(self, entity_type, entity_id):
+        """读取作者/女优的视频列表
+
+        Args:
+            entity_type: author或actress
+            entity_id: 作者ID或女优ID
+
+        Returns:
+            tuple: (视频列表, 缓存时间datetime)，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT videos_updated_at FROM entities "
+                "WHERE entity_type = ? AND entity_id = ?",
+                (entity_type, str(entity_id)),
+            ).fetchone()
+            if row is None or row[0] is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT data FROM videos WHERE entity_type = ? AND entity_id = ? "
+                "ORDER BY position",
+                (entity_type, str(entity_id)),
+            ).fetchall()
+
+        videos = [json.loads(data) for (data,) in rows]
+        return videos, datetime.fromtimestamp(row[0])
+
+    def save_videos(self, entity_type, entity_id, videos, updated_at=None):
+        """替换作者/女优的视频列表
+
+        Args:
+            entity_type: author或actress
+            entity_id: 作者ID或女优ID
+            videos: 视频字典列表，每项必须包含video_id
+            updated_at: 缓存时间戳，默认为当前时间
+        """
+        entity_id = str(entity_id)
+        updated_at = updated_at if updated_at is not None else time.time()
+        rows = [
+            (
+                entity_type,
+                entity_id,
+                str(video["video_id"]),
+                position,
+                json.dumps(video, ensure_ascii=False),
+            )
+            for position, video in enumerate(videos)
+        ]
+
+        with self._lock, self._conn:
+            self._upsert_entity(entity_type, entity_id)
+            self._conn.execute(
+                "UPDATE entities SET videos_updated_at = ? "
+                "WHERE entity_type = ? AND entity_id = ?",
+                (updated_at, entity_type, entity_id),
+            )
+            self._conn.execute(
+                "DELETE FROM videos WHERE entity_type = ? AND entity_id = ?",
+                (entity_type, entity_id),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO videos "
+                "(entity_type, entity_id, video_id, position, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def get_summary(self, entity_type, entity_id):
+        """读取作者/女优最近一次的分析摘要
+
+        Returns:
+            tuple: (摘要字典, 保存时间datetime)，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary, summary_updated_at FROM entities "
+                "WHERE entity_type = ? AND entity_id = ?",
+                (entity_type, str(entity_id)),
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0]), datetime.fromtimestamp(row[1])
+
+    def save_summary(self, entity_type, entity_id, summary, name=None, updated_at=None):
+        """保存作者/女优的分析摘要
+
+        Args:
+            entity_type: author或actress
+            entity_id: 作者ID或女优ID
+            summary: 摘要字典 (批量处理中每个作者的处理结果)
+            name: 作者/女优名称
+            updated_at: 保存时间戳，默认为当前时间
+        """
+        entity_id = str(entity_id)
+        updated_at = updated_at if updated_at is not None else time.time()
+        with self._lock, self._conn:
+            self._upsert_entity(entity_type, entity_id)
+            self._conn.execute(
+                "UPDATE entities SET summary = ?, summary_updated_at = ?, "
+                "name = COALESCE(?, name) WHERE entity_type = ? AND entity_id = ?",
+                (
+                    json.dumps(summary, ensure_ascii=False),
+                    updated_at,
+                    name,
+                    entity_type,
+                    entity_id,
+                ),
+            )
+
+    def _upsert_entity(self, entity_type, entity_id):
+        """确保实体记录存在，需在锁和事务内调用"""
+        self._conn.execute(
+            "INSERT OR IGNORE INTO entities (entity_type, entity_id) VALUES (?, ?)",
+            (entity_type, entity_id),
+        )
+
+    def delete_entities(self, entity_type=None):
+        """删除作者/女优的视频列表和摘要
+
+        Args:
+            entity_type: author或actress，None表示全部
+        """
+        with self._lock, self._conn:
+            if entity_type is None:
+                self._conn.execute("DELETE FROM videos")
+                self._conn.execute("DELETE FROM entities")
+            else:
+                self._conn.execute(
+                    "DELETE FROM videos WHERE entity_type = ?", (entity_type,)
+                )
+                self._conn.execute(
+                    "DELETE FROM entities WHERE entity_type = ?", (entity_type,)
+                )
+
+    # ---------------------------------------------------------------
+    # 单个视频的缓存
+    # ---------------------------------------------------------------
+
+    def get_leak_check(self, video_id):
+        """读取视频的流出检查记录
+
+        Returns:
+            dict: 包含status、site、status_code和timestamp，不存在时返回None
+        """
+        row = self._pending_row("leak_checks", video_id)
+        if row is not None:
+            row = row[1:]
+        else:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT status, site, status_code, checked_at FROM leak_checks "
+                    "WHERE video_id = ?",
+                    (str(video_id),),
+                ).fetchone()
+        if row is None:
+            return None
+        return {
+            "status": row[0],
+            "site": row[1],
+            "status_code": row[2],
+            "timestamp": row[3],
+        }
+
+    def set_leak_check(self, video_id, status, site=None, status_code=None, checked_at=None):
+        """写入视频的流出检查记录 (进入写缓冲)"""
+        video_id = str(video_id)
+        self._buffer(
+            "leak_checks",
+            video_id,
+            (video_id, status, site, status_code, checked_at or time.time()),
+        )
+
+    def set_leak_checks(self, rows):
+        """批量写入流出检查记录 (直接提交)
+
+        Args:
+            rows: [(视频ID, 状态, 站点, 状态码, 时间戳)]
+        """
+        self._write_rows(
+            "leak_checks", [(str(row[0]),) + tuple(row[1:]) for row in rows]
+        )
+
+    def get_magnets(self, video_id):
+        """读取视频的磁链记录
+
+        Returns:
+            tuple: (磁链列表, 记录时间戳)，不存在时返回None
+        """
+        row = self._pending_row("magnets", video_id)
+        if row is not None:
+            row = row[1:]
+        else:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT magnets, updated_at FROM magnets WHERE video_id = ?",
+                    (str(video_id),),
+                ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    @staticmethod
+    def _magnet_row(video_id, magnets, updated_at):
+        return (
+            str(video_id),
+            json.dumps(list(magnets or []), ensure_ascii=False),
+            updated_at,
+        )
+
+    def set_magnets(self, video_id, magnets, updated_at=None):
+        """写入视频的磁链记录，空列表表示未找到 (进入写缓冲)"""
+        row = self._magnet_row(video_id, magnets, updated_at or time.time())
+        self._buffer("magnets", row[0], row)
+
+    def set_magnets_many(self, rows):
+        """批量写入磁链记录 (直接提交)
+
+        Args:
+            rows: [(视频ID, 磁链列表, 时间戳)]
+        """
+        self._write_rows("magnets", [self._magnet_row(*row) for row in rows])
+
+    def get_thumbnail(self, video_id):
+        """读取视频的缩略图路径，不存在时返回None"""
+        row = self._pending_row("thumbnails", video_id)
+        if row is not None:
+            return row[1]
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path FROM thumbnails WHERE video_id = ?", (str(video_id),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_thumbnail(self, video_id, path):
+        """记录视频的缩略图路径 (进入写缓冲)"""
+        video_id = str(video_id)
+        self._buffer("thumbnails", video_id, (video_id, str(path), time.time()))
+
+    def delete_video_caches(self, table):
+        """清空单个视频缓存表
+
+        Args:
+            table: leak_checks、magnets或thumbnails
+        """
+        if table not in _BUFFERED_WRITES:
+            raise ValueError(f"未知的缓存表: {table}")
+        with self._lock, self._conn:
+            with self._pending_lock:
+                self._pending[table] = {}
+            self._conn.execute(f"DELETE FROM {table}")
+
+    # ---------------------------------------------------------------
+    # HTTP响应缓存 (条件请求)
+    # ---------------------------------------------------------------
+
+    def get_http_response(self, url):
+        """读取缓存的响应及其校验信息
+
+        Args:
+            url: 包含查询参数的完整URL
+
+        Returns:
+            dict: 包含etag、last_modified、encoding、body和fetched_at，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, encoding, body, fetched_at "
+                "FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "encoding": row[2],
+            "body": bytes(row[3]),
+            "fetched_at": row[4],
+        }
+
+    def set_http_response(self, url, body, etag=None, last_modified=None, encoding=None):
+        """保存响应内容及其ETag/Last-Modified"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(url, etag, last_modified, encoding, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, encoding, sqlite3.Binary(body), time.time()),
+            )
+
+    def touch_http_response(self, url):
+        """服务器返回304时更新缓存响应的获取时间"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE http_cache SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def delete_http_responses(self):
+        """清空HTTP响应缓存"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM http_cache")
+
+    # ---------------------------------------------------------------
+    # fc2ppvdb视频页面缓存 (按视频ID)
+    # ---------------------------------------------------------------
+
+    def get_article(self, video_id):
+        """读取缓存的视频页面
+
+        Args:
+            video_id: 视频ID
+
+        Returns:
+            dict: 包含etag、last_modified、encoding、body(zlib压缩)和fetched_at，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, encoding, body, fetched_at "
+                "FROM articles WHERE video_id = ?",
+                (str(video_id),),
+            ).fetchone()
+        if not row:
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "encoding": row[2],
+            "body": bytes(row[3]),
+            "fetched_at": row[4],
+        }
+
+    def set_article(self, video_id, body, etag=None, last_modified=None, encoding=None):
+        """保存视频页面，body为压缩后的页面内容"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles "
+                "(video_id, etag, last_modified, encoding, body, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(video_id), etag, last_modified, encoding, sqlite3.Binary(body), time.time()),
+            )
+
+    def touch_article(self, video_id):
+        """服务器返回304时更新视频页面的获取时间"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE articles SET fetched_at = ? WHERE video_id = ?",
+                (time.time(), str(video_id)),
+            )
+
+    def delete_articles(self):
+        """清空视频页面缓存"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM articles")
+
+    # ---------------------------------------------------------------
+    # 写缓冲
+    # ---------------------------------------------------------------
+
+    def _buffer(self, table, video_id, row):
+        """把一行数据放入写缓冲，缓冲达到batch_size时唤醒写线程"""
+        with self._pending_lock:
+            self._pending[table][video_id] = row
+            pending = sum(len(rows) for rows in self._pending.values())
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _pending_row(self, table, video_id):
+        """查询写缓冲中尚未提交的行"""
+        with self._pending_lock:
+            return self._pending[table].get(str(video_id))
+
+    def _write_rows(self, table, rows):
+        """在一个事务中写入多行数据"""
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(_BUFFERED_WRITES[table], rows)
+
+    def flush(self):
+        """提交写缓冲中的全部数据
+
+        先在锁内取出缓冲再写入，提交期间其他线程可以继续写入新的缓冲；
+        提交失败时把数据放回缓冲，等待下一次提交
+
+        Returns:
+            bool: 是否成功提交
+        """
+        with self._lock:
+            if self._closed:
+                return True
+            with self._pending_lock:
+                pending = self._pending
+                self._pending = {table: {} for table in _BUFFERED_WRITES}
+            if not any(pending.values()):
+                return True
+
+            try:
+                with self._conn:
+                    for table, rows in pending.items():
+                        if rows:
+                            self._conn.executemany(
+                                _BUFFERED_WRITES[table], list(rows.values())
+                            )
+                return True
+            except sqlite3.Error as e:
+                logger.error(f"提交缓存写入失败: {e}")
+                with self._pending_lock:
+                    for table, rows in pending.items():
+                        # 提交失败期间产生的新数据优先
+                        rows.update(self._pending[table])
+                        self._pending[table] = rows
+                return False
+
+    def _writer_loop(self):
+        """后台写线程: 按间隔或缓冲满时提交写缓冲"""
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._stopping:
+                self.flush()
+
+    def checkpoint(self):
+        """把WAL日志合并回数据库主文件并截断日志文件"""
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                logger.warning(f"合并WAL日志失败: {e}")
+
+    def close(self):
+        """停止写线程，提交剩余数据并关闭数据库连接，可重复调用"""
+        if self._closed:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        if self._writer.is_alive() and self._writer is not threading.current_thread():
+            self._writer.join()
+        self.flush()
+        self.checkpoint()
+        with self._lock:
+            self._conn.close()
+            self._closed = True
+
+    # ---------------------------------------------------------------
+    # 旧版JSON缓存迁移
+    # ---------------------------------------------------------------
+
+    def _migrate_legacy_json(self):
+        """把旧版JSON缓存导入数据库，迁移完成后写入标记，不会重复执行
+
+        原文件保留在缓存目录中，不再被读取
+        """
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (_LEGACY_MIGRATED,)
+            ).fetchone()
+        if done or not os.path.isdir(self.legacy_dir):
+            self._mark_migrated()
+            return
+
+        entities = 0
+        for filename in sorted(os.listdir(self.legacy_dir)):
+            if not filename.endswith(".json"):
+                continue
+            if not (filename.startswith("author_") or filename.startswith("actress_")):
+                continue
+            entity_type, _, entity_id = filename[:-5].partition("_")
+            if not entity_id.isdigit():
+                # author_video_status_*.json等附属文件
+                continue
+            try:
+                self._migrate_entity_file(
+                    os.path.join(self.legacy_dir, filename), entity_type, entity_id
+                )
+                entities += 1
+            except Exception as e:
+                logger.warning(f"迁移旧缓存文件失败: {filename} - {e}")
+
+        statuses = self._migrate_status_file(
+            os.path.join(self.legacy_dir, "video_status.json")
+        )
+        magnets = self._migrate_magnet_file(os.path.join(self.legacy_dir, "magnets.json"))
+
+        self._mark_migrated()
+        if entities or statuses or magnets:
+            logger.info(
+                f"已将旧版JSON缓存导入数据库: {entities}个作者/女优, "
+                f"{statuses}条流出检查记录, {magnets}条磁链记录"
+            )
+
+    def _mark_migrated(self):
+        """写入迁移完成标记"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (_LEGACY_MIGRATED, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+
+    @staticmethod
+    def _read_json(path):
+        """读取JSON文件，自动去除UTF-8 BOM"""
+        with open(path, "rb") as f:
+            content = f.read()
+        if content.startswith(b"\xef\xbb\xbf"):
+            content = content[3:]
+        return json.loads(content.decode("utf-8"))
+
+    def _migrate_entity_file(self, path, entity_type, entity_id):
+        """导入单个作者/女优缓存文件"""
+        data = self._read_json(path)
+        updated_at = datetime.strptime(data["timestamp"], "%Y-%m-%d %H:%M:%S").timestamp()
+
+        videos = data.get("videos")
+        if isinstance(videos, list) and all(
+            isinstance(v, dict) and "video_id" in v for v in videos
+        ):
+            self.save_videos(entity_type, entity_id, videos, updated_at)
+
+        if "results" in data or "total_videos" in data:
+            self.save_summary(entity_type, entity_id, data, updated_at=updated_at)
+
+    def _migrate_status_file(self, path):
+        """导入video_status.json，返回导入条数"""
+        if not os.path.exists(path):
+            return 0
+        try:
+            data = self._read_json(path)
+        except Exception as e:
+            logger.warning(f"读取旧版视频状态缓存失败: {e}")
+            return 0
+
+        rows = [
+            (
+                video_id,
+                entry["status"],
+                entry.get("site"),
+                entry.get("status_code"),
+                entry.get("timestamp", 0),
+            )
+            for video_id, entry in data.items()
+            if isinstance(entry, dict) and entry.get("status")
+        ]
+        self.set_leak_checks(rows)
+        return len(rows)
+
+    def _migrate_magnet_file(self, path):
+        """导入magnets.json，返回导入条数"""
+        if not os.path.exists(path):
+            return 0
+        try:
+            data = self._read_json(path)
+        except Exception as e:
+            logger.warning(f"读取旧版磁链缓存失败: {e}")
+            return 0
+
+        rows = []
+        for video_id, entry in data.items():
+            # 兼容旧格式: {视频ID: 磁链} 和 {视频ID: [磁链]}
+            if isinstance(entry, str):
+                rows.append((video_id, [entry], time.time()))
+            elif isinstance(entry, list):
+                rows.append((video_id, entry, time.time()))
+            elif isinstance(entry, dict):
+                rows.append(
+                    (video_id, entry.get("magnets") or [], entry.get("timestamp", 0))
+                )
+        self.set_magnets_many(rows)
+        return len(rows)
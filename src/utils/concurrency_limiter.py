@@ -0,0 +1,200 @@
+"""
+并发控制模块 - 按AIMD(加性增、乘性减)调整同时在途的请求数
+
+响应正常时每完成一个窗口的请求并发上限加1，遇到429/5xx时并发上限减半，
+服务器返回Retry-After时所有请求暂停到指定时间后再发送，
+请求节奏跟随服务器的实际承受能力，而不是固定的批次大小和等待时间
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value, max_wait=None):
+    """解析Retry-After响应头
+
+    Args:
+        value: 响应头的值，可以是秒数或HTTP日期
+        max_wait: 等待时间上限(秒)，None表示不限制
+
+    Returns:
+        float: 需要等待的秒数，无法解析时返回None
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+
+    try:
+        wait = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at is None:
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        wait = (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+    wait = max(0.0, wait)
+    if max_wait is not None:
+        wait = min(wait, float(max_wait))
+    return wait
+
+
+class AIMDLimiter:
+    """AIMD并发控制器，用于协程
+
+    每个请求在发送前通过slot()占用一个并发名额，请求结束后报告结果：
+    success()使并发上限增加 1/当前上限 (约每个窗口加1)，
+    throttle()使并发上限乘以decrease_factor，同一窗口内的多次限流只减少一次
+
+    示例:
+        async with limiter.slot() as slot:
+            response = await client.request("GET", url)
+            if response.status_code == 429:
+                slot.throttle(response.headers.get("Retry-After"))
+            else:
+                slot.success()
+    """
+
+    def __init__(self, initial=2, minimum=1, maximum=8, decrease_factor=0.5,
+                 default_pause=1.0, max_pause=120.0):
+        """初始化控制器
+
+        Args:
+            initial: 初始并发上限
+            minimum: 并发上限的最小值
+            maximum: 并发上限的最大值
+            decrease_factor: 限流时并发上限的缩减比例
+            default_pause: 限流但没有Retry-After时暂停发送的秒数
+            max_pause: Retry-After的等待时间上限(秒)
+        """
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.decrease_factor = decrease_factor
+        self.default_pause = default_pause
+        self.max_pause = max_pause
+
+        self.in_flight = 0
+        self.paused_until = 0.0
+        # 每次缩减并发上限后进入新的窗口，旧窗口中发出的请求再遇到限流时不重复缩减
+        self.window = 0
+
+        # 统计信息
+        self.successes = 0
+        self.throttles = 0
+        self.peak_in_flight = 0
+
+        self._condition = None
+        self._loop = None
+
+    def _get_condition(self):
+        """获取当前事件循环的条件变量，控制器可以在多次asyncio.run之间复用"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    @property
+    def capacity(self):
+        """当前允许同时在途的请求数"""
+        return max(self.minimum, int(self.limit))
+
+    async def acquire(self):
+        """等待一个并发名额，暂停期间和名额用尽时挂起
+
+        Returns:
+            int: 占用名额时所处的窗口编号，报告结果时传回
+        """
+        condition = self._get_condition()
+        while True:
+            async with condition:
+                pause = self.paused_until - time.monotonic()
+                if pause <= 0:
+                    if self.in_flight < self.capacity:
+                        self.in_flight += 1
+                        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                        return self.window
+                    await condition.wait()
+                    continue
+            await asyncio.sleep(pause)
+
+    async def release(self):
+        """释放名额并唤醒等待中的请求"""
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight = max(0, self.in_flight - 1)
+            free = self.capacity - self.in_flight
+            if free > 0:
+                condition.notify(free)
+
+    def on_success(self):
+        """请求正常完成：加性增加并发上限"""
+        self.successes += 1
+        self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+
+    def on_throttle(self, window, retry_after=None):
+        """请求被限流：乘性减少并发上限，并暂停发送新请求
+
+        Args:
+            window: acquire返回的窗口编号
+            retry_after: Retry-After响应头的值
+
+        Returns:
+            float: 本次暂停的秒数
+        """
+        self.throttles += 1
+        if window == self.window:
+            self.limit = max(float(self.minimum), self.limit * self.decrease_factor)
+            self.window += 1
+
+        pause = parse_retry_after(retry_after, self.max_pause)
+        if pause is None:
+            pause = self.default_pause
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        return pause
+
+    @asynccontextmanager
+    async def slot(self):
+        """在上下文中占用一个并发名额，退出时自动释放"""
+        window = await self.acquire()
+        slot = _Slot(self, window)
+        try:
+            yield slot
+        finally:
+            await self.release()
+
+    def stats(self):
+        """返回控制器的运行统计
+
+        Returns:
+            dict: 当前并发上限、最高在途请求数、成功和限流次数
+        """
+        return {
+            "limit": round(self.limit, 2),
+            "peak_in_flight": self.peak_in_flight,
+            "successes": self.successes,
+            "throttles": self.throttles,
+        }
+
+
+class _Slot:
+    """slot()返回的名额对象，用于报告本次请求的结果"""
+
+    def __init__(self, limiter, window):
+        self.limiter = limiter
+        self.window = window
+
+    def success(self):
+        self.limiter.on_success()
+
+    def throttle(self, retry_after=None):
+        return self.limiter.on_throttle(self.window, retry_after)
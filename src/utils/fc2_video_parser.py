@@ -12,7 +12,9 @@ import requests
 from bs4 import BeautifulSoup
 
 from config import config
+from src.utils import article_cache
 from src.utils.logger import get_logger
+from src.utils.request_handler import RequestHandler
 
 # 获取日志记录器
 logger = get_logger("fc2_video_parser")
@@ -32,7 +34,7 @@ def get_writer_username_from_vid(vid, max_retries=None):
     # 使用配置的重试次数
     if max_retries is None:
         max_retries = config.max_retries
-    url = f"{config.fc2ppvdb_api_base}/articles/{vid}"
+    url = article_cache.article_url(vid)
 
     # 使用配置中的请求头
     headers = config.base_headers.copy()
@@ -41,7 +43,8 @@ def get_writer_username_from_vid(vid, max_retries=None):
     while retry_count < max_retries:
         try:
             logger.info(f"获取视频 {vid} 的作者信息...")
-            response = requests.get(url, headers=headers, timeout=config.timeout)
+            # 视频页面与Jellyfin元数据补充共用页面缓存
+            response = RequestHandler.get_article(vid, headers=headers, timeout=config.timeout)
 
             # 处理429错误
             if response.status_code == 429:
@@ -123,11 +126,6 @@ def get_writer_username_from_vid(vid, max_retries=None):
             except Exception as e:
                 logger.error(f"保存HTML源码失败: {e}")
 
-            # 等待一点时间避免频繁请求
-            wait_time = random.uniform(*config.request_interval)  # 使用配置的请求间隔范围
-            logger.debug(f"等待 {wait_time:.2f} 秒后继续...")
-            time.sleep(wait_time)
-
             return None
 
         except requests.exceptions.RequestException as e:
@@ -156,12 +154,7 @@ def get_writer_info(writerusername, request_counter, max_retries=None):
         max_retries = config.max_retries
     url = f"{config.fc2ppvdb_api_base}/writers/{writerusername}"
 
-    # 检查是否需要等待 - 每X次请求后的第一次(21,41,61...)
-    if request_counter % config.request_limit_count == 1 and request_counter > 1:
-        wait_time = (config.retry_base ** 2) + random.uniform(1, 3)  # 使用适当的等待时间
-        logger.info(f"达到请求限制点 ({request_counter})，等待 {wait_time:.2f} 秒以避免被封...")
-        time.sleep(wait_time)
-
+    # 请求频率由全局按主机限速器控制
     retry_count = 0
 
     # 使用配置中的请求头
@@ -170,7 +163,7 @@ def get_writer_info(writerusername, request_counter, max_retries=None):
     while retry_count < config.max_retries:
         try:
             # 发送HTTP请求获取页面内容
-            response = requests.get(url, headers=headers, timeout=config.timeout)
+            response = RequestHandler.conditional_get(url, headers=headers, timeout=config.timeout)
 
             # 如果是429错误，进行重试
             if response.status_code == 429:
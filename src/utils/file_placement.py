@@ -0,0 +1,114 @@
+"""
+文件放置模块 - 以硬链接、写时复制(reflink)、符号链接或复制的方式把文件放到目标位置
+
+生成Jellyfin元数据时封面图片来自图片目录，硬链接和reflink不占用额外的磁盘空间，
+也不需要读写图片内容。所选方式不可用时(如跨设备、文件系统不支持)自动改用下一种方式，
+最后总会退回到复制
+"""
+import errno
+import os
+import shutil
+import sys
+
+from src.utils.logger import get_logger
+
+logger = get_logger("file_placement")
+
+# 支持的放置方式
+STRATEGIES = ("hardlink", "reflink", "symlink", "copy")
+
+# 各放置方式不可用时依次尝试的方式
+_FALLBACKS = {
+    "hardlink": ("hardlink", "reflink", "copy"),
+    "reflink": ("reflink", "copy"),
+    "symlink": ("symlink", "copy"),
+    "copy": ("copy",),
+}
+
+# Linux的FICLONE ioctl请求码 (btrfs、XFS等支持写时复制的文件系统)
+_FICLONE = 0x40049409
+
+# 表示该方式在当前环境不可用的错误码，遇到这些错误时改用下一种方式
+_UNAVAILABLE_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EACCES,
+    errno.EMLINK,
+    errno.EINVAL,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.ENOSYS,
+}
+
+
+def _reflink(source, target):
+    """创建写时复制的副本，不支持的平台或文件系统抛出OSError"""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOTSUP, "当前平台不支持reflink")
+    import fcntl
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(target)
+            raise
+
+
+def _place(strategy, source, target):
+    """按指定方式放置单个文件"""
+    if strategy == "hardlink":
+        os.link(source, target)
+    elif strategy == "reflink":
+        _reflink(source, target)
+    elif strategy == "symlink":
+        os.symlink(os.path.abspath(source), target)
+    else:
+        shutil.copy(source, target)
+
+
+def _same_file(source, target):
+    """目标是否已是源文件的硬链接或指向源文件的符号链接"""
+    try:
+        return os.path.samefile(source, target)
+    except OSError:
+        return False
+
+
+def place_file(source, target, strategy="copy"):
+    """把源文件放到目标位置，目标已存在时替换
+
+    Args:
+        source: 源文件路径
+        target: 目标文件路径
+        strategy: 放置方式，hardlink、reflink、symlink或copy
+
+    Returns:
+        str: 实际使用的放置方式
+
+    Raises:
+        OSError: 所有方式都失败
+    """
+    if strategy not in _FALLBACKS:
+        logger.warning(f"未知的文件放置方式: {strategy}，改用copy")
+        strategy = "copy"
+
+    # 目标已是源文件的硬链接或指向源文件的符号链接时不重新放置；
+    # samefile会跟随符号链接，需按目标本身是否为符号链接区分两种方式
+    if strategy == "hardlink" and not os.path.islink(target) and _same_file(source, target):
+        return strategy
+    if strategy == "symlink" and os.path.islink(target) and _same_file(source, target):
+        return strategy
+
+    for candidate in _FALLBACKS[strategy]:
+        if os.path.lexists(target):
+            os.remove(target)
+        try:
+            _place(candidate, source, target)
+            return candidate
+        except OSError as e:
+            if candidate == "copy" or e.errno not in _UNAVAILABLE_ERRNOS:
+                raise
+            logger.debug(f"{candidate}不可用({e.strerror})，尝试下一种方式: {target}")
@@ -0,0 +1,93 @@
+"""
+HTTP条件请求模块 - 基于ETag/Last-Modified的响应缓存
+
+页面内容和服务器返回的ETag/Last-Modified一起保存在缓存数据库中，
+再次请求时带上If-None-Match/If-Modified-Since，服务器返回304时直接使用缓存的内容，
+定期重新扫描时不必重复下载未变化的页面
+"""
+from requests.models import PreparedRequest
+
+from config import config
+from src.utils.cache_manager import CacheManager
+from src.utils.logger import get_logger
+
+logger = get_logger("http_cache")
+
+
+def cache_key(url, params=None):
+    """生成缓存键：带查询参数的完整URL
+
+    Args:
+        url: 请求URL
+        params: 查询参数
+
+    Returns:
+        str: 缓存键
+    """
+    if not params:
+        return url
+    request = PreparedRequest()
+    request.prepare_url(url, params)
+    return request.url
+
+
+def lookup(key):
+    """读取缓存的响应，未启用条件请求时返回None"""
+    if not config.http_conditional_cache:
+        return None
+    try:
+        return CacheManager.get_store().get_http_response(key)
+    except Exception as e:
+        logger.error(f"读取HTTP响应缓存失败: {key} - {str(e)}")
+        return None
+
+
+def conditional_headers(entry, headers=None):
+    """在请求头中加入缓存响应的校验信息
+
+    Args:
+        entry: lookup返回的缓存响应，可以为None
+        headers: 原请求头
+
+    Returns:
+        dict: 新的请求头
+    """
+    headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def store(key, body, response_headers, encoding=None):
+    """保存状态码为200的响应，响应没有ETag和Last-Modified时不保存
+
+    Args:
+        key: 缓存键
+        body: 响应内容 (bytes)
+        response_headers: 响应头
+        encoding: 响应内容的编码
+    """
+    if not config.http_conditional_cache:
+        return
+    etag = response_headers.get("ETag")
+    last_modified = response_headers.get("Last-Modified")
+    if not etag and not last_modified:
+        return
+    try:
+        CacheManager.get_store().set_http_response(
+            key, body, etag=etag, last_modified=last_modified, encoding=encoding
+        )
+    except Exception as e:
+        logger.error(f"保存HTTP响应缓存失败: {key} - {str(e)}")
+
+
+def revalidated(key):
+    """服务器返回304时记录缓存命中"""
+    logger.debug(f"页面未变化，使用缓存内容: {key}")
+    try:
+        CacheManager.get_store().touch_http_response(key)
+    except Exception as e:
+        logger.error(f"更新HTTP响应缓存失败: {key} - {str(e)}")
@@ -6,26 +6,46 @@ Jellyfin元数据生成器 - 将FC2视频分析结果转换为Jellyfin兼容的
 """
 
 import os
-import shutil
 import xml.dom.minidom as minidom
 import xml.etree.ElementTree as ET
 import re
 import asyncio
-import aiohttp
 import time
-import random
+import threading
 from bs4 import BeautifulSoup
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from config import config, BASE_CACHE_DIR
+from src.utils import article_cache, http_cache
+from src.utils.async_http import AsyncHTTPClient
+from src.utils.cache_manager import CacheManager
+from src.utils.file_placement import place_file
+from src.utils.concurrency_limiter import AIMDLimiter
 from src.utils.logger import get_logger
+from src.utils.magnet_file_index import MagnetFileIndex
+from src.utils.nfo_manifest import NfoManifest, metadata_fingerprint
+from src.utils.report_builder import is_confirmed_unleaked
 from src.utils.i18n import get_text as _
 
 # 获取日志记录器
 logger = get_logger("jellyfin_metadata")
 
+# 图片索引收录的文件扩展名
+_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
 class JellyfinMetadataGenerator:
-    """将FC2视频信息转换为Jellyfin元数据格式"""
+    """将FC2视频信息转换为Jellyfin元数据格式
+
+    可以作为异步上下文管理器使用，在上下文内的所有页面请求共用一个HTTP会话
+    """
+
+    # 获取fc2ppvdb页面使用的请求头
+    PAGE_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+        "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+    }
     
     def __init__(self, output_dir=None):
         """初始化元数据生成器
@@ -44,8 +64,18 @@ class JellyfinMetadataGenerator:
         # 设置重试和退避机制参数
         self.max_retries = config.max_retries
         self.base_timeout = config.timeout
-        self.min_wait_time = 5.0  # 最小等待时间（秒）
-        self.max_wait_time = 6.0  # 最大等待时间（秒）- 确保批次间等待不超过6秒
+
+        # 页面请求的自适应并发控制，请求正常时增加在途请求数，受到限流时减半
+        self.concurrency = AIMDLimiter(
+            initial=config.jellyfin_initial_concurrency,
+            minimum=config.jellyfin_min_concurrency,
+            maximum=config.jellyfin_max_concurrency,
+            default_pause=config.jellyfin_throttle_pause,
+            max_pause=config.jellyfin_max_retry_after,
+        )
+
+        # 共享的HTTP会话 (AsyncHTTPClient)，batch_generate_metadata期间保持打开
+        self.client = None
         
         # 创建作者和女优子目录
         self.authors_dir = os.path.join(self.output_dir, "authors")
@@ -55,87 +85,136 @@ class JellyfinMetadataGenerator:
         
         # 429错误计数器
         self.rate_limit_count = 0
-        # 429错误阈值，超过此值将切换到单线程模式
-        self.rate_limit_threshold = 10
-        # 429错误阈值，超过此值将跳过网络请求
-        self.skip_network_threshold = 20
+        
+        # 各输出目录的NFO清单 (增量生成)，批量生成结束时保存
+        self._manifests = {}
+        
+        # 图片目录索引，首次查找图片时建立
+        self._image_paths = None
+        self._image_index_lock = threading.Lock()
+        
+        # 旧版磁链文件索引，首次查找磁链时建立
+        self.magnet_index = MagnetFileIndex([
+            (config.result_dir, lambda name: name.endswith(("_磁链.txt", "_magnet.txt"))),
+            (config.magnet_dir, lambda name: name.endswith(".txt")),
+        ])
+
+    async def __aenter__(self):
+        await self.open_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_session()
+
+    async def open_session(self):
+        """创建共享的HTTP会话，同一会话内的页面请求复用连接、DNS结果和TLS会话"""
+        if self.client is None:
+            client = AsyncHTTPClient(
+                per_host=config.jellyfin_connections_per_host,
+                timeout=self.base_timeout,
+                headers=self.PAGE_HEADERS,
+            )
+            await client.open()
+            self.client = client
+        return self.client
+
+    async def close_session(self):
+        """关闭共享的HTTP会话"""
+        if self.client is not None:
+            client, self.client = self.client, None
+            await client.close()
+
+    @asynccontextmanager
+    async def session(self):
+        """在上下文中使用共享会话，已有会话时直接复用，退出时只关闭本次创建的会话"""
+        if self.client is not None:
+            yield self.client
+            return
+        await self.open_session()
+        try:
+            yield self.client
+        finally:
+            await self.close_session()
+
+    async def fetch_page(self, url, video_id=None):
+        """获取页面HTML内容，带重试机制
 
-    async def fetch_page(self, url):
-        """获取页面HTML内容，带重试和退避机制
+        缓存中有该页面时发送条件请求，服务器返回304时直接使用缓存的内容；
+        传入video_id时使用按视频ID保存的页面缓存，有效期内不发送请求；
+        请求通过共享会话发送，没有打开的会话时临时创建一个。
+        每次请求占用一个并发名额，429/5xx和超时会减少并发上限并按Retry-After暂停
         
         Args:
             url: 网页URL
+            video_id: 视频页面对应的视频ID
             
         Returns:
             str: 页面HTML内容，失败返回None
         """
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-        }
-        
-        for attempt in range(1, self.max_retries + 1):
-            try:
-                timeout = self.base_timeout * (1 + (attempt - 1) * 0.5)  # 递增超时时间
-                
-                async with aiohttp.ClientSession(headers=headers) as session:
-                    async with session.get(url, timeout=timeout) as response:
-                        if response.status == 200:
-                            return await response.text()
-                        
-                        # 处理常见错误状态码
-                        if response.status == 429 or response.status >= 500:
-                            # 增加429错误计数
-                            if response.status == 429:
-                                self.rate_limit_count += 1
-                                
-                            # 计算等待时间并睡眠
-                            wait_time = self._calculate_wait_time(attempt)
-                            
-                            logger.warning(_("logger.rate_limit").format(
-                                status_code=response.status,
-                                wait_time=wait_time
-                            ))
-                            
-                            await asyncio.sleep(wait_time)
-                            continue
-                        
-                        logger.warning(_("jellyfin.page_fetch_failed").format(status_code=response.status, url=url))
-                        return None
-                        
-            except asyncio.TimeoutError:
-                wait_time = self._calculate_wait_time(attempt)
-                logger.warning(f"请求超时，等待 {wait_time:.2f} 秒后重试 ({attempt}/{self.max_retries})")
-                await asyncio.sleep(wait_time)
-                
-            except Exception as e:
-                wait_time = self._calculate_wait_time(attempt)
-                logger.error(f"获取页面异常: {str(e)}, URL: {url}")
-                logger.warning(f"等待 {wait_time:.2f} 秒后重试 ({attempt}/{self.max_retries})")
-                await asyncio.sleep(wait_time)
-                
+        if video_id is not None:
+            cached = article_cache.lookup(video_id)
+            if article_cache.is_fresh(cached):
+                logger.debug(f"使用缓存的视频页面: {video_id}")
+                return article_cache.text(cached)
+        else:
+            cached = http_cache.lookup(url)
+        headers = http_cache.conditional_headers(cached, self.PAGE_HEADERS)
+
+        async with self.session() as client:
+            for attempt in range(1, self.max_retries + 1):
+                async with self.concurrency.slot() as slot:
+                    try:
+                        timeout = self.base_timeout * (1 + (attempt - 1) * 0.5)  # 递增超时时间
+
+                        # 与其他模块共用fc2ppvdb.com的限速预算 (由客户端申请)
+                        response = await client.request("GET", url, headers=headers, timeout=timeout)
+
+                    except asyncio.TimeoutError:
+                        wait_time = slot.throttle()
+                        logger.warning(f"请求超时，等待 {wait_time:.2f} 秒后重试 ({attempt}/{self.max_retries})")
+                        continue
+
+                    except Exception as e:
+                        wait_time = slot.throttle()
+                        logger.error(f"获取页面异常: {str(e)}, URL: {url}")
+                        logger.warning(f"等待 {wait_time:.2f} 秒后重试 ({attempt}/{self.max_retries})")
+                        continue
+
+                    # 处理常见错误状态码
+                    if response.status_code == 429 or response.status_code >= 500:
+                        # 增加429错误计数
+                        if response.status_code == 429:
+                            self.rate_limit_count += 1
+
+                        wait_time = slot.throttle(response.headers.get("Retry-After"))
+                        logger.warning(_("logger.rate_limit").format(
+                            status_code=response.status_code,
+                            wait_time=wait_time
+                        ))
+                        continue
+
+                    slot.success()
+
+                if response.status_code == 304 and cached is not None:
+                    if video_id is not None:
+                        article_cache.revalidated(video_id)
+                    else:
+                        http_cache.revalidated(url)
+                    return cached["body"].decode(cached["encoding"] or "utf-8", errors="replace")
+
+                if response.status_code == 200:
+                    if video_id is not None:
+                        article_cache.store(video_id, response.content, response.headers, response.encoding)
+                    else:
+                        http_cache.store(url, response.content, response.headers, response.encoding)
+                    return response.text
+
+                logger.warning(_("jellyfin.page_fetch_failed").format(status_code=response.status_code, url=url))
+                return None
+
         logger.error(f"达到最大重试次数 ({self.max_retries})，获取页面失败: {url}")
         return None
 
-    def _calculate_wait_time(self, attempt):
-        """计算重试等待时间
-        
-        Args:
-            attempt: 当前尝试次数
-            
-        Returns:
-            float: 计算后的等待时间（秒）
-        """
-        # 使用指数退避
-        wait_time = min(self.max_wait_time, self.min_wait_time * (2 ** (attempt - 1)))
-        # 添加随机抖动以避免请求同步
-        wait_time = wait_time * (0.5 + random.random())
-        # 确保等待时间不超过最大值
-        wait_time = min(wait_time, self.max_wait_time)
-        
-        return wait_time
-
     def parse_html(self, html_content, fc2_id):
         """解析HTML内容提取视频信息
         
@@ -262,18 +341,13 @@ class JellyfinMetadataGenerator:
             video_info["magnets"] = magnets
             logger.info(f"从缓存中获取到视频 {video_id} 的磁链：{len(magnets)}个")
             
-        # 如果429错误次数超过阈值，跳过网络请求
-        if self.rate_limit_count >= self.skip_network_threshold:
-            logger.warning(f"429错误次数({self.rate_limit_count})超过阈值({self.skip_network_threshold})，跳过网络请求获取标签信息")
-            return video_info
-            
         logger.info(_("jellyfin.fetch_extra_info").format(video_id=video_id))
         
         # 构造FC2PPVDB URL
-        url = f"{self.fc2ppvdb_base_url}/{video_id}"
+        url = article_cache.article_url(video_id)
         
         # 获取页面内容
-        html_content = await self.fetch_page(url)
+        html_content = await self.fetch_page(url, video_id=video_id)
         if not html_content:
             logger.warning(_("jellyfin.fetch_failed").format(url=url))
             return video_info
@@ -296,7 +370,7 @@ class JellyfinMetadataGenerator:
         return enriched_info
         
     def _get_magnets_from_cache(self, video_id, video_info):
-        """从缓存文件中获取磁链信息
+        """从磁链缓存中获取磁链信息，缓存未命中时查找旧的磁链文件
         
         Args:
             video_id: 视频ID
@@ -311,122 +385,26 @@ class JellyfinMetadataGenerator:
             
         if video_info.get("magnet"):
             return [video_info.get("magnet")]
-            
-        # 尝试从results目录中查找磁链缓存文件
-        try:
-            # 检查是否有作者或女优信息
-            author_id = None
-            actress_id = None
-            
-            if "author_id" in video_info:
-                author_id = video_info["author_id"]
-            
-            if "actress_id" in video_info:
-                actress_id = video_info["actress_id"]
-                
-            # 查找可能的磁链文件路径模式
-            possible_paths = []
-            
-            # 添加基本模式
-            basic_paths = [
-                os.path.join(config.result_dir, f"*_{video_id}_磁链.txt"),
-                os.path.join(config.result_dir, f"*_{video_id}_magnet.txt"),
-                os.path.join(config.magnet_dir, f"{video_id}.txt"),
-                os.path.join(config.magnet_dir, f"FC2-PPV-{video_id}.txt")
-            ]
-            possible_paths.extend(basic_paths)
-            
-            # 添加作者/女优相关模式 - 包括各种可能的格式
-            if author_id:
-                author_patterns = [
-                    os.path.join(config.result_dir, f"author_{author_id}*_磁链.txt"),
-                    os.path.join(config.result_dir, f"author_{author_id}*_magnet.txt"),
-                    os.path.join(config.result_dir, f"{author_id}_*_磁链.txt"),
-                    os.path.join(config.result_dir, f"{author_id}_*_magnet.txt")
-                ]
-                possible_paths.extend(author_patterns)
-            
-            if actress_id:
-                actress_patterns = [
-                    os.path.join(config.result_dir, f"actress_{actress_id}*_磁链.txt"),
-                    os.path.join(config.result_dir, f"actress_{actress_id}*_magnet.txt"),
-                    os.path.join(config.result_dir, f"{actress_id}_*_磁链.txt"),
-                    os.path.join(config.result_dir, f"{actress_id}_*_magnet.txt")
-                ]
-                possible_paths.extend(actress_patterns)
-            
-            # 搜索匹配的文件
-            import glob
-            matched_files = []
-            for path_pattern in possible_paths:
-                matched_files.extend(glob.glob(path_pattern))
-            
-            # 如果没有找到匹配的文件，尝试直接在results目录下查找包含"磁链"的文件
-            if not matched_files:
-                all_magnet_files = glob.glob(os.path.join(config.result_dir, "*_磁链.txt"))
-                matched_files.extend(all_magnet_files)
-                
-                # 日志所有找到的磁链文件，帮助调试
-                if all_magnet_files:
-                    logger.info(f"找到的所有磁链文件: {all_magnet_files}")
-            
-            # 如果找到了匹配的文件
-            magnets = []
-            for file_path in matched_files:
-                try:
-                    logger.info(f"尝试从文件读取磁链: {file_path}")
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        lines = f.readlines()
-                        
-                    for i, line in enumerate(lines):
-                        line = line.strip()
-                        
-                        # 尝试各种格式匹配
-                        # 1. 以 "# {video_id} |" 开头的行
-                        if line.startswith(f"# {video_id} |") or line.startswith(f"#{video_id} |"):
-                            # 下一行应该是磁链
-                            if i + 1 < len(lines) and lines[i + 1].strip().startswith("magnet:?"):
-                                magnet = lines[i + 1].strip()
-                                magnets.append(magnet)
-                                logger.info(f"从文件 {file_path} 中找到视频 {video_id} 的磁链 (格式1)")
-                                break
-                        
-                        # 2. 直接是以 "magnet:?" 开头的行，且文件名中包含视频ID
-                        elif line.startswith("magnet:?") and f"{video_id}" in file_path:
-                            magnets.append(line)
-                            logger.info(f"从文件 {file_path} 中找到视频的磁链 (格式2)")
-                        
-                        # 3. 任意包含视频ID的行之后的磁链
-                        elif video_id in line and i + 1 < len(lines) and lines[i + 1].strip().startswith("magnet:?"):
-                            magnet = lines[i + 1].strip()
-                            magnets.append(magnet)
-                            logger.info(f"从文件 {file_path} 中找到视频 {video_id} 的磁链 (格式3)")
-                            break
-                            
-                    # 如果上面的匹配都失败了，再尝试遍历所有行找磁链
-                    if not magnets:
-                        # 读取整个文件内容
-                        content = "".join(lines)
-                        # 尝试找出视频ID后面的磁链
-                        video_id_pattern = re.compile(f"#{video_id}.*?\\n(magnet:\\?.*?)\\n", re.DOTALL)
-                        matches = video_id_pattern.findall(content)
-                        if matches:
-                            for match in matches:
-                                magnets.append(match.strip())
-                                logger.info(f"从文件 {file_path} 中找到视频 {video_id} 的磁链 (正则匹配)")
-                except Exception as e:
-                    logger.error(f"读取磁链缓存文件 {file_path} 出错: {str(e)}")
-                    
-            # 检查是否找到了磁链
-            if magnets:
-                logger.info(f"成功为视频 {video_id} 找到 {len(magnets)} 个磁链")
-            else:
-                logger.warning(f"未找到视频 {video_id} 的磁链")
-                
+
+        # 优先查询分析时写入的磁链缓存，空列表表示近期已确认没有磁链
+        magnets = CacheManager.shared().get_magnets(video_id)
+        if magnets is not None:
             return magnets
+
+        # 缓存中没有记录时，从旧版本生成的磁链文件索引中查找
+        try:
+            magnets = self.magnet_index.lookup(video_id)
         except Exception as e:
             logger.error(f"搜索磁链缓存文件时出错: {str(e)}")
             return []
+            
+        # 检查是否找到了磁链
+        if magnets:
+            logger.info(f"成功为视频 {video_id} 找到 {len(magnets)} 个磁链")
+        else:
+            logger.warning(f"未找到视频 {video_id} 的磁链")
+            
+        return magnets
 
     def is_leaked(self, video_info):
         """判断视频是否已泄露
@@ -484,6 +462,22 @@ class JellyfinMetadataGenerator:
             if magnets:
                 video_info["magnets"] = magnets
                 
+        # 确定输出目录
+        output_dir = self._output_dir(author_info, actress_info)
+        
+        # 定义输出文件名，简化为只用视频ID
+        output_filename = f"FC2-PPV-{video_id}"
+        nfo_path = os.path.join(output_dir, f"{output_filename}.nfo")
+        
+        # 增量模式：输入与上次生成时相同且文件都还在时直接跳过
+        manifest = None
+        if config.jellyfin_incremental:
+            manifest = self._manifest(output_dir)
+            fingerprint = metadata_fingerprint(video_info, author_info, actress_info, image_path)
+            if manifest.is_current(video_id, fingerprint):
+                logger.debug(f"视频 {video_id} 的元数据未变化，跳过生成")
+                return self._unchanged_result(video_id, manifest.files(video_id), nfo_path)
+                
         # 创建XML根元素
         root = ET.Element("movie")
         
@@ -652,48 +646,7 @@ class JellyfinMetadataGenerator:
         # 保存为美观格式的XML
         xml_str = minidom.parseString(ET.tostring(root, encoding='unicode')).toprettyxml(indent="  ")
         
-        # 确定输出目录
-        output_dir = self.output_dir  # 默认目录
-        
-        # 如果有作者信息，创建作者子目录
-        if author_info and "id" in author_info and not actress_info:
-            author_id = author_info["id"]
-            author_name = author_info.get("name", "")
-            
-            # 清理作者名称以用于路径
-            author_name_clean = self._clean_filename(author_name)
-            
-            # 创建作者子目录 (格式: 作者名_id)
-            author_subdir = f"{author_name_clean}_{author_id}" if author_name_clean else f"author_{author_id}"
-            author_dir = os.path.join(self.authors_dir, author_subdir)
-            os.makedirs(author_dir, exist_ok=True)
-            
-            # 使用作者子目录作为输出目录
-            output_dir = author_dir
-            logger.info(_("jellyfin.using_author_dir").format(dir=author_dir))
-            
-        # 如果有女优信息，创建女优子目录
-        elif actress_info and "id" in actress_info:
-            actress_id = actress_info["id"]
-            actress_name = actress_info.get("name", "")
-            
-            # 清理女优名称以用于路径
-            actress_name_clean = self._clean_filename(actress_name)
-            
-            # 创建女优子目录 (格式: 女优名_id)
-            actress_subdir = f"{actress_name_clean}_{actress_id}" if actress_name_clean else f"actress_{actress_id}"
-            actress_dir = os.path.join(self.actresses_dir, actress_subdir)
-            os.makedirs(actress_dir, exist_ok=True)
-            
-            # 使用女优子目录作为输出目录
-            output_dir = actress_dir
-            logger.info(_("jellyfin.using_actress_dir").format(dir=actress_dir))
-        
-        # 定义输出文件名，简化为只用视频ID
-        output_filename = f"FC2-PPV-{video_id}"
-        
         # 保存NFO文件
-        nfo_path = os.path.join(output_dir, f"{output_filename}.nfo")
         try:
             with open(nfo_path, "w", encoding="utf-8") as f:
                 f.write(xml_str)
@@ -714,8 +667,9 @@ class JellyfinMetadataGenerator:
                 # 设置目标路径，使用Jellyfin标准的-poster后缀
                 poster_path = os.path.join(output_dir, f"{output_filename}-poster{image_ext}")
                 
-                # 复制图片
-                shutil.copy(image_path, poster_path)
+                # 按配置的方式放置图片 (硬链接/reflink/符号链接/复制)，不可用时自动改用下一种方式
+                placed_by = place_file(image_path, poster_path, config.jellyfin_poster_strategy)
+                logger.debug(f"封面放置方式: {placed_by}")
                 logger.info(_("jellyfin.copy_poster_success").format(path=poster_path))
             except Exception as e:
                 logger.error(_("jellyfin.copy_poster_failed").format(error=str(e)))
@@ -731,6 +685,9 @@ class JellyfinMetadataGenerator:
         except Exception as e:
             logger.error(_("jellyfin.create_placeholder_failed").format(error=str(e)))
             mp4_path = None
+        
+        if manifest is not None:
+            manifest.record(video_id, fingerprint, [nfo_path, poster_path, mp4_path])
                 
         return {
             "nfo_path": nfo_path,
@@ -739,9 +696,89 @@ class JellyfinMetadataGenerator:
             "video_id": video_id
         }
     
+    def _output_dir(self, author_info=None, actress_info=None):
+        """确定元数据输出目录，有作者或女优信息时使用对应的子目录
+        
+        Args:
+            author_info: 作者信息字典
+            actress_info: 女优信息字典
+            
+        Returns:
+            str: 输出目录路径
+        """
+        output_dir = self.output_dir  # 默认目录
+        
+        # 如果有作者信息，创建作者子目录
+        if author_info and "id" in author_info and not actress_info:
+            author_id = author_info["id"]
+            author_name = author_info.get("name", "")
+            
+            # 清理作者名称以用于路径
+            author_name_clean = self._clean_filename(author_name)
+            
+            # 创建作者子目录 (格式: 作者名_id)
+            author_subdir = f"{author_name_clean}_{author_id}" if author_name_clean else f"author_{author_id}"
+            author_dir = os.path.join(self.authors_dir, author_subdir)
+            os.makedirs(author_dir, exist_ok=True)
+            
+            # 使用作者子目录作为输出目录
+            output_dir = author_dir
+            logger.info(_("jellyfin.using_author_dir").format(dir=author_dir))
+            
+        # 如果有女优信息，创建女优子目录
+        elif actress_info and "id" in actress_info:
+            actress_id = actress_info["id"]
+            actress_name = actress_info.get("name", "")
+            
+            # 清理女优名称以用于路径
+            actress_name_clean = self._clean_filename(actress_name)
+            
+            # 创建女优子目录 (格式: 女优名_id)
+            actress_subdir = f"{actress_name_clean}_{actress_id}" if actress_name_clean else f"actress_{actress_id}"
+            actress_dir = os.path.join(self.actresses_dir, actress_subdir)
+            os.makedirs(actress_dir, exist_ok=True)
+            
+            # 使用女优子目录作为输出目录
+            output_dir = actress_dir
+            logger.info(_("jellyfin.using_actress_dir").format(dir=actress_dir))
+        
+        return output_dir
+    
+    def _manifest(self, output_dir):
+        """获取输出目录的NFO清单，同一目录只读取一次"""
+        manifest = self._manifests.get(output_dir)
+        if manifest is None:
+            manifest = NfoManifest(output_dir)
+            self._manifests[output_dir] = manifest
+        return manifest
+    
+    def save_manifests(self):
+        """保存所有输出目录中有变化的NFO清单"""
+        for manifest in self._manifests.values():
+            try:
+                manifest.save()
+            except Exception as e:
+                logger.error(f"保存NFO清单失败: {manifest.path} - {str(e)}")
+    
+    @staticmethod
+    def _unchanged_result(video_id, paths, nfo_path):
+        """构造跳过生成时的返回结果，文件路径来自清单"""
+        poster_path = next((path for path in paths if "-poster" in os.path.basename(path)), None)
+        mp4_path = next((path for path in paths if path.endswith(".mp4")), None)
+        return {
+            "nfo_path": nfo_path,
+            "poster_path": poster_path,
+            "mp4_path": mp4_path,
+            "video_id": video_id,
+            "unchanged": True,
+        }
+    
     def find_image_path(self, video_id, video_info, author_info=None, actress_info=None):
         """查找视频的图片路径
         
+        先查询分析时记录的图片路径，再查询图片目录索引；
+        同一视频有多张图片时，优先使用img根目录下的图片，其次是当前作者/女优目录下的图片
+        
         Args:
             video_id: 视频ID
             video_info: 视频信息字典
@@ -751,49 +788,26 @@ class JellyfinMetadataGenerator:
         Returns:
             str: 图片路径，如果找不到则返回None
         """
-        # 尝试不同的图片路径模式
-        possible_paths = []
+        video_id = str(video_id)
         
-        # 1. 直接在img目录下查找
-        possible_paths.extend([
-            os.path.join(config.image_dir, f"{video_id}.jpg"),
-            os.path.join(config.image_dir, f"FC2-PPV-{video_id}.jpg")
-        ])
+        # 1. 分析时下载图片记录的路径
+        recorded_path = CacheManager.get_store().get_thumbnail(video_id)
+        if recorded_path and os.path.exists(recorded_path):
+            logger.info(_("jellyfin.found_image").format(video_id=video_id, path=recorded_path))
+            return recorded_path
         
-        # 2. 作者目录下查找
+        # 2. 图片目录索引
+        entity_prefixes = []
         if author_info and "id" in author_info:
-            self._add_entity_image_paths(
-                possible_paths, 
-                video_id, 
-                "author", 
-                author_info["id"], 
-                author_info.get("name", "")
-            )
-        
-        # 3. 女优目录下查找
+            entity_prefixes.append(f"author_{author_info['id']}")
         if actress_info and "id" in actress_info:
-            self._add_entity_image_paths(
-                possible_paths, 
-                video_id, 
-                "actress", 
-                actress_info["id"], 
-                actress_info.get("name", "")
-            )
-            
-            # 特殊形式: actress_{id}_Actress_{id}
-            actress_id = actress_info["id"]
-            actress_dir_special = os.path.join(config.image_dir, f"actress_{actress_id}_Actress_{actress_id}")
-            possible_paths.extend([
-                os.path.join(actress_dir_special, f"{video_id}.jpg"),
-                os.path.join(actress_dir_special, "leaked", f"{video_id}.jpg"),
-                os.path.join(actress_dir_special, "unleaked", f"{video_id}.jpg")
-            ])
-        
-        # 4. 尝试在data/img下查找任何可能包含该视频ID的图片
-        self._add_recursive_image_paths(possible_paths, video_id)
-        
-        # 检查所有可能的路径
-        for path in possible_paths:
+            entity_prefixes.append(f"actress_{actress_info['id']}")
+        
+        candidates = sorted(
+            self._image_index().get(video_id, []),
+            key=lambda path: self._image_path_rank(path, entity_prefixes),
+        )
+        for path in candidates:
             if os.path.exists(path):
                 logger.info(_("jellyfin.found_image").format(video_id=video_id, path=path))
                 return path
@@ -802,68 +816,65 @@ class JellyfinMetadataGenerator:
         logger.warning(f"未找到视频 FC2-PPV-{video_id} 的图片")
         return None
     
-    def _add_entity_image_paths(self, possible_paths, video_id, entity_type, entity_id, entity_name):
-        """添加实体相关的图片路径
+    def _image_index(self):
+        """获取图片目录索引，首次调用时遍历一次图片目录
         
-        Args:
-            possible_paths: 路径列表，将直接修改
-            video_id: 视频ID
-            entity_type: 实体类型，如"author"或"actress"
-            entity_id: 实体ID
-            entity_name: 实体名称
+        Returns:
+            dict: {视频ID: [图片路径]}
         """
-        if entity_name:
-            # 清理名称以用于路径
-            clean_name = self._clean_filename(entity_name)
-            
-            # 形如: {entity_type}_{id}_{name}
-            entity_dir = os.path.join(config.image_dir, f"{entity_type}_{entity_id}_{clean_name}")
-            possible_paths.extend([
-                os.path.join(entity_dir, f"{video_id}.jpg"),
-                os.path.join(entity_dir, "leaked", f"{video_id}.jpg"),
-                os.path.join(entity_dir, "unleaked", f"{video_id}.jpg")
-            ])
-        else:
-            # 只有ID的情况
-            entity_dir = os.path.join(config.image_dir, f"{entity_type}_{entity_id}")
-            possible_paths.extend([
-                os.path.join(entity_dir, f"{video_id}.jpg"),
-                os.path.join(entity_dir, "leaked", f"{video_id}.jpg"),
-                os.path.join(entity_dir, "unleaked", f"{video_id}.jpg")
-            ])
-            
-        # 尝试通配符匹配
-        try:
-            import glob
-            entity_dir_pattern = os.path.join(config.image_dir, f"{entity_type}_{entity_id}_*")
-            matched_dirs = glob.glob(entity_dir_pattern)
-            for matched_dir in matched_dirs:
-                if os.path.isdir(matched_dir):
-                    # 添加各种可能的路径
-                    possible_paths.extend([
-                        os.path.join(matched_dir, f"{video_id}.jpg"),
-                        os.path.join(matched_dir, "leaked", f"{video_id}.jpg"),
-                        os.path.join(matched_dir, "unleaked", f"{video_id}.jpg")
-                    ])
-        except Exception as e:
-            logger.error(f"搜索{entity_type}目录模式时出错: {str(e)}")
-            
-    def _add_recursive_image_paths(self, possible_paths, video_id):
-        """递归查找图片路径
+        if self._image_paths is None:
+            with self._image_index_lock:
+                if self._image_paths is None:
+                    self._image_paths = self._build_image_index(config.image_dir)
+        return self._image_paths
+    
+    @staticmethod
+    def _build_image_index(image_dir):
+        """使用os.scandir遍历图片目录，建立视频ID到图片路径的索引
+        
+        文件名支持[视频ID].jpg和FC2-PPV-[视频ID].jpg两种形式
         
         Args:
-            possible_paths: 路径列表，将直接修改
-            video_id: 视频ID
+            image_dir: 图片根目录
+            
+        Returns:
+            dict: {视频ID: [图片路径]}
         """
-        try:
-            import glob
-            video_pattern = os.path.join(config.image_dir, "**", f"{video_id}.jpg")
-            matched_files = glob.glob(video_pattern, recursive=True)
-            for matched_file in matched_files:
-                if os.path.isfile(matched_file):
-                    possible_paths.append(matched_file)
-        except Exception as e:
-            logger.error(f"递归搜索图片文件时出错: {str(e)}")
+        index = {}
+        pending_dirs = [image_dir]
+        while pending_dirs:
+            current = pending_dirs.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                            continue
+                        stem, ext = os.path.splitext(entry.name)
+                        if ext.lower() not in _IMAGE_EXTENSIONS:
+                            continue
+                        if stem.upper().startswith("FC2-PPV-"):
+                            stem = stem[len("FC2-PPV-"):]
+                        if stem.isdigit():
+                            index.setdefault(stem, []).append(entry.path)
+            except OSError as e:
+                logger.error(f"扫描图片目录时出错: {current} - {str(e)}")
+        logger.info(f"图片目录索引完成: {len(index)} 个视频")
+        return index
+    
+    @staticmethod
+    def _image_path_rank(path, entity_prefixes):
+        """图片路径的优先级，数值越小越优先"""
+        relative = os.path.relpath(path, config.image_dir)
+        parts = relative.split(os.sep)
+        not_jpg = not path.lower().endswith(".jpg")
+        if len(parts) == 1:
+            return (0, not_jpg, relative)
+        top_dir = parts[0]
+        for prefix in entity_prefixes:
+            if top_dir == prefix or top_dir.startswith(prefix + "_"):
+                return (1, not_jpg, relative)
+        return (2, not_jpg, relative)
             
     def _clean_filename(self, name):
         """清理文件名，移除不允许的字符
@@ -891,7 +902,33 @@ class JellyfinMetadataGenerator:
             
         return name 
 
-    async def batch_generate_metadata(self, videos_info, author_info=None, actress_info=None, enrich_from_web=True):
+    def remove_unleaked_metadata(self, unleaked_ids, author_info=None, actress_info=None):
+        """增量生成时删除确认未流出的视频之前生成的元数据，并保存清单
+
+        检查出错、状态未知或不在本次列表中的视频不在unleaked_ids中，其元数据保留
+
+        Args:
+            unleaked_ids: 最近一次流出检查确认未流出的视频ID
+            author_info: 作者信息字典
+            actress_info: 女优信息字典
+
+        Returns:
+            list: 被删除元数据的视频ID
+        """
+        removed = []
+        if unleaked_ids and config.jellyfin_incremental and config.jellyfin_prune_stale and (
+            (author_info and "id" in author_info) or (actress_info and "id" in actress_info)
+        ):
+            manifest = self._manifest(self._output_dir(author_info, actress_info))
+            removed = manifest.remove(unleaked_ids)
+            if removed:
+                logger.info(f"已删除 {len(removed)} 个未流出视频的元数据: {manifest.directory}")
+        self.save_manifests()
+        return removed
+
+    async def batch_generate_metadata(
+        self, videos_info, author_info=None, actress_info=None, enrich_from_web=True, unleaked_ids=None
+    ):
         """批量生成多个视频的元数据
         
         Args:
@@ -899,20 +936,30 @@ class JellyfinMetadataGenerator:
             author_info: 作者信息字典
             actress_info: 女优信息字典
             enrich_from_web: 是否从网络获取额外信息
+            unleaked_ids: 最近一次流出检查确认未流出的视频ID，增量生成时删除这些视频的元数据；
+                None时从videos_info中按流出检查的原始结果(leak_check)找出
                 
         Returns:
             list: 生成的元数据文件信息列表
         """
+        if unleaked_ids is None:
+            unleaked_ids = [
+                video.get("video_id") for video in videos_info or []
+                if is_confirmed_unleaked(video)
+            ]
+
         if not videos_info:
             logger.warning("没有视频信息可用于生成元数据")
+            self.remove_unleaked_metadata(unleaked_ids, author_info, actress_info)
             return []
         
         # 过滤出已流出的视频
         leaked_videos = [video for video in videos_info if self.is_leaked(video)]
         
-        # 如果没有已流出的视频，直接返回
+        # 如果没有已流出的视频，只删除确认未流出的视频的元数据
         if not leaked_videos:
             logger.info(_("jellyfin.no_leaked_videos"))
+            self.remove_unleaked_metadata(unleaked_ids, author_info, actress_info)
             return []
             
         logger.info(_("jellyfin.start_batch").format(count=len(leaked_videos)))
@@ -921,42 +968,41 @@ class JellyfinMetadataGenerator:
         self._log_entity_info(author_info, actress_info)
         
         # 初始化处理状态
-        results = []
         self.rate_limit_count = 0
-        use_single_thread = False
-        skip_network_requests = False
-        
-        # 每批次处理的视频数量
-        batch_size = 5
-        total_batches = (len(leaked_videos) + batch_size - 1) // batch_size
-        
-        for batch_idx in range(total_batches):
-            # 获取当前批次的视频
-            start_idx = batch_idx * batch_size
-            end_idx = min(start_idx + batch_size, len(leaked_videos))
-            batch_videos = leaked_videos[start_idx:end_idx]
-            
-            logger.info(f"处理第 {batch_idx+1}/{total_batches} 批视频 ({len(batch_videos)}个)")
-            
-            # 检查是否需要更新处理模式
-            use_single_thread, skip_network_requests, enrich_from_web = self._check_processing_mode(
-                use_single_thread, skip_network_requests, enrich_from_web
-            )
-            
-            # 处理当前批次视频
-            batch_results = await self._process_batch(
-                batch_videos, author_info, actress_info, 
-                enrich_from_web, use_single_thread
+        
+        # 所有视频同时开始处理，页面请求的在途数量由并发控制器根据服务器响应调整
+        tasks = []
+        for video_info in leaked_videos:
+            video_id = video_info.get("video_id")
+            if not video_id:
+                logger.warning("跳过无效的视频信息(缺少video_id)")
+                continue
+                
+            # 查找对应的图片路径
+            image_path = self.find_image_path(video_id, video_info, author_info, actress_info)
+            tasks.append(self.generate_metadata(video_info, image_path, author_info, actress_info, enrich_from_web))
+        
+        # 整个批量处理期间共用一个HTTP会话
+        async with self.session():
+            batch_results = await asyncio.gather(*tasks)
+        results = [result for result in batch_results if result]
+        
+        self.remove_unleaked_metadata(unleaked_ids, author_info, actress_info)
+        
+        unchanged = sum(1 for result in results if result.get("unchanged"))
+        if unchanged:
+            logger.info(f"{unchanged} 个视频的元数据未变化，已跳过生成")
+        
+        if enrich_from_web:
+            stats = self.concurrency.stats()
+            logger.info(
+                f"页面请求并发: 当前上限 {stats['limit']}, 最高在途 {stats['peak_in_flight']}, "
+                f"限流 {stats['throttles']} 次 (其中429错误 {self.rate_limit_count} 次)"
             )
-            results.extend(batch_results)
-            
-            # 处理批次间等待
-            if batch_idx < total_batches - 1:
-                await self._handle_batch_wait(use_single_thread, skip_network_requests)
                 
         logger.info(_("jellyfin.generate_complete").format(count=len(results)))
         return results
-        
+
     def _log_entity_info(self, author_info, actress_info):
         """记录实体信息日志
         
@@ -968,118 +1014,3 @@ class JellyfinMetadataGenerator:
             logger.info(f"处理作者ID: {author_info['id']}, 名称: {author_info.get('name', '未知')}")
         elif actress_info and "id" in actress_info:
             logger.info(f"处理女优ID: {actress_info['id']}, 名称: {actress_info.get('name', '未知')}")
-    
-    def _check_processing_mode(self, use_single_thread, skip_network_requests, enrich_from_web):
-        """检查并更新处理模式
-        
-        Args:
-            use_single_thread: 当前是否使用单线程模式
-            skip_network_requests: 当前是否跳过网络请求
-            enrich_from_web: 当前是否从网络获取额外信息
-            
-        Returns:
-            tuple: 更新后的(use_single_thread, skip_network_requests, enrich_from_web)
-        """
-        # 检查是否需要切换到单线程模式
-        if self.rate_limit_count >= self.rate_limit_threshold and not use_single_thread:
-            logger.warning(f"429错误次数达到阈值({self.rate_limit_count}/{self.rate_limit_threshold})，切换到单线程模式")
-            use_single_thread = True
-        
-        # 检查是否需要跳过网络请求
-        if self.rate_limit_count >= self.skip_network_threshold and not skip_network_requests:
-            logger.warning(f"429错误次数达到阈值({self.rate_limit_count}/{self.skip_network_threshold})，跳过网络请求获取标签信息")
-            skip_network_requests = True
-            # 如果跳过网络请求，则不需要从网络获取额外信息
-            enrich_from_web = False
-            
-        return use_single_thread, skip_network_requests, enrich_from_web
-        
-    async def _process_batch(self, batch_videos, author_info, actress_info, enrich_from_web, use_single_thread):
-        """处理一批视频
-        
-        Args:
-            batch_videos: 视频信息列表
-            author_info: 作者信息字典
-            actress_info: 女优信息字典
-            enrich_from_web: 是否从网络获取额外信息
-            use_single_thread: 是否使用单线程模式
-            
-        Returns:
-            list: 有效的处理结果列表
-        """
-        results = []
-        
-        if use_single_thread:
-            # 单线程模式：逐个处理视频
-            for video_info in batch_videos:
-                video_id = video_info.get("video_id")
-                if not video_id:
-                    logger.warning("跳过无效的视频信息(缺少video_id)")
-                    continue
-                    
-                # 查找对应的图片路径
-                image_path = self.find_image_path(video_id, video_info, author_info, actress_info)
-                
-                # 创建生成元数据的任务
-                result = await self.generate_metadata(video_info, image_path, author_info, actress_info, enrich_from_web)
-                if result:
-                    results.append(result)
-                
-                # 如果已经跳过网络请求，则不需要等待
-                if self.rate_limit_count >= self.skip_network_threshold:
-                    # 直接处理下一个，不等待
-                    continue
-                else:
-                    # 单线程模式下，每个请求之间添加等待时间
-                    wait_time = 2.0  # 固定为2秒
-                    logger.info(f"单线程模式：等待 {wait_time} 秒后处理下一个视频...")
-                    await asyncio.sleep(wait_time)
-        else:
-            # 多线程模式：批量处理视频
-            tasks = []
-            for video_info in batch_videos:
-                video_id = video_info.get("video_id")
-                if not video_id:
-                    logger.warning("跳过无效的视频信息(缺少video_id)")
-                    continue
-                    
-                # 查找对应的图片路径
-                image_path = self.find_image_path(video_id, video_info, author_info, actress_info)
-                
-                # 创建生成元数据的任务
-                task = self.generate_metadata(video_info, image_path, author_info, actress_info, enrich_from_web)
-                tasks.append(task)
-            
-            if tasks:
-                # 等待本批次任务完成
-                batch_results = await asyncio.gather(*tasks)
-                
-                # 过滤掉None结果
-                valid_results = [result for result in batch_results if result]
-                results.extend(valid_results)
-                
-        return results
-        
-    async def _handle_batch_wait(self, use_single_thread, skip_network_requests):
-        """处理批次间等待
-        
-        Args:
-            use_single_thread: 是否使用单线程模式
-            skip_network_requests: 是否跳过网络请求
-        """
-        # 如果已经跳过网络请求了，则不需要等待
-        if skip_network_requests:
-            # 直接进行下一批处理，不等待
-            logger.info(f"跳过网络请求模式：直接处理下一批视频...(当前429错误计数: {self.rate_limit_count})")
-            return
-            
-        # 根据情况确定等待时间
-        if self.rate_limit_count > 5:
-            wait_time = 6.0  # 固定为6秒
-        elif use_single_thread:
-            wait_time = 1.0  # 单线程模式下批次间等待1秒
-        else:
-            wait_time = self.min_wait_time
-            
-        logger.info(f"等待 {wait_time} 秒后处理下一批...(当前429错误计数: {self.rate_limit_count})")
-        await asyncio.sleep(wait_time) 
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+磁链文件索引模块 - 旧版磁链文本文件的内存索引
+
+一次性解析results和magnets目录下的磁链文本文件，建立视频ID到磁链的索引，
+逐个视频查询时只做字典查找。文件按修改时间和大小判断是否变化，
+刷新索引时只重新解析新增或修改过的文件
+"""
+import os
+import re
+import threading
+import time
+
+from src.utils.logger import get_logger
+
+logger = get_logger("magnet_file_index")
+
+# 磁链前一行中的视频ID
+_VIDEO_ID_PATTERN = re.compile(r"\d{5,}")
+
+
+class MagnetFileIndex:
+    """磁链文本文件索引
+
+    支持两种文件内容:
+        1. 视频ID所在行的下一行是磁链 (如 "# 1234567 | 标题" 后跟磁链)
+        2. 只有磁链的文件，文件名中包含视频ID
+    """
+
+    def __init__(self, sources, refresh_interval=60):
+        """初始化索引
+
+        Args:
+            sources: [(目录, 文件名判断函数)]，判断函数接收文件名并返回是否收录
+            refresh_interval: 两次检查文件变化的最短间隔(秒)
+        """
+        self.sources = list(sources)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._files = {}  # {文件路径: (签名, 按ID的磁链, 文件名中的ID, 文件中的全部磁链)}
+        self._by_id = {}
+        self._by_filename = {}
+        self._checked_at = None
+
+    def lookup(self, video_id):
+        """查询视频的磁链
+
+        Args:
+            video_id: 视频ID
+
+        Returns:
+            list: 磁链列表，未找到时返回空列表
+        """
+        video_id = str(video_id)
+        with self._lock:
+            if (
+                self._checked_at is None
+                or time.monotonic() - self._checked_at > self.refresh_interval
+            ):
+                self._refresh()
+            magnets = self._by_id.get(video_id) or self._by_filename.get(video_id) or []
+            return list(magnets)
+
+    def invalidate(self):
+        """下次查询时重新检查文件变化"""
+        with self._lock:
+            self._checked_at = None
+
+    def _scan(self):
+        """列出所有需要收录的文件及其签名
+
+        Returns:
+            dict: {文件路径: (修改时间, 文件大小)}
+        """
+        files = {}
+        for directory, accept in self.sources:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_file() and accept(entry.name):
+                            stat = entry.stat()
+                            files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f"扫描磁链文件目录时出错: {directory} - {str(e)}")
+        return files
+
+    def _refresh(self):
+        """重新解析变化过的文件并重建索引，需在锁内调用"""
+        current = self._scan()
+        changed = False
+
+        for path in list(self._files):
+            if path not in current:
+                del self._files[path]
+                changed = True
+
+        for path, signature in current.items():
+            cached = self._files.get(path)
+            if cached is not None and cached[0] == signature:
+                continue
+            parsed = self._parse_file(path)
+            if parsed is not None:
+                self._files[path] = (signature,) + parsed
+                changed = True
+
+        if changed:
+            self._rebuild()
+        self._checked_at = time.monotonic()
+
+    def _parse_file(self, path):
+        """解析单个磁链文件
+
+        Returns:
+            tuple: ({视频ID: [磁链]}, 文件名中的视频ID集合, 文件中的全部磁链)，读取失败返回None
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = [line.strip() for line in f]
+        except Exception as e:
+            logger.error(f"读取磁链缓存文件 {path} 出错: {str(e)}")
+            return None
+
+        by_id = {}
+        all_magnets = []
+        for i, line in enumerate(lines):
+            if not line.startswith("magnet:?"):
+                continue
+            all_magnets.append(line)
+            previous = lines[i - 1] if i > 0 else ""
+            if previous.startswith("magnet:?"):
+                continue
+            for video_id in _VIDEO_ID_PATTERN.findall(previous):
+                by_id.setdefault(video_id, []).append(line)
+
+        filename_ids = set(_VIDEO_ID_PATTERN.findall(os.path.basename(path)))
+        return by_id, filename_ids, all_magnets
+
+    def _rebuild(self):
+        """由各文件的解析结果重建索引，需在锁内调用"""
+        by_id = {}
+        by_filename = {}
+        for path in sorted(self._files):
+            _, file_by_id, filename_ids, all_magnets = self._files[path]
+            for video_id, magnets in file_by_id.items():
+                self._extend_unique(by_id.setdefault(video_id, []), magnets)
+            for video_id in filename_ids:
+                self._extend_unique(by_filename.setdefault(video_id, []), all_magnets)
+        self._by_id = by_id
+        self._by_filename = by_filename
+        logger.info(
+            f"磁链文件索引已更新: {len(self._files)} 个文件, {len(by_id)} 个视频"
+        )
+
+    @staticmethod
+    def _extend_unique(target, magnets):
+        """追加磁链并去除重复项"""
+        for magnet in magnets:
+            if magnet not in target:
+                target.append(magnet)
@@ -0,0 +1,189 @@
+"""
+NFO清单模块 - 记录每个视频元数据输入的指纹，用于增量生成Jellyfin元数据
+
+每个输出目录下保存一个清单文件，记录视频ID、生成时的输入指纹和生成的文件名。
+再次生成时指纹相同且文件都还在的视频直接跳过，不重新生成NFO和复制封面；
+最近一次检查确认未流出的视频，删除其生成的文件
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from config import config
+from src.utils.i18n import get_current_language
+from src.utils.logger import get_logger
+
+logger = get_logger("nfo_manifest")
+
+# 清单文件名
+MANIFEST_NAME = ".fc2_nfo_manifest.json"
+
+# NFO内容格式版本，生成逻辑变化时递增，使已有的指纹全部失效
+NFO_FORMAT_VERSION = 1
+
+# generate_metadata写入NFO时用到的视频信息字段，标签合并后顺序不固定，单独排序后加入指纹
+_FINGERPRINT_FIELDS = (
+    "title",
+    "release_date",
+    "publish_date",
+    "duration",
+    "description",
+    "mosaic_type",
+    "magnets",
+    "magnet",
+    "author_name",
+    "actress_name",
+)
+
+
+def metadata_fingerprint(video_info, author_info=None, actress_info=None, image_path=None):
+    """计算视频元数据输入的指纹
+
+    包括NFO用到的视频信息字段、作者/女优信息、界面语言(影响NFO中的文字)、
+    封面图片的路径、大小和修改时间以及封面放置方式
+
+    Args:
+        video_info: 视频信息字典
+        author_info: 作者信息字典
+        actress_info: 女优信息字典
+        image_path: 封面图片路径
+
+    Returns:
+        str: 指纹 (SHA-1十六进制字符串)
+    """
+    image = None
+    if image_path and os.path.exists(image_path):
+        stat = os.stat(image_path)
+        image = [os.path.abspath(image_path), stat.st_size, stat.st_mtime_ns]
+
+    tags = video_info.get("tags")
+    inputs = {
+        "version": NFO_FORMAT_VERSION,
+        "language": get_current_language(),
+        "video": {
+            key: video_info.get(key) for key in _FINGERPRINT_FIELDS if key in video_info
+        },
+        "tags": sorted(tags) if tags else None,
+        "author": {k: (author_info or {}).get(k) for k in ("id", "name")},
+        "actress": {k: (actress_info or {}).get(k) for k in ("id", "name")},
+        "image": image,
+        "poster_strategy": config.jellyfin_poster_strategy,
+    }
+    payload = json.dumps(inputs, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class NfoManifest:
+    """单个输出目录的NFO清单
+
+    清单格式: {"version": 1, "videos": {视频ID: {"fingerprint": 指纹, "files": [文件名]}}}
+    """
+
+    def __init__(self, directory):
+        """读取目录下的清单文件，不存在或损坏时视为空清单
+
+        Args:
+            directory: 元数据输出目录
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.videos = {}
+        self._dirty = False
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.videos = dict(data.get("videos", {}))
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"NFO清单无法读取，将全部重新生成: {self.path} - {str(e)}")
+                self.videos = {}
+
+    def is_current(self, video_id, fingerprint):
+        """视频的元数据是否已按相同的输入生成，且生成的文件都还在
+
+        Args:
+            video_id: 视频ID
+            fingerprint: metadata_fingerprint计算的指纹
+
+        Returns:
+            bool: 是否可以跳过生成
+        """
+        entry = self.videos.get(str(video_id))
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+        return all(
+            os.path.exists(os.path.join(self.directory, name))
+            for name in entry.get("files", [])
+        )
+
+    def files(self, video_id):
+        """返回视频已生成的文件路径列表"""
+        entry = self.videos.get(str(video_id)) or {}
+        return [os.path.join(self.directory, name) for name in entry.get("files", [])]
+
+    def record(self, video_id, fingerprint, paths):
+        """记录视频本次生成的指纹和文件，上次生成但本次没有生成的文件会被删除
+
+        Args:
+            video_id: 视频ID
+            fingerprint: 输入指纹
+            paths: 生成的文件路径列表，None会被忽略
+        """
+        files = sorted(os.path.basename(path) for path in paths if path)
+        for path in self.files(video_id):
+            if os.path.basename(path) not in files:
+                self._remove_file(path)
+        self.videos[str(video_id)] = {"fingerprint": fingerprint, "files": files}
+        self._dirty = True
+
+    def remove(self, video_ids):
+        """删除指定视频生成的文件，并从清单中移除
+
+        只删除清单中记录的文件，目录中的其他文件不受影响
+
+        Args:
+            video_ids: 需要删除元数据的视频ID
+
+        Returns:
+            list: 被移除的视频ID
+        """
+        removed = []
+        for video_id in {str(video_id) for video_id in video_ids if video_id} & set(self.videos):
+            for path in self.files(video_id):
+                self._remove_file(path)
+            del self.videos[video_id]
+            removed.append(video_id)
+        if removed:
+            self._dirty = True
+        return removed
+
+    @staticmethod
+    def _remove_file(path):
+        """删除清单中记录的文件，文件不存在时忽略"""
+        try:
+            if os.path.lexists(path):
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"删除过期的元数据文件失败: {path} - {str(e)}")
+
+    def save(self):
+        """有变化时原子写入清单文件"""
+        if not self._dirty:
+            return
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": NFO_FORMAT_VERSION, "videos": self.videos},
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
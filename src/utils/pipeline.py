@@ -0,0 +1,148 @@
+"""
+流水线模块 - 多阶段并发执行器
+
+每个阶段拥有独立的有界队列和工作线程，任务在阶段之间向后流转，
+某个阶段变慢时只会占满自己的队列，其余阶段的线程继续工作
+"""
+import queue
+import threading
+
+from src.utils.logger import get_logger
+
+logger = get_logger("pipeline")
+
+# 队列中的结束标记
+_STOP = object()
+
+
+class Stage:
+    """流水线中的一个阶段
+
+    handler接收任务对象并返回下一个阶段的名称，返回None表示任务已全部完成
+    """
+
+    def __init__(self, name, handler, workers=1, queue_size=0):
+        """初始化阶段
+
+        Args:
+            name: 阶段名称
+            handler: 处理函数 handler(task) -> 下一阶段名称或None
+            workers: 工作线程数
+            queue_size: 输入队列长度上限，0表示不限制
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, int(workers or 1))
+        self.queue = queue.Queue(maxsize=max(0, int(queue_size or 0)))
+
+
+class StagedPipeline:
+    """多阶段流水线执行器
+
+    阶段按声明顺序排列，任务只能流向后面的阶段(可以跳过中间阶段)，
+    因此按顺序等待各阶段队列清空即可确认所有任务处理完毕
+    """
+
+    def __init__(self, stages, on_complete=None, on_error=None):
+        """初始化流水线
+
+        Args:
+            stages: Stage列表，第一个阶段接收输入任务
+            on_complete: 任务完成回调 on_complete(task)
+            on_error: 阶段处理异常回调 on_error(stage_name, task, exception)，
+                      调用后该任务视为完成
+        """
+        if not stages:
+            raise ValueError("流水线至少需要一个阶段")
+        self.stages = list(stages)
+        self._index = {stage.name: i for i, stage in enumerate(self.stages)}
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self._threads = []
+
+    def _worker(self, stage):
+        """阶段工作线程"""
+        position = self._index[stage.name]
+        while True:
+            task = stage.queue.get()
+            try:
+                if task is _STOP:
+                    return
+                self._handle(stage, position, task)
+            finally:
+                stage.queue.task_done()
+
+    def _handle(self, stage, position, task):
+        """执行阶段处理函数并把任务交给下一个阶段"""
+        try:
+            next_name = stage.handler(task)
+        except Exception as e:
+            logger.error(f"流水线阶段 {stage.name} 处理任务时出错: {e}")
+            self._notify(self.on_error, stage.name, task, e)
+            return
+
+        if next_name is None:
+            self._notify(self.on_complete, task)
+            return
+
+        next_position = self._index.get(next_name)
+        if next_position is None or next_position <= position:
+            error = ValueError(f"无效的下一阶段: {stage.name} -> {next_name}")
+            logger.error(str(error))
+            self._notify(self.on_error, stage.name, task, error)
+            return
+
+        # 下游队列已满时在这里阻塞，形成背压
+        self.stages[next_position].queue.put(task)
+
+    def _notify(self, callback, *args):
+        """调用回调函数，回调中的异常只记录不中断工作线程"""
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"流水线回调出错: {e}")
+
+    def start(self):
+        """启动所有阶段的工作线程"""
+        if self._threads:
+            return
+        for stage in self.stages:
+            for i in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(stage,),
+                    name=f"pipeline-{stage.name}-{i}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, task):
+        """向第一个阶段提交任务，队列已满时阻塞"""
+        self.stages[0].queue.put(task)
+
+    def join(self):
+        """等待所有已提交任务处理完毕并停止工作线程"""
+        for stage in self.stages:
+            stage.queue.join()
+        for stage in self.stages:
+            for _ in range(stage.workers):
+                stage.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def run(self, tasks):
+        """提交全部任务并等待完成
+
+        Args:
+            tasks: 可迭代的任务对象
+        """
+        self.start()
+        try:
+            for task in tasks:
+                self.submit(task)
+        finally:
+            self.join()
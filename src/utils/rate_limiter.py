@@ -0,0 +1,211 @@
+"""
+限速模块 - 按主机划分的令牌桶限速器
+
+所有对外请求在发送前都会向对应主机的令牌桶申请令牌，
+不同主机互不影响：检查站点可以全速运行，而磁链站点保持低频访问
+"""
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import config
+
+
+class TokenBucket:
+    """令牌桶 - rate为每秒补充的令牌数，burst为桶容量(允许的突发请求数)
+
+    采用时间槽预约：调用方在锁内预约下一个可用时间槽后，在锁外等待到该时刻，
+    多个线程同时等待时各自拿到不同的时间槽，不会同时醒来争抢或集中爆发
+    """
+
+    def __init__(self, rate, burst=1):
+        """初始化令牌桶
+
+        Args:
+            rate: 每秒请求数，None或小于等于0表示不限速
+            burst: 允许的突发请求数
+        """
+        self.rate = float(rate) if rate else 0.0
+        self.burst = max(1.0, float(burst or 1))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        # 统计信息
+        self.requests = 0
+        self.total_wait = 0.0
+        self.first_slot = None
+        self.last_slot = None
+
+    @property
+    def unlimited(self):
+        return self.rate <= 0
+
+    def reserve(self):
+        """预约下一个时间槽
+
+        令牌允许透支，透支部分即为排在前面的预约，
+        返回值是调用方需要等待的秒数
+
+        Returns:
+            float: 距离预约时间槽的秒数，0表示可以立即发送
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.unlimited:
+                wait = 0.0
+            else:
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                self.tokens -= 1
+                wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+            slot = now + wait
+            self.requests += 1
+            self.total_wait += wait
+            if self.first_slot is None:
+                self.first_slot = slot
+            self.last_slot = max(self.last_slot or slot, slot)
+            return wait
+
+    def acquire(self):
+        """阻塞直到预约的时间槽到来
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """异步版本的acquire，等待期间不阻塞事件循环"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self):
+        """返回令牌桶的使用统计
+
+        Returns:
+            dict: 请求数、平均等待时间和实际达到的请求速率(每秒)
+        """
+        with self._lock:
+            span = (
+                self.last_slot - self.first_slot
+                if self.first_slot is not None
+                else 0.0
+            )
+            achieved_rate = (self.requests - 1) / span if span > 0 else 0.0
+            return {
+                "requests": self.requests,
+                "configured_rate": self.rate,
+                "achieved_rate": achieved_rate,
+                "avg_wait": self.total_wait / self.requests if self.requests else 0.0,
+            }
+
+
+class RateLimiter:
+    """按主机管理令牌桶的限速器
+
+    主机预算来自config.host_rate_limits和config.check_sites中的rate_limit，
+    子域名与上级域名共用同一个令牌桶 (如www.fc2ppvdb.com归入fc2ppvdb.com)
+    """
+
+    def __init__(self, limits=None, default_limit=None):
+        """初始化限速器
+
+        Args:
+            limits: {域名: {"rate": 每秒请求数, "burst": 突发数}}，默认从配置读取
+            default_limit: 未配置主机使用的预算，默认从配置读取
+        """
+        self._limits = limits
+        self._default_limit = default_limit
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _load_limits(self):
+        """合并配置中的主机预算"""
+        if self._limits is not None:
+            return dict(self._limits)
+
+        limits = dict(config.host_rate_limits)
+        for site in config.check_sites:
+            site_limit = site.get("rate_limit")
+            host = urlparse(site.get("url", "")).hostname
+            if site_limit and host:
+                limits[host] = site_limit
+        return limits
+
+    @staticmethod
+    def host_of(url_or_host):
+        """从URL或主机名中取出主机名"""
+        if "://" in url_or_host:
+            return (urlparse(url_or_host).hostname or "").lower()
+        return url_or_host.lower()
+
+    def _match_domain(self, host, limits):
+        """找到主机对应的预算域名，优先匹配最长的域名"""
+        candidates = [
+            domain
+            for domain in limits
+            if host == domain or host.endswith("." + domain)
+        ]
+        return max(candidates, key=len) if candidates else None
+
+    def bucket_for(self, url_or_host):
+        """获取主机对应的令牌桶
+
+        Args:
+            url_or_host: 请求URL或主机名
+
+        Returns:
+            TokenBucket: 令牌桶实例
+        """
+        host = self.host_of(url_or_host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is not None:
+                return bucket
+
+            limits = self._load_limits()
+            domain = self._match_domain(host, limits)
+            key = domain or host
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                limit = limits.get(domain) if domain else None
+                if limit is None:
+                    limit = (
+                        self._default_limit
+                        if self._default_limit is not None
+                        else config.default_rate_limit
+                    ) or {}
+                bucket = TokenBucket(limit.get("rate"), limit.get("burst", 1))
+                self._buckets[key] = bucket
+            self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url_or_host):
+        """在请求前申请令牌，阻塞直到该主机允许发送"""
+        return self.bucket_for(url_or_host).acquire()
+
+    async def acquire_async(self, url_or_host):
+        """异步申请令牌"""
+        return await self.bucket_for(url_or_host).acquire_async()
+
+    def stats(self, url_or_host):
+        """获取主机的限速统计，参见TokenBucket.stats"""
+        return self.bucket_for(url_or_host).stats()
+
+    def reset(self):
+        """清空所有令牌桶，配置修改后调用"""
+        with self._lock:
+            self._buckets.clear()
+
+
+# 全局限速器，所有请求路径共用
+rate_limiter = RateLimiter()
@@ -0,0 +1,540 @@
+"""
+报告构建模块 - 单次遍历生成所有格式的分析报告
+
+统一"已流出"和"有磁链"的判断规则，先统计一次分类数量，
+再逐条读取结果并同时写入所有报告文件(总报告、分类报告、磁链列表、JSON等)，
+各报告不再各自分类和遍历结果
+"""
+import json
+import os
+import tempfile
+
+from src.utils.i18n import get_text as _
+from src.utils.logger import get_logger
+
+logger = get_logger("report_builder")
+
+# 结果分类
+LEAKED_WITH_MAGNET = "leaked_with_magnet"
+LEAKED_WITHOUT_MAGNET = "leaked_without_magnet"
+UNLEAKED = "unleaked"
+# 按检查状态细分的未流出结果 (总报告中单独列出)
+ERROR = "error"
+UNKNOWN = "unknown"
+
+# 流出检查的原始结果 (结果中的leak_check字段)；检查出错的视频status同样为unavailable
+LEAK_CHECK_LEAKED = "leaked"
+LEAK_CHECK_NOT_FOUND = "not_found"
+LEAK_CHECK_ERROR = "error"
+
+# 视为已流出的状态值 (分析器使用available，旧版本结果使用leaked/已流出)
+LEAKED_STATUSES = ("available", "leaked", "已流出", "yes", "true")
+# 明确未流出的状态值
+UNLEAKED_STATUSES = ("unavailable", "not_leaked", "未流出", "no", "false")
+# 检查出错的状态值
+ERROR_STATUSES = ("error", "错误")
+
+
+def is_leaked(result):
+    """判断视频是否已流出
+
+    Args:
+        result: 单个视频的处理结果
+
+    Returns:
+        bool: 是否已流出
+    """
+    if result.get("leaked") is True or result.get("exists") is True:
+        return True
+
+    status = result.get("status")
+    if isinstance(status, bool):
+        return status
+    return isinstance(status, str) and status.lower() in LEAKED_STATUSES
+
+
+def get_magnets(result):
+    """获取结果中的磁链，兼容magnets列表和单个magnet两种格式
+
+    Args:
+        result: 单个视频的处理结果
+
+    Returns:
+        list: 去重后的磁链列表
+    """
+    magnets = []
+    candidates = list(result.get("magnets") or [])
+    if result.get("magnet"):
+        candidates.append(result.get("magnet"))
+    for magnet in candidates:
+        if magnet and isinstance(magnet, str) and magnet not in magnets:
+            magnets.append(magnet)
+    return magnets
+
+
+def classify(result):
+    """结果分类
+
+    Returns:
+        str: LEAKED_WITH_MAGNET、LEAKED_WITHOUT_MAGNET或UNLEAKED
+    """
+    if not is_leaked(result):
+        return UNLEAKED
+    if get_magnets(result):
+        return LEAKED_WITH_MAGNET
+    return LEAKED_WITHOUT_MAGNET
+
+
+def check_status(result):
+    """按检查状态细分结果
+
+    Returns:
+        str: 已流出时返回classify的分类；否则返回UNLEAKED、ERROR或UNKNOWN(状态缺失或无法识别)
+    """
+    if is_leaked(result):
+        return classify(result)
+    status = result.get("status")
+    if status is False:
+        return UNLEAKED
+    if isinstance(status, str):
+        status = status.lower()
+        if status in ERROR_STATUSES:
+            return ERROR
+        if status in UNLEAKED_STATUSES:
+            return UNLEAKED
+    return UNKNOWN
+
+
+def is_confirmed_unleaked(result):
+    """最近一次流出检查是否确认未流出 (所有站点都返回未找到)
+
+    检查出错、没有检查记录(旧版本结果)时返回False
+
+    Args:
+        result: 单个视频的处理结果
+
+    Returns:
+        bool: 是否确认未流出
+    """
+    return result.get("leak_check") == LEAK_CHECK_NOT_FOUND
+
+
+def video_title(result):
+    """结果中的视频标题，没有标题时使用番号"""
+    return result.get("title", f"FC2-PPV-{result.get('video_id')}")
+
+
+class ReportSummary:
+    """一次分类统计得到的报告摘要"""
+
+    def __init__(self):
+        self.total = 0
+        self.with_magnet = 0
+        self.without_magnet = 0
+        self.unleaked = 0
+        self.errors = 0
+        self.unknown = 0
+        self.image_downloaded = 0
+
+    @property
+    def leaked(self):
+        return self.with_magnet + self.without_magnet
+
+    @property
+    def leak_ratio(self):
+        return (self.leaked / self.total) * 100 if self.total > 0 else 0
+
+    def add(self, result, category):
+        """计入一条结果"""
+        self.total += 1
+        if category == LEAKED_WITH_MAGNET:
+            self.with_magnet += 1
+        elif category == LEAKED_WITHOUT_MAGNET:
+            self.without_magnet += 1
+        else:
+            self.unleaked += 1
+        status = check_status(result)
+        if status == ERROR:
+            self.errors += 1
+        elif status == UNKNOWN:
+            self.unknown += 1
+        if result.get("image_downloaded"):
+            self.image_downloaded += 1
+
+    def count(self, category):
+        """指定分类的视频数量"""
+        return {
+            LEAKED_WITH_MAGNET: self.with_magnet,
+            LEAKED_WITHOUT_MAGNET: self.without_magnet,
+            UNLEAKED: self.unleaked,
+        }[category]
+
+    def status_count(self, status):
+        """按检查状态细分后的数量，UNLEAKED不含出错和状态未知的视频"""
+        return {
+            UNLEAKED: self.unleaked - self.errors - self.unknown,
+            ERROR: self.errors,
+            UNKNOWN: self.unknown,
+        }[status]
+
+    def as_dict(self):
+        """转换为字典"""
+        return {
+            "total": self.total,
+            "leaked": self.leaked,
+            "unleaked": self.unleaked,
+            "error": self.errors,
+            "unknown": self.unknown,
+            "with_magnet": self.with_magnet,
+            "without_magnet": self.without_magnet,
+            "image_downloaded": self.image_downloaded,
+            "leak_ratio": self.leak_ratio,
+        }
+
+
+class ReportBuilder:
+    """报告构建器
+
+    示例:
+        builder = ReportBuilder(results)
+        summary = builder.summarize()
+        files = builder.build([SummaryReportOutput(path, header), ...])
+    """
+
+    def __init__(self, source):
+        """初始化构建器
+
+        Args:
+            source: 结果列表，或每次调用返回新结果迭代器的函数 (用于流式读取结果文件)
+        """
+        if callable(source):
+            self._source = source
+        else:
+            results = source or []
+            self._source = lambda: iter(results)
+        self._summary = None
+
+    def summarize(self):
+        """统计各分类数量，只遍历一次结果
+
+        Returns:
+            ReportSummary: 报告摘要
+        """
+        if self._summary is None:
+            summary = ReportSummary()
+            for result in self._source():
+                summary.add(result, classify(result))
+            self._summary = summary
+        return self._summary
+
+    def build(self, outputs):
+        """逐条读取结果并同时写入所有报告
+
+        Args:
+            outputs: ReportOutput列表
+
+        Returns:
+            dict: {报告类型: 文件路径}
+        """
+        summary = self.summarize()
+        active = []
+        files = {}
+        try:
+            for output in outputs:
+                try:
+                    if output.open(summary):
+                        active.append(output)
+                except OSError as e:
+                    logger.error(f"创建报告文件失败: {output.path} - {str(e)}")
+
+            if active:
+                for result in self._source():
+                    category = classify(result)
+                    for output in active:
+                        output.add(result, category)
+        finally:
+            for output in active:
+                try:
+                    output.close()
+                    files[output.key] = output.path
+                except OSError as e:
+                    logger.error(f"写入报告文件失败: {output.path} - {str(e)}")
+        return files
+
+
+class ReportOutput:
+    """报告输出基类
+
+    open返回False时表示本次不需要生成该报告 (例如分类为空)
+    """
+
+    key = None
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def open(self, summary):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        return True
+
+    def add(self, result, category):
+        raise NotImplementedError
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReportHeader:
+    """总报告和分类报告共用的文件头"""
+
+    def __init__(self, entity_desc, entity_id, entity_name, clean_name, has_special_chars, timestamp):
+        self.entity_desc = entity_desc
+        self.entity_id = entity_id
+        self.entity_name = entity_name
+        self.clean_name = clean_name
+        self.has_special_chars = has_special_chars
+        self.timestamp = timestamp
+
+    def write(self, f):
+        f.write(f"{self.entity_desc}ID: {self.entity_id}\n")
+
+        # 根据是否有特殊字符，决定使用原名还是清理后的名称
+        if self.has_special_chars:
+            f.write(_("reports.entity_name_special", "{entity_desc}名称: {entity_name} (含特殊字符)\n").format(entity_desc=self.entity_desc, entity_name=self.entity_name))
+        else:
+            f.write(_("reports.entity_name", "{entity_desc}名称: {name}\n").format(entity_desc=self.entity_desc, name=self.clean_name))
+
+        f.write(_("reports.analysis_time", "分析时间: {timestamp}\n").format(timestamp=self.timestamp))
+
+
+class SummaryReportOutput(ReportOutput):
+    """总报告：总体统计、已流出视频列表和未流出视频列表"""
+
+    key = "summary"
+
+    def __init__(self, path, header):
+        super().__init__(path)
+        self.header = header
+        self._unleaked = None
+        self._leaked_idx = 0
+        self._unleaked_idx = 0
+
+    def open(self, summary):
+        super().open(summary)
+        f = self._file
+        self.header.write(f)
+        f.write(_("reports.summary_header", "\n=== 总体统计 ===\n"))
+        f.write(_("reports.total_videos", "总视频数: {count}\n").format(count=summary.total))
+        f.write(_("reports.leaked_videos", "已流出视频数: {count}\n").format(count=summary.leaked))
+        f.write(_("reports.unleaked_videos", "未流出视频数: {count}\n").format(count=summary.unleaked))
+        f.write(_("reports.leak_ratio", "流出比例: {ratio:.2f}%\n").format(ratio=summary.leak_ratio))
+        f.write(_("reports.with_magnet", "有磁链数量: {count}\n").format(count=summary.with_magnet))
+        f.write(_("reports.without_magnet", "无磁链数量: {count}\n").format(count=summary.without_magnet))
+        f.write(_("reports.leaked_list_header", "\n=== 已流出视频列表 ===\n"))
+
+        # 未流出视频列表在文件末尾，遍历时先写入临时文件，较小时保存在内存中
+        self._unleaked = tempfile.SpooledTemporaryFile(max_size=1 << 20, mode="w+", encoding="utf-8")
+        return True
+
+    def add(self, result, category):
+        vid = result.get("video_id")
+        if category == UNLEAKED:
+            self._unleaked_idx += 1
+            self._unleaked.write(f"{self._unleaked_idx}. [{vid}] {video_title(result)}\n")
+            return
+
+        self._leaked_idx += 1
+        if category == LEAKED_WITH_MAGNET:
+            magnet_status = _("reports.has_magnet", "[有磁链]")
+        else:
+            magnet_status = _("reports.no_magnet", "[无磁链]")
+        self._file.write(f"{self._leaked_idx}. [{vid}] {magnet_status} {video_title(result)}\n")
+
+    def close(self):
+        if self._unleaked is not None:
+            try:
+                if self._file is not None:
+                    self._file.write(_("reports.unleaked_list_header", "\n=== 未流出视频列表 ===\n"))
+                    self._unleaked.seek(0)
+                    for line in self._unleaked:
+                        self._file.write(line)
+            finally:
+                self._unleaked.close()
+                self._unleaked = None
+        super().close()
+
+
+class CategoryReportOutput(ReportOutput):
+    """单个分类的报告文件，分类为空时不生成"""
+
+    def __init__(self, category, path, header):
+        super().__init__(path)
+        self.key = category
+        self.category = category
+        self.header = header
+        self._idx = 0
+
+    def open(self, summary):
+        count = summary.count(self.category)
+        if not count:
+            return False
+        super().open(summary)
+        self.header.write(self._file)
+        if self.category == LEAKED_WITH_MAGNET:
+            self._file.write(_("reports.with_magnet_count", "有磁链视频数量: {count}\n\n").format(count=count))
+        elif self.category == LEAKED_WITHOUT_MAGNET:
+            self._file.write(_("reports.without_magnet_count", "无磁链视频数量: {count}\n\n").format(count=count))
+        else:
+            self._file.write(_("reports.unleaked_count", "未流出视频数量: {count}\n\n").format(count=count))
+        return True
+
+    def add(self, result, category):
+        if category != self.category:
+            return
+        self._idx += 1
+        vid = result.get("video_id")
+        if category != LEAKED_WITH_MAGNET:
+            self._file.write(f"{self._idx}. [{vid}] {video_title(result)}\n")
+            return
+
+        self._file.write(_("reports.video_entry", "=== {idx}. FC2-PPV-{vid} ===\n").format(idx=self._idx, vid=vid))
+        self._file.write(_("reports.video_title", "标题: {title}\n").format(title=video_title(result)))
+        for i, magnet in enumerate(get_magnets(result), 1):
+            self._file.write(_("reports.magnet_link", "磁链{num}: {link}\n").format(num=i, link=magnet))
+        self._file.write("\n")
+
+
+class StatusListOutput(ReportOutput):
+    """按检查状态(未流出/出错/状态未知)列出视频的报告文件，没有对应视频时不生成"""
+
+    def __init__(self, status, path, label):
+        super().__init__(path)
+        self.key = status
+        self.status = status
+        self.label = label
+        self._idx = 0
+
+    def open(self, summary):
+        count = summary.status_count(self.status)
+        if not count:
+            return False
+        super().open(summary)
+        self._file.write(f"=== {self.label} ({count}个) ===\n")
+        return True
+
+    def add(self, result, category):
+        if check_status(result) != self.status:
+            return
+        self._idx += 1
+        self._file.write(f"{self._idx}. {result.get('video_id', 'unknown')} | {video_title(result)}\n")
+        for magnet in get_magnets(result):
+            self._file.write(f"    • {magnet}\n")
+
+
+class LeakedListOutput(ReportOutput):
+    """已流出视频总表(简洁版-只有ID和标题)"""
+
+    key = "leaked_summary"
+
+    def open(self, summary):
+        if not summary.leaked:
+            return False
+        return super().open(summary)
+
+    def add(self, result, category):
+        if category != UNLEAKED:
+            self._file.write(f"FC2-PPV-{result.get('video_id')} | {video_title(result)}\n")
+
+
+class MagnetListOutput(ReportOutput):
+    """磁链专用文件：每个视频一行注释，后跟其磁链"""
+
+    key = "magnet_only"
+
+    def open(self, summary):
+        if not summary.with_magnet:
+            return False
+        return super().open(summary)
+
+    def add(self, result, category):
+        if category != LEAKED_WITH_MAGNET:
+            return
+        self._file.write(f"# {result.get('video_id')} | {video_title(result)}\n")
+        for magnet in get_magnets(result):
+            self._file.write(f"{magnet}\n")
+        self._file.write("\n")
+
+
+class MagnetOnlyOutput(MagnetListOutput):
+    """纯磁链文件：只包含磁链，每个磁链占一行"""
+
+    key = "magnet_file"
+
+    def add(self, result, category):
+        if category != LEAKED_WITH_MAGNET:
+            return
+        for magnet in get_magnets(result):
+            self._file.write(f"{magnet}\n")
+
+
+class VideoListOutput(ReportOutput):
+    """结果摘要：基本统计和全部视频的状态列表"""
+
+    key = "video_list"
+
+    def __init__(self, path, title, show_magnet=True, show_image=True):
+        super().__init__(path)
+        self.title = title
+        self.show_magnet = show_magnet
+        self.show_image = show_image
+
+    def open(self, summary):
+        super().open(summary)
+        self._file.write(f"{self.title}\n")
+        self._file.write(f"总视频数: {summary.total}\n")
+        self._file.write(f"已流出数: {summary.leaked}\n")
+        self._file.write(f"流出比例: {summary.leak_ratio:.2f}%\n\n")
+        self._file.write("视频列表:\n")
+        return True
+
+    def add(self, result, category):
+        video_id = result.get("video_id", result.get("id", "unknown"))
+        status = "未流出" if category == UNLEAKED else "已流出"
+        magnet_info = " [有磁链]" if self.show_magnet and category == LEAKED_WITH_MAGNET else ""
+        image_info = " [有图片]" if self.show_image and result.get("image_downloaded", False) else ""
+        self._file.write(f"{video_id} - {status}{magnet_info}{image_info} - {video_title(result)}\n")
+
+
+class JsonReportOutput(ReportOutput):
+    """JSON格式的完整报告，results数组逐条写入"""
+
+    key = "json_report"
+
+    def __init__(self, path, meta):
+        super().__init__(path)
+        self.meta = meta
+        self._first = True
+
+    def open(self, summary):
+        super().open(summary)
+        document = dict(self.meta)
+        document["stats"] = summary.as_dict()
+        head = json.dumps(document, ensure_ascii=False, indent=2)
+        # 去掉末尾的"}"，接着写入results数组
+        self._file.write(head[: head.rfind("}")].rstrip() + ',\n  "results": [')
+        return True
+
+    def add(self, result, category):
+        if not self._first:
+            self._file.write(",")
+        self._first = False
+        self._file.write("\n    " + json.dumps(result, ensure_ascii=False, default=str))
+
+    def close(self):
+        if self._file is not None:
+            self._file.write("\n  ]\n}\n")
+        super().close()
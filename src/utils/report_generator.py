@@ -10,6 +10,20 @@ import os
 
 from config import config
 from src.utils.i18n import get_text as _  # 添加国际化支持
+from src.utils.report_builder import (
+    ERROR,
+    LEAKED_WITH_MAGNET,
+    LEAKED_WITHOUT_MAGNET,
+    UNKNOWN,
+    UNLEAKED,
+    CategoryReportOutput,
+    JsonReportOutput,
+    LeakedListOutput,
+    MagnetListOutput,
+    ReportBuilder,
+    ReportHeader,
+    StatusListOutput,
+)
 
 
 class ReportGenerator:
@@ -53,79 +67,59 @@ class ReportGenerator:
         filename = f"{file_prefix}_总报告.txt"
         filepath = os.path.join(save_dir, filename)
 
-        # 分类处理 - 统一格式处理
-        leaked = []
-        unleaked = []
-        error = []
-        unknown = []
-
-        for result in results:
-            # 兼容不同格式的状态字段
-            status = result.get("status")
-            if status in ["leaked", "已流出"]:
-                leaked.append(result)
-            elif status in ["not_leaked", "未流出"]:
-                unleaked.append(result)
-            elif status in ["error", "错误"]:
-                error.append(result)
-            else:
-                unknown.append(result)
-
-        # 进一步细分已泄漏视频
-        has_magnet = [r for r in leaked if r.get("magnets") or r.get("magnet")]
-        no_magnet = [r for r in leaked if not (r.get("magnets") or r.get("magnet"))]
-
-        # 保存分类报告
-        saved_files = {}
-
-        if has_magnet:
-            has_magnet_file = cls._save_category(
-                file_prefix, "已流出_有磁链", has_magnet, save_dir
-            )
-            saved_files["leaked_with_magnet"] = has_magnet_file
-
-        if no_magnet:
-            no_magnet_file = cls._save_category(
-                file_prefix, "已流出_无磁链", no_magnet, save_dir
-            )
-            saved_files["leaked_without_magnet"] = no_magnet_file
-
-        if unleaked:
-            unleaked_file = cls._save_category(file_prefix, "未流出", unleaked, save_dir)
-            saved_files["unleaked"] = unleaked_file
-
-        if error:
-            error_file = cls._save_category(file_prefix, "错误", error, save_dir)
-            saved_files["error"] = error_file
-
-        if unknown:
-            unknown_file = cls._save_category(file_prefix, "未知", unknown, save_dir)
-            saved_files["unknown"] = unknown_file
-
-        if leaked:
-            leaked_summary = cls._save_leaked_summary(file_prefix, leaked, save_dir)
-            saved_files["leaked_summary"] = leaked_summary
+        # 分类报告、已流出视频总表、磁力链接文件和JSON报告在同一次遍历中生成
+        header = ReportHeader(
+            _("analyzer.entity_type_writer", "作者"),
+            writer_id,
+            writer_name or "未知",
+            cls.clean_filename(writer_name or ""),
+            False,
+            timestamp,
+        )
+
+        def report_path(label):
+            return os.path.join(save_dir, f"{file_prefix}_{label}.txt")
+
+        builder = ReportBuilder(results)
+        saved_files = builder.build(
+            [
+                CategoryReportOutput(LEAKED_WITH_MAGNET, report_path("已流出_有磁链"), header),
+                CategoryReportOutput(LEAKED_WITHOUT_MAGNET, report_path("已流出_无磁链"), header),
+                StatusListOutput(UNLEAKED, report_path("未流出"), "未流出"),
+                StatusListOutput(ERROR, report_path("错误"), "错误"),
+                StatusListOutput(UNKNOWN, report_path("未知"), "未知"),
+                LeakedListOutput(report_path("已流出视频总表")),
+                MagnetListOutput(report_path("磁力链接")),
+                JsonReportOutput(
+                    os.path.join(save_dir, f"{file_prefix}_完整报告.json"),
+                    {
+                        "writerid": writer_id,
+                        "author_name": writer_name,
+                        "timestamp": datetime.datetime.now().strftime(
+                            "%Y-%m-%d %H:%M:%S"
+                        ),
+                    },
+                ),
+            ]
+        )
+        for path in saved_files.values():
+            print(f"✅ 已生成报告: {path}")
 
         # 生成统计信息
-        stats = {
-            "total": len(results),
-            "leaked": len(leaked),
-            "unleaked": len(unleaked),
-            "error": len(error),
-            "unknown": len(unknown),
-            "with_magnet": len(has_magnet),
-            "without_magnet": len(no_magnet),
-        }
+        summary = builder.summarize()
+        stats = summary.as_dict()
+        # 总报告中出错和状态未知的视频单独统计，不计入未流出
+        stats["unleaked"] = summary.status_count(UNLEAKED)
 
         # 生成总报告
         report_content = [
             f"作者ID: {writer_id}",
             f"作者名称: {writer_name or '未知'}",
-            f"总视频数: {len(results)}",
-            f"已流出视频: {len(leaked)} (含磁链: {len(has_magnet)} / 无磁链: {len(no_magnet)})",
-            f"未流出视频: {len(unleaked)}",
-            f"错误视频数: {len(error)}",
-            f"未知状态数: {len(unknown)}",
+            f"总视频数: {summary.total}",
+            f"已流出视频: {summary.leaked} (含磁链: {summary.with_magnet} / 无磁链: {summary.without_magnet})",
+            f"未流出视频: {stats['unleaked']}",
+            f"错误视频数: {summary.errors}",
+            f"未知状态数: {summary.unknown}",
             f"\n报告生成时间: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             "\n详细报告请查看分类文件",
         ]
@@ -138,28 +132,6 @@ class ReportGenerator:
         except Exception as e:
             print(f"❌ 报告生成失败: {str(e)}")
 
-        # 同时保存JSON格式的完整报告
-        json_filepath = os.path.join(save_dir, f"{file_prefix}_完整报告.json")
-        try:
-            with open(json_filepath, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "writerid": writer_id,
-                        "author_name": writer_name,
-                        "timestamp": datetime.datetime.now().strftime(
-                            "%Y-%m-%d %H:%M:%S"
-                        ),
-                        "stats": stats,
-                        "results": results,
-                    },
-                    f,
-                    ensure_ascii=False,
-                    indent=2,
-                )
-            saved_files["json_report"] = json_filepath
-        except Exception as e:
-            print(f"❌ 保存JSON报告失败: {str(e)}")
-
         print(f"\n📊 分析结果: 总计 {stats['total']} 个视频")
         print(f"✅ 已泄漏: {stats['leaked']} 个 (含磁链: {stats['with_magnet']})")
         print(f"❌ 未泄漏: {stats['unleaked']} 个")
@@ -168,110 +140,6 @@ class ReportGenerator:
 
         return {"stats": stats, "saved_files": saved_files}
 
-    @classmethod
-    def _save_category(cls, file_prefix, category, data, save_dir):
-        """保存分类报告
-
-        Args:
-            file_prefix: 文件前缀
-            category: 分类名称
-            data: 数据列表
-            save_dir: 保存目录
-
-        Returns:
-            str: 保存的文件路径
-        """
-        if not data:
-            return None
-
-        content = [f"=== {category} ({len(data)}个) ==="]
-        for idx, item in enumerate(data, 1):
-            line = f"{idx}. {item.get('video_id', 'unknown')} | {item.get('title', '未知标题')}"
-            # 兼容两种磁力链接格式
-            magnets = (
-                item.get("magnets") or [item.get("magnet")]
-                if item.get("magnet")
-                else []
-            )
-            if magnets:
-                line += "\n" + "\n".join([f"    • {m}" for m in magnets if m])
-            content.append(line)
-
-        filename = os.path.join(save_dir, f"{file_prefix}_{category}.txt")
-        try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write("\n".join(content))
-            print(f"✅ 已生成分类报告: {filename}")
-            return filename
-        except Exception as e:
-            print(f"❌ 分类报告生成失败: {str(e)}")
-            return None
-
-    @classmethod
-    def _save_leaked_summary(cls, file_prefix, leaked_videos, save_dir):
-        """保存已流出视频总表
-
-        Args:
-            file_prefix: 文件前缀
-            leaked_videos: 已流出视频列表
-            save_dir: 保存目录
-
-        Returns:
-            str: 保存的文件路径
-        """
-        if not leaked_videos:
-            return None
-
-        # 文本总表
-        filename = os.path.join(save_dir, f"{file_prefix}_已流出视频总表.txt")
-        content = [f"=== 已流出视频总表 ({len(leaked_videos)}个) ==="]
-
-        for idx, video in enumerate(leaked_videos, 1):
-            content.append(
-                f"{idx}. {video.get('video_id', '')} | {video.get('title', '未知标题')}"
-            )
-
-        try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write("\n".join(content))
-            print(f"✅ 已生成流出视频总表: {filename}")
-        except Exception as e:
-            print(f"❌ 流出视频总表生成失败: {str(e)}")
-
-        # 磁力链接文件
-        magnet_file = os.path.join(save_dir, f"{file_prefix}_磁力链接.txt")
-        magnet_content = [
-            f"# 生成时间: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"# 总计 {len(leaked_videos)} 个视频\n",
-        ]
-
-        for video in leaked_videos:
-            title = video.get("title", "未知标题")
-            # 兼容两种磁力链接格式
-            magnets = (
-                video.get("magnets") or [video.get("magnet")]
-                if video.get("magnet")
-                else []
-            )
-
-            if magnets:
-                magnet_content.append(f"# {video.get('video_id', '')} | {title}")
-                magnet_content.extend([m for m in magnets if m])
-                magnet_content.append("")  # 空行分隔
-            else:
-                magnet_content.append(f"# {video.get('video_id', '')} | {title}")
-                magnet_content.append("# [未获取到磁力链接]")
-                magnet_content.append("")  # 空行分隔
-
-        try:
-            with open(magnet_file, "w", encoding="utf-8") as f:
-                f.write("\n".join(magnet_content))
-            print(f"✅ 已生成磁力链接文件: {magnet_file}")
-            return magnet_file
-        except Exception as e:
-            print(f"❌ 磁力链接文件生成失败: {str(e)}")
-            return None
-
     @staticmethod
     def clean_filename(name):
         """清理文件名中的非法字符
@@ -297,7 +165,7 @@ class ReportGenerator:
         """生成多作者汇总报告
 
         Args:
-            writers_data: 多个作者的数据列表，每个元素是包含作者信息和结果的字典
+            writers_data: 多个作者的数据列表，每个元素是包含作者信息和统计数量的字典
 
         Returns:
             str: 保存的文件路径
@@ -319,26 +187,16 @@ class ReportGenerator:
         for writer_data in writers_data:
             writer_id = writer_data.get("writer_id")
             writer_name = writer_data.get("writer_name", "未知")
-            results = writer_data.get("results", [])
             status = writer_data.get("status")
+            writer_total = writer_data.get("processed_videos", 0)
 
-            if status != "success" or not results:
+            if status != "success" or not writer_total:
                 continue
 
-            writer_total = len(results)
-            # 修复：使用正确的键匹配流出视频状态
-            writer_leaked = sum(
-                1 for r in results if r.get("leaked", False) or r.get("status") == "已流出"
-            )
-            writer_with_magnet = sum(
-                1
-                for r in results
-                if (r.get("leaked", False) or r.get("status") == "已流出")
-                and (r.get("has_magnet", False) or r.get("magnet", []))
-            )
-            writer_image_downloaded = sum(
-                1 for r in results if r.get("image_downloaded", False)
-            )
+            # 分析时已按与单个作者报告相同的分类规则统计
+            writer_leaked = writer_data.get("leaked_videos", 0)
+            writer_with_magnet = writer_data.get("with_magnet", 0)
+            writer_image_downloaded = writer_data.get("image_downloaded", 0)
 
             total_videos += writer_total
             total_leaked += writer_leaked
@@ -3,41 +3,287 @@
 
 提供统一的网络请求功能，包含会话管理、自动重试和错误处理机制
 """
+import asyncio
 import os
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, RequestException, Timeout
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
 from config import config
+from src.utils import article_cache, http_cache
 from src.utils.logger import get_logger
 from src.utils.i18n import get_text as _  # 添加i18n翻译函数
+from src.utils.rate_limiter import rate_limiter
 
 # 使用统一的日志记录器
 logger = get_logger("request_handler")
 
+# 检查站点的请求方式：HEAD只获取响应头，STREAM为收到响应头后即关闭的GET
+_CHECK_METHODS = ("GET", "HEAD", "STREAM")
+# 站点不接受HEAD请求时返回的状态码，收到后改用GET
+# 403: 不少CDN/WAF拒绝HEAD请求但正常响应GET
+_HEAD_REJECTED_STATUS = (400, 403, 405, 501)
+
+
+class TransportStats:
+    """连接池统计 - 记录发出的请求数和新建的连接数，用于评估连接复用效果"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_opened = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connections_opened = 0
+
+    def snapshot(self):
+        """返回当前统计的快照
+
+        Returns:
+            dict: 包含requests、connections_opened和connections_reused
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "connections_reused": max(0, self.requests - self.connections_opened),
+            }
+
+
+# 全局连接统计
+transport_stats = TransportStats()
+
+
+def _counting_pool_class(base):
+    """为urllib3连接池类添加新建连接计数"""
+
+    class CountingConnectionPool(base):
+        def _new_conn(self):
+            transport_stats.record_connection()
+            return super()._new_conn()
+
+    CountingConnectionPool.__name__ = f"Counting{base.__name__}"
+    return CountingConnectionPool
+
+
+_COUNTING_POOL_CLASSES = {
+    "http": _counting_pool_class(HTTPConnectionPool),
+    "https": _counting_pool_class(HTTPSConnectionPool),
+}
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """带连接统计的连接池适配器
+
+    urllib3按主机维护连接池，pool_maxsize即为单主机的连接上限；
+    配合pool_block=True，并发线程会等待空闲的keep-alive连接而不是重新握手。
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _COUNTING_POOL_CLASSES
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # SOCKS代理使用自己的连接池类，保持不变
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = _COUNTING_POOL_CLASSES
+        return manager
+
+    def send(self, request, **kwargs):
+        transport_stats.record_request()
+        return super().send(request, **kwargs)
+
 
 class RequestHandler:
     # 单例会话
     _session = None
+    _session_lock = threading.Lock()
+    # 不接受HEAD请求的检查站点，之后直接使用GET
+    _head_unsupported_sites = set()
+    # 同时检查多个站点的线程池
+    _hedge_pool = None
 
     @classmethod
     def get_session(cls):
-        """获取会话实例，使用单例模式"""
+        """获取会话实例，使用单例模式
+
+        会话挂载了共享连接池，所有模块的请求都通过它复用TCP/TLS连接
+        """
         if cls._session is None:
-            cls._session = requests.Session()
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    adapter = PooledHTTPAdapter(
+                        pool_connections=config.pool_connections,
+                        pool_maxsize=config.pool_maxsize,
+                        pool_block=config.pool_block,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
         return cls._session
 
     @classmethod
     def reset_session(cls):
         """重置会话，主要用于测试"""
-        if cls._session:
-            cls._session.close()
-        cls._session = None
+        with cls._session_lock:
+            if cls._session:
+                cls._session.close()
+            cls._session = None
+
+    @classmethod
+    def request(cls, method, url, **kwargs):
+        """通过共享连接池发送单次请求，不包含重试逻辑
+
+        发送前会向目标主机的令牌桶申请令牌，只在该主机超出预算时等待
+
+        Args:
+            method: 请求方法，如"GET"
+            url: 请求URL
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            Response: 请求响应对象
+        """
+        kwargs.setdefault("timeout", config.timeout)
+        rate_limiter.acquire(url)
+        return cls.get_session().request(method, url, **kwargs)
+
+    @classmethod
+    def conditional_get(cls, url, params=None, headers=None, **kwargs):
+        """发送带缓存校验信息的GET请求
+
+        缓存中有该URL的响应时带上If-None-Match/If-Modified-Since，
+        服务器返回304时用缓存内容构造状态码为200的响应，调用方按正常响应处理；
+        响应的from_cache属性表示内容是否来自缓存
+
+        Args:
+            url: 请求URL
+            params: 查询参数
+            headers: 请求头
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            Response: 请求响应对象
+        """
+        key = http_cache.cache_key(url, params)
+        entry = http_cache.lookup(key)
+        response = cls.request(
+            "GET",
+            url,
+            params=params,
+            headers=http_cache.conditional_headers(entry, headers),
+            **kwargs,
+        )
+        response.from_cache = False
+
+        if response.status_code == 304 and entry is not None:
+            http_cache.revalidated(key)
+            return cls._cached_response(entry, url, response)
+
+        if response.status_code == 200:
+            http_cache.store(key, response.content, response.headers, response.encoding)
+        return response
+
+    @classmethod
+    def get_article(cls, video_id, headers=None, **kwargs):
+        """获取fc2ppvdb的视频页面，优先使用页面缓存
+
+        缓存在有效期内时不发送请求；缓存过期时发送条件请求，服务器返回304时使用缓存内容。
+        与conditional_get一样，来自缓存的内容以状态码为200的响应返回，from_cache为True
+
+        Args:
+            video_id: 视频ID
+            headers: 请求头
+            **kwargs: 传递给requests的其他参数
+
+        Returns:
+            Response: 请求响应对象
+        """
+        url = article_cache.article_url(video_id)
+        entry = article_cache.lookup(video_id)
+        if article_cache.is_fresh(entry):
+            logger.debug(f"使用缓存的视频页面: {video_id}")
+            return cls._cached_response(entry, url)
+
+        response = cls.request(
+            "GET", url, headers=http_cache.conditional_headers(entry, headers), **kwargs
+        )
+        response.from_cache = False
+
+        if response.status_code == 304 and entry is not None:
+            article_cache.revalidated(video_id)
+            return cls._cached_response(entry, url, response)
+
+        if response.status_code == 200:
+            article_cache.store(video_id, response.content, response.headers, response.encoding)
+        return response
+
+    @staticmethod
+    def _cached_response(entry, url, response=None):
+        """用缓存内容构造状态码为200的响应
+
+        Args:
+            entry: 缓存的响应，包含body和encoding
+            url: 请求URL
+            response: 服务器返回的304响应，没有发送请求时为None
+        """
+        cached = requests.Response()
+        cached.status_code = 200
+        cached._content = entry["body"]
+        cached.encoding = entry["encoding"]
+        cached.url = url
+        if response is not None:
+            cached.headers = response.headers
+            cached.url = response.url
+            cached.request = response.request
+        cached.from_cache = True
+        return cached
+
+    @classmethod
+    def get_transport_stats(cls):
+        """获取连接复用统计
+
+        Returns:
+            dict: 请求数、新建连接数和复用连接数
+        """
+        return transport_stats.snapshot()
+
+    @classmethod
+    def log_transport_stats(cls):
+        """将连接复用统计写入日志"""
+        stats = transport_stats.snapshot()
+        logger.info(
+            _(
+                "logger.transport_stats",
+                "连接池统计: 请求 {requests} 次，新建连接 {opened} 个，复用连接 {reused} 次",
+            ).format(
+                requests=stats["requests"],
+                opened=stats["connections_opened"],
+                reused=stats["connections_reused"],
+            )
+        )
+        return stats
 
     @classmethod
     def make_request(
@@ -49,6 +295,8 @@ class RequestHandler:
         max_retries=None,
         verify=True,
         allow_redirects=True,
+        method="GET",
+        stream=False,
     ):
         """发送GET请求，包含重试机制
 
@@ -60,6 +308,8 @@ class RequestHandler:
             max_retries: 最大重试次数
             verify: 是否验证SSL证书
             allow_redirects: 是否允许重定向
+            method: 请求方法，默认GET
+            stream: 是否延迟读取响应内容
 
         Returns:
             Response: 请求响应对象
@@ -83,13 +333,15 @@ class RequestHandler:
                         step_name=step_name, retry_suffix=retry_suffix
                     ))
 
-                # 发送请求
-                response = requests.get(
+                # 通过共享连接池发送请求
+                response = cls.request(
+                    method,
                     url,
                     headers=headers,
                     timeout=timeout,
                     verify=verify,
                     allow_redirects=allow_redirects,
+                    stream=stream,
                 )
 
                 # 成功获取响应
@@ -112,20 +364,15 @@ class RequestHandler:
                 time.sleep(wait_time)
 
     @classmethod
-    def check_video_leak_status(
-        cls, video_id
-    ) -> Tuple[bool, Optional[str], Optional[int]]:
-        """检查视频是否已经流出
+    def _leak_check_targets(cls, video_id):
+        """按优先级返回需要检查的站点
 
         Args:
             video_id: 视频ID
 
         Returns:
-            tuple: (是否流出, 站点名称, 状态码)
+            list: [(站点名称, 检查URL, 请求方式)]
         """
-        # 确保video_id是字符串
-        video_id = str(video_id)
-
         # 尝试不同的站点进行检查
         check_sites_config = config.check_sites
         # 确保check_sites是列表类型
@@ -150,6 +397,7 @@ class RequestHandler:
                 site["priority"] = 999
         check_sites.sort(key=lambda x: x["priority"])
 
+        targets = []
         for site in check_sites:
             site_name = site.get("name", _("sites.unknown", "未知站点"))
             # 兼容两种URL格式：使用{video_id}或{vid}
@@ -159,42 +407,332 @@ class RequestHandler:
             else:
                 site_url = site_url.format(vid=video_id)
 
-            if not site_url:
-                continue
+            # 请求方式：GET(默认)、HEAD或STREAM
+            method = str(site.get("method", "GET")).upper()
+            if method not in _CHECK_METHODS:
+                method = "GET"
 
-            # 使用统一的请求功能
-            logger.info(_("logger.checking_video", "检查视频 {video_id} 在 {site_name}").format(
-                video_id=video_id, site_name=site_name
-            ))
+            if site_url:
+                targets.append((site_name, site_url, method))
+        return targets
+
+    @classmethod
+    def _check_method(cls, site_name, method):
+        """站点实际使用的请求方式，已知不接受HEAD的站点改用GET"""
+        if method == "HEAD" and site_name in cls._head_unsupported_sites:
+            return "GET"
+        return method
+
+    @classmethod
+    def _head_rejected(cls, site_name, status_code):
+        """HEAD请求被站点拒绝时记录该站点，返回是否需要改用GET重新请求"""
+        if status_code not in _HEAD_REJECTED_STATUS:
+            return False
+        cls._head_unsupported_sites.add(site_name)
+        logger.info(f"{site_name} 不接受HEAD请求 (状态码: {status_code})，改用GET检查")
+        return True
+
+    @classmethod
+    def _fetch_leak_check(cls, video_id, site_name, site_url, method):
+        """按站点配置的请求方式发送检查请求
+
+        HEAD和STREAM都不下载页面内容；STREAM收到响应头后即关闭响应，
+        未读取的连接不会放回连接池，适合不接受HEAD且页面较大的站点
+
+        Returns:
+            Response: 请求响应对象，请求失败返回None
+        """
+        method = cls._check_method(site_name, method)
+        step_name = _("logger.checking_video").format(video_id=video_id, site_name=site_name)
+
+        if method == "HEAD":
             response = cls.make_request(
                 site_url,
-                step_name=_("logger.checking_video").format(
-                    video_id=video_id, site_name=site_name
-                ),
-                max_retries=1,  # 减少重试次数以加快速度
-                timeout=config.timeout,  # 使用配置的超时时间
+                step_name=step_name,
+                max_retries=1,
+                timeout=config.timeout,
+                method="HEAD",
             )
+            if response is None or not cls._head_rejected(site_name, response.status_code):
+                return response
 
-            if response:
-                # 根据状态码判断视频是否存在
-                if response.status_code == 200:
-                    logger.info(_("logger.video_leaked", "视频 {video_id} 在 {site_name} 已流出 (状态码: {status_code})").format(
-                        video_id=video_id, site_name=site_name, status_code=response.status_code
-                    ))
-                    return True, site_name, response.status_code
+        stream = method == "STREAM"
+        response = cls.make_request(
+            site_url,
+            step_name=step_name,
+            max_retries=1,  # 减少重试次数以加快速度
+            timeout=config.timeout,  # 使用配置的超时时间
+            stream=stream,
+        )
+        if stream and response is not None:
+            response.close()
+        return response
 
-                elif response.status_code == 404:
-                    logger.info(_("logger.video_not_found", "视频 {video_id} 在 {site_name} 未找到 (状态码: {status_code})").format(
-                        video_id=video_id, site_name=site_name, status_code=response.status_code
-                    ))
-                else:
-                    logger.warning(
-                        _("logger.video_check_abnormal", "视频 {video_id} 在 {site_name} 检查异常 (状态码: {status_code})").format(
-                            video_id=video_id, site_name=site_name, status_code=response.status_code
-                        )
+    @staticmethod
+    def _is_leak_response(video_id, site_name, status_code):
+        """根据站点响应码判断视频是否已流出并记录日志"""
+        # 根据状态码判断视频是否存在
+        if status_code == 200:
+            logger.info(_("logger.video_leaked", "视频 {video_id} 在 {site_name} 已流出 (状态码: {status_code})").format(
+                video_id=video_id, site_name=site_name, status_code=status_code
+            ))
+            return True
+
+        if status_code == 404:
+            logger.info(_("logger.video_not_found", "视频 {video_id} 在 {site_name} 未找到 (状态码: {status_code})").format(
+                video_id=video_id, site_name=site_name, status_code=status_code
+            ))
+        else:
+            logger.warning(
+                _("logger.video_check_abnormal", "视频 {video_id} 在 {site_name} 检查异常 (状态码: {status_code})").format(
+                    video_id=video_id, site_name=site_name, status_code=status_code
+                )
+            )
+        return False
+
+    @classmethod
+    def _site_result(cls, video_id, site_name, response):
+        """把单个站点的响应转换为检查结果
+
+        Args:
+            video_id: 视频ID
+            site_name: 站点名称
+            response: 响应对象，请求失败时为None
+
+        Returns:
+            dict: status为leaked、not_found或error，以及site和status_code
+        """
+        if response is None:
+            return {"status": "error", "site": site_name, "status_code": None}
+        if cls._is_leak_response(video_id, site_name, response.status_code):
+            return {"status": "leaked", "site": site_name, "status_code": response.status_code}
+        if response.status_code == 404:
+            return {"status": "not_found", "site": site_name, "status_code": 404}
+        return {"status": "error", "site": site_name, "status_code": response.status_code}
+
+    @staticmethod
+    def _merge_site_results(results):
+        """合并按优先级排列的各站点检查结果
+
+        任一站点已流出即为已流出；全部返回404为未找到；否则为检查出错
+        """
+        result = {"status": "not_found", "site": None, "status_code": None}
+        for site_result in results:
+            if site_result is None:
+                continue
+            if site_result["status"] == "leaked":
+                return site_result
+            if site_result["status"] == "error" and result["status"] != "error":
+                result = site_result
+        return result
+
+    @classmethod
+    def _check_site(cls, video_id, site_name, site_url, method, cancelled=None):
+        """检查单个站点
+
+        Args:
+            cancelled: threading.Event，已设置时不再发送请求 (其他站点已确认流出)
+
+        Returns:
+            dict: 检查结果，已取消时返回None
+        """
+        if cancelled is not None and cancelled.is_set():
+            return None
+        # 使用统一的请求功能
+        logger.info(_("logger.checking_video", "检查视频 {video_id} 在 {site_name}").format(
+            video_id=video_id, site_name=site_name
+        ))
+        response = cls._fetch_leak_check(video_id, site_name, site_url, method)
+        return cls._site_result(video_id, site_name, response)
+
+    @classmethod
+    def _hedge_executor(cls):
+        """同时检查多个站点使用的共享线程池"""
+        if cls._hedge_pool is None:
+            with cls._session_lock:
+                if cls._hedge_pool is None:
+                    cls._hedge_pool = ThreadPoolExecutor(
+                        max_workers=max(1, config.max_workers) * 2,
+                        thread_name_prefix="leak-check",
                     )
+        return cls._hedge_pool
+
+    @classmethod
+    def _check_sites_hedged(cls, video_id, targets):
+        """同时检查所有站点，任一站点确认流出后立即返回
+
+        第i个站点在启动后延迟 i * config.leak_check_hedge_delay 秒才发送请求，
+        确认流出时尚未发送的请求不再发送，已发出的请求结果被忽略
+
+        Args:
+            video_id: 视频ID
+            targets: _leak_check_targets返回的站点列表
+
+        Returns:
+            dict: 检查结果
+        """
+        cancelled = threading.Event()
+        delay = max(0.0, config.leak_check_hedge_delay)
+
+        def check(index, target):
+            if index and delay and cancelled.wait(index * delay):
+                return None
+            return cls._check_site(video_id, *target, cancelled=cancelled)
+
+        executor = cls._hedge_executor()
+        futures = [executor.submit(check, i, target) for i, target in enumerate(targets)]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None and result["status"] == "leaked":
+                    return result
+        finally:
+            cancelled.set()
+            for future in futures:
+                future.cancel()
+        return cls._merge_site_results(future.result() for future in futures)
+
+    @classmethod
+    def check_video_leak_result(cls, video_id):
+        """检查视频是否已经流出，并区分未找到和检查出错
+
+        配置了多个检查站点且启用config.leak_check_hedged时同时检查所有站点，
+        否则按优先级依次检查
+
+        Args:
+            video_id: 视频ID
+
+        Returns:
+            dict: status为leaked(已流出)、not_found(所有站点均返回404)或error(有站点请求失败或响应异常)，
+                  以及site和status_code
+        """
+        # 确保video_id是字符串
+        video_id = str(video_id)
+        targets = cls._leak_check_targets(video_id)
+        if config.leak_check_hedged and len(targets) > 1:
+            return cls._check_sites_hedged(video_id, targets)
+
+        results = []
+        for target in targets:
+            site_result = cls._check_site(video_id, *target)
+            if site_result["status"] == "leaked":
+                return site_result
+            results.append(site_result)
 
         # 所有站点都未找到，视为未流出
+        return cls._merge_site_results(results)
+
+    @classmethod
+    def check_video_leak_status(
+        cls, video_id
+    ) -> Tuple[bool, Optional[str], Optional[int]]:
+        """检查视频是否已经流出
+
+        Args:
+            video_id: 视频ID
+
+        Returns:
+            tuple: (是否流出, 站点名称, 状态码)
+        """
+        result = cls.check_video_leak_result(video_id)
+        if result["status"] == "leaked":
+            return True, result["site"], result["status_code"]
+        return False, None, None
+
+    @classmethod
+    async def _check_site_async(cls, client, video_id, site_name, site_url, method, delay=0):
+        """_check_site的异步版本
+
+        Args:
+            delay: 发送请求前等待的秒数 (错开同时检查的各站点)
+        """
+        if delay:
+            await asyncio.sleep(delay)
+        logger.info(_("logger.checking_video", "检查视频 {video_id} 在 {site_name}").format(
+            video_id=video_id, site_name=site_name
+        ))
+        method = cls._check_method(site_name, method)
+        try:
+            response = None
+            if method == "HEAD":
+                response = await client.request(
+                    "HEAD", site_url, timeout=config.timeout, max_retries=1
+                )
+                if cls._head_rejected(site_name, response.status_code):
+                    response = None
+            if response is None:
+                response = await client.request(
+                    "GET",
+                    site_url,
+                    timeout=config.timeout,
+                    max_retries=1,
+                    read_body=method != "STREAM",
+                )
+        except Exception as e:
+            logger.error(_("logger.request_failed", "请求失败: {error}").format(error=str(e)))
+            response = None
+        return cls._site_result(video_id, site_name, response)
+
+    @classmethod
+    async def check_video_leak_result_async(cls, client, video_id):
+        """check_video_leak_result的异步版本
+
+        同时检查时任一站点确认流出后取消其余站点的请求
+
+        Args:
+            client: AsyncHTTPClient实例
+            video_id: 视频ID
+
+        Returns:
+            dict: 与check_video_leak_result相同
+        """
+        video_id = str(video_id)
+        targets = cls._leak_check_targets(video_id)
+
+        if not (config.leak_check_hedged and len(targets) > 1):
+            results = []
+            for target in targets:
+                site_result = await cls._check_site_async(client, video_id, *target)
+                if site_result["status"] == "leaked":
+                    return site_result
+                results.append(site_result)
+
+            # 所有站点都未找到，视为未流出
+            return cls._merge_site_results(results)
+
+        delay = max(0.0, config.leak_check_hedge_delay)
+        tasks = [
+            asyncio.ensure_future(
+                cls._check_site_async(client, video_id, *target, delay=i * delay)
+            )
+            for i, target in enumerate(targets)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                site_result = await next_done
+                if site_result["status"] == "leaked":
+                    return site_result
+        finally:
+            for task in tasks:
+                task.cancel()
+        return cls._merge_site_results(task.result() for task in tasks)
+
+    @classmethod
+    async def check_video_leak_status_async(
+        cls, client, video_id
+    ) -> Tuple[bool, Optional[str], Optional[int]]:
+        """check_video_leak_status的异步版本
+
+        Args:
+            client: AsyncHTTPClient实例
+            video_id: 视频ID
+
+        Returns:
+            tuple: (是否流出, 站点名称, 状态码)
+        """
+        result = await cls.check_video_leak_result_async(client, video_id)
+        if result["status"] == "leaked":
+            return True, result["site"], result["status_code"]
         return False, None, None
 
     @staticmethod
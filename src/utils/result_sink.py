@@ -0,0 +1,129 @@
+"""
+结果输出模块 - 以JSON Lines格式逐条保存分析结果
+
+每个视频处理完成后立即追加一行到结果文件并刷新，分析进行中即可读取已完成的部分；
+生成报告时按行流式读取，不需要把整个结果列表保存在内存中
+"""
+import json
+import os
+import threading
+
+from src.utils.logger import get_logger
+
+logger = get_logger("result_sink")
+
+
+class ResultSink:
+    """JSON Lines结果文件写入器，可在多个线程中同时调用write
+
+    示例:
+        with ResultSink(path) as sink:
+            sink.write(result)
+    """
+
+    def __init__(self, path):
+        """初始化写入器
+
+        Args:
+            path: 结果文件路径，打开时会清空已有内容
+        """
+        self.path = path
+        self.count = 0
+        self.offset = 0  # 已写入的字节数，检查点按此位置恢复
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self):
+        """创建或清空结果文件"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, "wb")
+        self.count = 0
+        self.offset = 0
+        return self
+
+    def write(self, result):
+        """追加一条结果并立即刷新到文件
+
+        Args:
+            result: 单个视频的处理结果
+        """
+        line = (json.dumps(result, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+            self.offset += len(line)
+
+    def close(self):
+        """关闭结果文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_results(path, sort_by_id=False, end=None):
+    """逐条读取结果文件
+
+    最后一行不完整(写入过程中被中断)时忽略该行
+
+    Args:
+        path: 结果文件路径
+        sort_by_id: 是否按视频ID排序输出；排序时只在内存中保存ID和行偏移量
+        end: 只读取该字节偏移量之前的完整行，None表示读取到文件末尾
+
+    Yields:
+        dict: 单个视频的处理结果
+    """
+    if not os.path.exists(path):
+        return
+
+    with open(path, "rb") as f:
+        if not sort_by_id:
+            for _, line in _read_lines(f, end):
+                result = _parse_line(path, line)
+                if result is not None:
+                    yield result
+            return
+
+        offsets = []
+        for offset, line in _read_lines(f, end):
+            result = _parse_line(path, line)
+            if result is not None:
+                offsets.append((str(result.get("video_id", result.get("id", ""))), offset))
+
+        offsets.sort()
+        for _, offset in offsets:
+            f.seek(offset)
+            yield _parse_line(path, f.readline())
+
+
+def _read_lines(f, end=None):
+    """逐行读取文件，返回(行偏移量, 行内容)，超过end的行不再读取"""
+    offset = f.tell()
+    for line in f:
+        if end is not None and offset + len(line) > end:
+            return
+        yield offset, line
+        offset += len(line)
+
+
+def _parse_line(path, line):
+    """解析结果文件中的一行，空行和损坏的行返回None"""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line.decode("utf-8"))
+    except (ValueError, UnicodeDecodeError):
+        logger.warning(f"跳过结果文件中无法解析的行: {path}")
+        return None
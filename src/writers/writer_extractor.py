@@ -15,26 +15,21 @@ import requests
 from bs4 import BeautifulSoup
 
 from config import config
+from src.utils.request_handler import RequestHandler
 
 
 def handle_request_limit(request_counter):
-    """处理请求限制，根据请求计数器决定是否需要等待
-    
+    """更新请求计数
+
+    请求频率由全局按主机限速器控制，这里只负责计数
+
     Args:
         request_counter: 当前请求计数
-        
+
     Returns:
         int: 更新后的请求计数
     """
-    counter = request_counter + 1  # 增加请求计数
-    
-    # 检查是否需要等待 - 每X次请求后的第一次进行等待
-    if counter % config.request_limit_count == 1 and counter > 1:
-        wait_time = (config.retry_base ** 2) + random.uniform(1, 3)  # 使用适当的等待时间
-        print(f"达到请求限制点 ({counter})，等待 {wait_time:.2f} 秒以避免被封...")
-        time.sleep(wait_time)
-        
-    return counter
+    return request_counter + 1
 
 
 def extract_writerusername(url):
@@ -73,7 +68,7 @@ def get_writer_info(writerusername, request_counter, max_retries=None):
     while retry_count < max_retries:
         try:
             # 发送HTTP请求获取页面内容
-            response = requests.get(url, headers=headers, timeout=config.timeout)
+            response = RequestHandler.request("GET", url, headers=headers, timeout=config.timeout)
 
             # 如果是429错误，进行重试
             if response.status_code == 429:
@@ -152,7 +147,7 @@ def fetch_and_extract_links(url, request_counter):
         counter = handle_request_limit(request_counter)
         
         # 发送请求
-        response = requests.get(url, headers=config.base_headers.copy(), timeout=config.timeout)
+        response = RequestHandler.request("GET", url, headers=config.base_headers.copy(), timeout=config.timeout)
         response.raise_for_status()
         
         # 解析页面
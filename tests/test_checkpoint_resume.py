@@ -0,0 +1,36 @@
+"""
+检查点恢复测试：只恢复流出检查有明确结果的视频，检查出错的视频重新检查
+"""
+import os
+import tempfile
+import unittest
+
+from src.checkers.fc2analyzer import FC2Analyzer
+from src.utils.result_sink import ResultSink
+
+
+class CheckpointResultsTest(unittest.TestCase):
+    def test_errored_checks_are_not_restored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.jsonl")
+            with ResultSink(path) as sink:
+                for video_id, leak_check in (
+                    ("1", "leaked"), ("2", "not_found"), ("3", "error"), ("4", None)
+                ):
+                    sink.write({
+                        "video_id": video_id,
+                        "status": "available" if leak_check == "leaked" else "unavailable",
+                        "leak_check": leak_check,
+                    })
+                offset = sink.offset
+                # 检查点之后写入的结果不恢复
+                sink.write({"video_id": "5", "status": "available", "leak_check": "leaked"})
+
+            restored = FC2Analyzer._checkpoint_results(
+                path, offset, {"1", "2", "3", "4", "5"}
+            )
+            self.assertEqual([r["video_id"] for r in restored], ["1", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
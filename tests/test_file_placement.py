@@ -0,0 +1,36 @@
+"""
+文件放置测试：目标已存在时按所选方式重新放置
+"""
+import os
+import tempfile
+import unittest
+
+from src.utils.file_placement import place_file
+
+
+@unittest.skipUnless(hasattr(os, "symlink") and hasattr(os, "link"), "需要符号链接和硬链接")
+class PlaceFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "source.jpg")
+        self.target = os.path.join(self.tmp.name, "poster.jpg")
+        with open(self.source, "wb") as f:
+            f.write(b"jpg")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hardlink_replaces_symlink(self):
+        self.assertEqual(place_file(self.source, self.target, "symlink"), "symlink")
+        self.assertEqual(place_file(self.source, self.target, "hardlink"), "hardlink")
+        self.assertFalse(os.path.islink(self.target))
+        self.assertTrue(os.path.samefile(self.source, self.target))
+
+    def test_symlink_replaces_hardlink(self):
+        self.assertEqual(place_file(self.source, self.target, "hardlink"), "hardlink")
+        self.assertEqual(place_file(self.source, self.target, "symlink"), "symlink")
+        self.assertTrue(os.path.islink(self.target))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Jellyfin元数据增量生成的清理规则测试
+
+流出检查出错的视频status同样为unavailable，不能被当作确认未流出而删除其元数据
+"""
+import asyncio
+import os
+import tempfile
+import unittest
+
+from config import config
+from src.checkers.fc2analyzer import FC2Analyzer
+from src.utils.jellyfin_metadata_generator import JellyfinMetadataGenerator
+from src.utils.report_builder import is_confirmed_unleaked
+
+
+class LeakCheckOutcomeTest(unittest.TestCase):
+    """分析结果保留流出检查的原始结果"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.analyzer = FC2Analyzer(
+            "9",
+            quiet_mode=True,
+            with_magnet=False,
+            download_images=False,
+            download_path=self.tmp.name,
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _check(self, status):
+        self.analyzer._leak_check = lambda video_id: {
+            "status": status, "site": None, "status_code": None
+        }
+        task = self.analyzer._new_task("100")
+        self.analyzer._stage_check(task)
+        return task["result"]
+
+    def test_errored_check_is_not_confirmed_unleaked(self):
+        result = self._check("error")
+        self.assertEqual(result["status"], "unavailable")
+        self.assertEqual(result["leak_check"], "error")
+        self.assertFalse(is_confirmed_unleaked(result))
+
+    def test_not_found_is_confirmed_unleaked(self):
+        result = self._check("not_found")
+        self.assertEqual(result["status"], "unavailable")
+        self.assertTrue(is_confirmed_unleaked(result))
+
+
+class JellyfinPruneTest(unittest.TestCase):
+    """增量生成时只删除确认未流出的视频的元数据"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._saved = (config.jellyfin_incremental, config.jellyfin_prune_stale)
+        config.jellyfin_incremental = True
+        config.jellyfin_prune_stale = True
+
+        image_dir = os.path.join(self.tmp.name, "img")
+        os.makedirs(image_dir)
+        for video_id in ("1", "2"):
+            with open(os.path.join(image_dir, f"{video_id}.jpg"), "wb") as f:
+                f.write(b"jpg")
+
+        self.generator = JellyfinMetadataGenerator(
+            output_dir=os.path.join(self.tmp.name, "jellyfin")
+        )
+        self.generator.find_image_path = lambda video_id, *args, **kwargs: os.path.join(
+            image_dir, f"{video_id}.jpg"
+        )
+        self.author = {"id": "9", "name": "author"}
+
+    def tearDown(self):
+        config.jellyfin_incremental, config.jellyfin_prune_stale = self._saved
+        self.tmp.cleanup()
+
+    def _generate(self, videos):
+        asyncio.run(
+            self.generator.batch_generate_metadata(
+                videos, author_info=self.author, enrich_from_web=False
+            )
+        )
+        manifest = self.generator._manifest(self.generator._output_dir(self.author, None))
+        return manifest
+
+    def test_errored_check_keeps_manifest_entry(self):
+        leaked = [
+            {"video_id": video_id, "title": f"t{video_id}", "status": "available",
+             "leak_check": "leaked"}
+            for video_id in ("1", "2")
+        ]
+        manifest = self._generate(leaked)
+        self.assertEqual(sorted(manifest.videos), ["1", "2"])
+        files = manifest.files("1")
+
+        # 1的检查出错，2确认未流出
+        manifest = self._generate([
+            {"video_id": "1", "status": "unavailable", "leak_check": "error"},
+            {"video_id": "2", "status": "unavailable", "leak_check": "not_found"},
+        ])
+        self.assertEqual(sorted(manifest.videos), ["1"])
+        self.assertTrue(files and all(os.path.exists(path) for path in files))
+
+
+if __name__ == "__main__":
+    unittest.main()